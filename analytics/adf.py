@@ -35,3 +35,10 @@ class ADFTest:
             },
             "is_stationary": bool(result[1] < 0.05),
         }
+
+
+def adf_on_array(spread) -> dict:
+    """
+    ADFTest.run on a bare array; top-level so process pools can pickle it
+    """
+    return ADFTest().run(pd.DataFrame({"spread": spread}))
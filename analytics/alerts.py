@@ -1,4 +1,36 @@
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
 import pandas as pd
+from utils.config import ALERT_MAX_STATES
+
+SHORT_SPREAD = 1
+LONG_SPREAD = -1
+DIRECTIONS = {SHORT_SPREAD: "SHORT_SPREAD", LONG_SPREAD: "LONG_SPREAD"}
+
+
+def signal_direction(z, corr, z_threshold, corr_threshold) -> np.ndarray:
+    """
+    +1 short spread / -1 long spread / 0 per bar. Broadcasts, so column
+    vectors of thresholds evaluate a whole parameter grid at once.
+    """
+    hit = (np.abs(z) >= z_threshold) & (corr >= corr_threshold)
+    return np.where(hit, np.where(z > 0, SHORT_SPREAD, LONG_SPREAD), 0).astype(
+        np.int8
+    )
+
+
+class AlertState:
+    """
+    Alert state of one pair/parameter set carried across evaluations
+    """
+
+    def __init__(self, max_events: int = 1000):
+        self.last_ts = None
+        self.active = 0  # 0 = flat, else SHORT_SPREAD / LONG_SPREAD
+        self.events: deque = deque(maxlen=max_events)
+        self.lock = threading.Lock()
 
 
 class AlertEngine:
@@ -10,6 +42,30 @@ class AlertEngine:
         self.z_threshold = z_threshold
         self.corr_threshold = corr_threshold
 
+    def signals(self, z_df: pd.DataFrame, corr_df: pd.DataFrame):
+        """
+        Align z-score / correlation and return (index, z, corr, direction)
+        with direction per bar: +1 short spread, -1 long spread, 0 none
+        (NaN rows are dropped)
+        """
+        z = z_df["zscore"].to_numpy(dtype="float64")
+        corr = corr_df["rolling_corr"].to_numpy(dtype="float64")
+        index = z_df.index
+
+        # Inner join on timestamp; both usually come from the same bars,
+        # so skip the (comparatively slow) pandas join when they match
+        if not index.equals(corr_df.index):
+            index = index.intersection(corr_df.index)
+            z = z[z_df.index.get_indexer(index)]
+            corr = corr[corr_df.index.get_indexer(index)]
+
+        valid = ~(np.isnan(z) | np.isnan(corr))
+        z, corr, index = z[valid], corr[valid], index[valid]
+
+        direction = signal_direction(z, corr, self.z_threshold, self.corr_threshold)
+
+        return index, z, corr, direction
+
     def evaluate(
         self,
         z_df: pd.DataFrame,
@@ -20,34 +76,105 @@ class AlertEngine:
         """
         Evaluate alert conditions and return list of alert events
         """
-        alerts = []
+        index, z, corr, direction = self.signals(z_df, corr_df)
+        pair = f"{symbol_x}-{symbol_y}"
+
+        # Only the bars that fire are turned into dicts
+        hits = np.flatnonzero(direction)
+
+        return [
+            self._alert(pair, index[i], z[i], corr[i], direction[i])
+            for i in hits
+        ]
+
+    def evaluate_incremental(
+        self,
+        state: AlertState,
+        z_df: pd.DataFrame,
+        corr_df: pd.DataFrame,
+        symbol_x: str,
+        symbol_y: str,
+    ) -> list[dict]:
+        """
+        Evaluate only bars newer than state.last_ts and record ENTRY / EXIT
+        events when the signal starts, flips or ends. Returns the new events.
+        """
+        with state.lock:
+            return self._evaluate_incremental(
+                state, z_df, corr_df, symbol_x, symbol_y
+            )
 
-        df = z_df.join(corr_df, how="inner")
+    def _evaluate_incremental(self, state, z_df, corr_df, symbol_x, symbol_y):
+        if state.last_ts is not None:
+            # Frames are time-sorted → slice off everything already seen
+            z_df = z_df.iloc[z_df.index.searchsorted(state.last_ts, side="right"):]
+            corr_df = corr_df.iloc[
+                corr_df.index.searchsorted(state.last_ts, side="right"):
+            ]
 
-        for ts, row in df.iterrows():
-            z = row.get("zscore")
-            corr = row.get("rolling_corr")
+        index, z, corr, direction = self.signals(z_df, corr_df)
 
-            if pd.isna(z) or pd.isna(corr):
-                continue
+        if len(index) == 0:
+            return []
 
-            if abs(z) >= self.z_threshold and corr >= self.corr_threshold:
-                direction = (
-                    "SHORT_SPREAD" if z > 0 else "LONG_SPREAD"
-                )
+        pair = f"{symbol_x}-{symbol_y}"
+        prev = np.empty_like(direction)
+        prev[0] = state.active
+        prev[1:] = direction[:-1]
 
-                alerts.append(
-                    {
-                        "timestamp": ts,
-                        "pair": f"{symbol_x}-{symbol_y}",
-                        "zscore": float(z),
-                        "correlation": float(corr),
-                        "direction": direction,
-                        "message": (
-                            f"{direction}: |z|={abs(z):.2f}, "
-                            f"corr={corr:.2f}"
-                        ),
-                    }
+        # A flip is an EXIT of the old side followed by an ENTRY of the new one
+        exits = np.flatnonzero((prev != 0) & (direction != prev))
+        entries = np.flatnonzero((direction != 0) & (direction != prev))
+
+        new_events = []
+        for i in np.union1d(exits, entries):
+            if prev[i] != 0 and direction[i] != prev[i]:
+                new_events.append(
+                    self._alert(pair, index[i], z[i], corr[i], prev[i], "EXIT")
+                )
+            if direction[i] != 0 and direction[i] != prev[i]:
+                new_events.append(
+                    self._alert(pair, index[i], z[i], corr[i], direction[i], "ENTRY")
                 )
 
-        return alerts
+        state.last_ts = index[-1]
+        state.active = int(direction[-1])
+        state.events.extend(new_events)
+
+        return new_events
+
+    @staticmethod
+    def _alert(pair, ts, z, corr, direction, event=None) -> dict:
+        name = DIRECTIONS[int(direction)]
+        alert = {
+            "timestamp": ts,
+            "pair": pair,
+            "zscore": float(z),
+            "correlation": float(corr),
+            "direction": name,
+            "message": f"{name}: |z|={abs(z):.2f}, corr={corr:.2f}",
+        }
+        if event:
+            alert["event"] = event
+            alert["message"] = f"{event} {alert['message']}"
+        return alert
+
+
+# Keys include the client's thresholds, so only the ALERT_MAX_STATES most
+# recently used states are kept; an evicted one starts over from bars
+alert_states: OrderedDict[tuple, AlertState] = OrderedDict()
+alert_states_lock = threading.Lock()
+
+
+def get_alert_state(key: tuple) -> AlertState:
+    """
+    Process-wide alert state per (pair, timeframe, params) key
+    """
+    with alert_states_lock:
+        if key in alert_states:
+            alert_states.move_to_end(key)
+        else:
+            alert_states[key] = AlertState()
+            while len(alert_states) > ALERT_MAX_STATES:
+                alert_states.popitem(last=False)
+        return alert_states[key]
@@ -0,0 +1,327 @@
+import itertools
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import get_args
+
+import numpy as np
+import pandas as pd
+from analytics.alerts import AlertEngine, AlertState, signal_direction
+from analytics.pair_data import PairData, load_pair
+from analytics.regression import window_moments, window_ols
+from analytics.resampler import TimeFrame
+from storage.duckdb_manager import DuckDBManager
+from utils.config import BACKTEST_WORKERS
+
+BUCKETS = {"1s": "1 second", "1m": "1 minute", "5m": "5 minutes"}
+
+METRICS = [
+    "window",
+    "z_threshold",
+    "corr_threshold",
+    "pnl",
+    "costs",
+    "net_pnl",
+    "max_drawdown",
+    "sharpe",
+    "trades",
+    "turnover",
+    "exposure",
+    "bars",
+]
+
+# Bars × parameter sets evaluated per NumPy block (bounds memory)
+_BLOCK = 4_000_000
+
+# Smallest sweep (bars × parameter sets) worth starting worker processes
+# for: spawning them costs seconds, ~10M bar-evals/s inline
+_POOL_MIN = 20_000_000
+
+
+def load_ticks_as_bars(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str = "1m",
+    start=None,
+    end=None,
+    db: DuckDBManager | None = None,
+) -> PairData:
+    """
+    Aligned bar closes built straight from stored ticks (hot table and
+    Parquet tier), e.g. for history the bar tables no longer cover
+    """
+    if timeframe not in get_args(TimeFrame):
+        raise ValueError(f"Unknown timeframe: {timeframe}")
+
+    db = db or DuckDBManager()
+    cols = db.con.execute(
+        f"""
+        WITH closes AS (
+            SELECT
+                time_bucket(INTERVAL '{BUCKETS[timeframe]}', timestamp) AS bucket,
+                symbol,
+                arg_max(price, timestamp) AS close
+            FROM {db.tick_source(start)}
+            WHERE symbol IN (?, ?)
+            AND (?::TIMESTAMP IS NULL OR timestamp >= ?::TIMESTAMP)
+            AND (?::TIMESTAMP IS NULL OR timestamp <= ?::TIMESTAMP)
+            GROUP BY bucket, symbol
+        )
+        SELECT x.bucket AS timestamp, x.close AS x, y.close AS y
+        FROM closes x
+        JOIN closes y ON x.bucket = y.bucket
+        WHERE x.symbol = ? AND y.symbol = ?
+        ORDER BY x.bucket
+        """,
+        [symbol_x, symbol_y, start, start, end, end, symbol_x, symbol_y],
+    ).fetchnumpy()
+
+    return PairData(
+        cols["timestamp"].astype("datetime64[ns]"),
+        np.asarray(cols["x"], dtype="float64"),
+        np.asarray(cols["y"], dtype="float64"),
+    )
+
+
+def pair_signals(
+    x: np.ndarray, y: np.ndarray, beta: np.ndarray, window: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    z-score and rolling correlation per bar, as PairFeed computes them
+    live: the z-score of bar t re-hedges the last `window` bars with
+    beta_t, fitted on the bars before t
+    """
+    m = window_moments(x, y, window)
+    n = m["n"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = (m["c_xx"] - 2 * beta * m["c_xy"] + beta**2 * m["c_yy"]) / (n - 1)
+        dev = (x - m["mean_x"]) - beta * (y - m["mean_y"])
+        z = np.where(m["valid"] & (var > 0), dev / np.sqrt(var), np.nan)
+
+        denom = m["c_xx"] * m["c_yy"]
+        corr = np.where(m["valid"] & (denom > 0), m["c_xy"] / np.sqrt(denom), np.nan)
+
+    return z, corr
+
+
+def evaluate_window(
+    timestamp: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    beta: np.ndarray,
+    window: int,
+    thresholds: list[tuple[float, float]],
+    cost_bps: float = 0.0,
+) -> pd.DataFrame:
+    """
+    PnL / cost / drawdown / turnover for every (z_threshold,
+    corr_threshold) at one z-score window, all thresholds in one
+    broadcast (top-level so process pools can pickle it).
+
+    Position follows the AlertEngine signal: short one unit of spread
+    (X - beta_t * Y) while it fires SHORT_SPREAD, long while LONG_SPREAD,
+    flat otherwise. The position decided at bar t earns bar t+1's spread
+    move; changing it, or re-hedging as beta moves, costs `cost_bps` of
+    the notional traded.
+    """
+    z, corr = pair_signals(x, y, beta, window)
+    hedge = np.nan_to_num(beta)
+
+    # Spread move from t-1 to t with the hedge held over that bar
+    move = np.diff(x) - hedge[:-1] * np.diff(y)
+
+    # Annualisation from the median bar spacing (ns)
+    step = np.median(np.diff(timestamp).astype("int64")) if len(x) > 1 else 0
+    periods = 365 * 86400e9 / step if step > 0 else 0.0
+
+    rows = []
+    block = max(1, _BLOCK // max(len(x), 1))
+    for i in range(0, len(thresholds), block):
+        th = np.asarray(thresholds[i : i + block], dtype="float64")
+        z_th, corr_th = th[:, :1], th[:, 1:]
+
+        # 1️⃣ Same rule as AlertEngine.signals (NaN warm-up bars stay flat)
+        direction = signal_direction(z, corr, z_th, corr_th)
+        pos = -direction.astype("float64")
+
+        # 2️⃣ Gross PnL, traded notional, costs
+        pnl = pos[:, :-1] * move
+        prev = np.zeros_like(pos)
+        prev[:, 1:] = pos[:, :-1]
+        prev_hedge = np.zeros_like(pos)
+        prev_hedge[:, 1:] = (pos * hedge)[:, :-1]
+        turnover = np.abs(pos - prev) * x + np.abs(pos * hedge - prev_hedge) * y
+        costs = turnover * cost_bps * 1e-4
+        net = pnl - costs[:, 1:]
+
+        # 3️⃣ Drawdown from the running peak of the equity curve
+        equity = np.cumsum(net, axis=1)
+        peak = np.maximum.accumulate(np.maximum(equity, 0.0), axis=1)
+        max_dd = (peak - equity).max(axis=1, initial=0.0)
+
+        # No variance (a set that never trades) → Sharpe 0, not NaN
+        std = net.std(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(
+                std > 0, net.mean(axis=1) / std * np.sqrt(periods), 0.0
+            )
+
+        prev_dir = np.zeros_like(direction)
+        prev_dir[:, 1:] = direction[:, :-1]
+        trades = ((direction != 0) & (direction != prev_dir)).sum(axis=1)
+
+        for j, (zt, ct) in enumerate(th):
+            rows.append(
+                {
+                    "window": window,
+                    "z_threshold": zt,
+                    "corr_threshold": ct,
+                    "pnl": pnl[j].sum(),
+                    "costs": costs[j].sum(),
+                    "net_pnl": net[j].sum(),
+                    "max_drawdown": max_dd[j],
+                    "sharpe": sharpe[j],
+                    "trades": int(trades[j]),
+                    "turnover": turnover[j].sum(),
+                    "exposure": float((pos[j] != 0).mean()) if len(x) else 0.0,
+                    "bars": len(x),
+                }
+            )
+
+    return pd.DataFrame(rows, columns=METRICS)
+
+
+class PairBacktest:
+    """
+    Replays one pair's stored history through the live hedge ratio /
+    z-score / alert logic and scores the resulting positions.
+
+    beta_window=None hedges bar t with OLS over every bar before it
+    (what PairFeed's method "ols" does live); otherwise OLS over the
+    `beta_window` bars before it. History comes from bars_{timeframe} (source
+    "bars") or is rebuilt from ticks, cold tier included (source "ticks").
+    """
+
+    def __init__(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        timeframe: str = "1m",
+        source: str = "bars",
+        beta_window: int | None = None,
+        cost_bps: float = 0.0,
+        start=None,
+        end=None,
+        db: DuckDBManager | None = None,
+    ):
+        if source not in ("bars", "ticks"):
+            raise ValueError(f"Unknown source: {source}")
+
+        self.db = db or DuckDBManager()
+        self.symbol_x = symbol_x
+        self.symbol_y = symbol_y
+        self.timeframe = timeframe
+        self.source = source
+        self.beta_window = beta_window
+        self.cost_bps = cost_bps
+        self.start = start
+        self.end = end
+        self._pair: PairData | None = None
+        self._beta: np.ndarray | None = None
+
+    def load(self) -> tuple[PairData, np.ndarray]:
+        """
+        Aligned closes and beta_t, loaded once per backtest
+        """
+        if self._pair is None:
+            if self.source == "ticks":
+                pair = load_ticks_as_bars(
+                    self.symbol_x, self.symbol_y, self.timeframe,
+                    self.start, self.end, db=self.db,
+                )
+            else:
+                pair = load_pair(
+                    self.symbol_x, self.symbol_y, self.timeframe,
+                    start=self.start, end=self.end, db=self.db,
+                )
+            # Fit through t-1 hedges bar t, like the online estimators
+            beta = window_ols(pair.x, pair.y, self.beta_window)["beta"]
+            self._beta = np.full_like(beta, np.nan)
+            self._beta[1:] = beta[:-1]
+            self._pair = pair
+        return self._pair, self._beta
+
+    def run(
+        self, window: int = 20, z_threshold: float = 2.0, corr_threshold: float = 0.7
+    ) -> dict:
+        """
+        Metrics for one parameter set
+        """
+        result = self.grid([window], [z_threshold], [corr_threshold], workers=1)
+        return result.to_dict(orient="records")[0]
+
+    def grid(
+        self,
+        windows: list[int],
+        z_thresholds: list[float],
+        corr_thresholds: list[float],
+        workers: int = BACKTEST_WORKERS,
+    ) -> pd.DataFrame:
+        """
+        Every (window, z_threshold, corr_threshold) combination, sorted
+        by net PnL. Windows of large sweeps are spread over `workers`
+        processes; the thresholds of a window are evaluated together.
+        """
+        pair, beta = self.load()
+        thresholds = list(itertools.product(z_thresholds, corr_thresholds))
+        args = (pair.timestamp, pair.x, pair.y, beta)
+
+        size = len(pair) * len(windows) * len(thresholds)
+        if workers > 1 and len(windows) > 1 and size >= _POOL_MIN:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(windows)),
+                mp_context=mp.get_context("spawn"),
+            ) as pool:
+                futures = [
+                    pool.submit(evaluate_window, *args, w, thresholds, self.cost_bps)
+                    for w in windows
+                ]
+                frames = [f.result() for f in futures]
+        else:
+            frames = [
+                evaluate_window(*args, w, thresholds, self.cost_bps) for w in windows
+            ]
+
+        result = pd.concat(frames, ignore_index=True)
+        return result.sort_values("net_pnl", ascending=False, ignore_index=True)
+
+    def replay(
+        self,
+        window: int = 20,
+        z_threshold: float = 2.0,
+        corr_threshold: float = 0.7,
+        batch: int = 1,
+    ) -> list[dict]:
+        """
+        ENTRY / EXIT alert events the live feed would have pushed, with
+        bars arriving `batch` at a time through
+        AlertEngine.evaluate_incremental
+        """
+        pair, beta = self.load()
+        z, corr = pair_signals(pair.x, pair.y, beta, window)
+        index = pd.DatetimeIndex(pair.timestamp, name="timestamp")
+        z_df = pd.DataFrame({"zscore": z}, index=index)
+        corr_df = pd.DataFrame({"rolling_corr": corr}, index=index)
+
+        engine = AlertEngine(z_threshold, corr_threshold)
+        state = AlertState(max_events=len(pair) + 1)
+        events = []
+        for i in range(0, len(pair), batch):
+            events += engine.evaluate_incremental(
+                state,
+                z_df.iloc[i : i + batch],
+                corr_df.iloc[i : i + batch],
+                self.symbol_x,
+                self.symbol_y,
+            )
+        return events
@@ -0,0 +1,128 @@
+from collections import deque
+from typing import Callable
+
+from utils.timestamps import from_epoch_ns, to_epoch_ns
+
+TIMEFRAME_NS = {
+    "1s": 1_000_000_000,
+    "1m": 60_000_000_000,
+    "5m": 300_000_000_000,
+}
+
+# Open bar slots: [start_ns, open, high, low, close, volume, price*qty]
+_START, _OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _PV = range(7)
+
+
+class StreamingBarBuilder:
+    """
+    Online OHLCV/VWAP aggregator updated tick-by-tick.
+
+    Keeps one open bar per (symbol, timeframe). A bar closes when a trade
+    lands in a later window, or when flush() sees its window has ended.
+    Closed bars are queued for batch persistence and passed to listeners.
+    """
+
+    def __init__(
+        self,
+        timeframes: tuple[str, ...] = ("1s", "1m", "5m"),
+        grace_ms: int = 2_000,
+    ):
+        self.timeframes = [(tf, TIMEFRAME_NS[tf]) for tf in timeframes]
+        self.grace_ns = grace_ms * 1_000_000
+
+        self._bars: dict[tuple[str, str], list] = {}
+        self._last_closed: dict[tuple[str, str], int] = {}
+
+        # (trade, timeframe) pairs older than the open or last emitted bar,
+        # left to the resampler
+        self.late_trades = 0
+
+        self.closed: deque = deque()
+        self.listeners: list[Callable[[str, dict], None]] = []
+
+    def update(self, tick: dict):
+        symbol = tick["symbol"]
+        ts_ns = to_epoch_ns(tick["timestamp"])
+        price = tick["price"]
+        qty = tick["qty"]
+
+        for tf, size in self.timeframes:
+            key = (symbol, tf)
+            start = ts_ns - ts_ns % size
+            bar = self._bars.get(key)
+
+            if bar is not None and start != bar[_START]:
+                if start < bar[_START]:
+                    # Out-of-order trade from an earlier window: merging it
+                    # would corrupt the open bar. Reconciliation only picks
+                    # it up inside the last persisted bar
+                    self.late_trades += 1
+                    continue
+                self._close(key, bar)
+                bar = None
+
+            if bar is None:
+                # Late trade for a window that was already emitted
+                if start <= self._last_closed.get(key, -1):
+                    self.late_trades += 1
+                    continue
+
+                self._bars[key] = [
+                    start, price, price, price, price, qty, price * qty
+                ]
+                continue
+
+            if price > bar[_HIGH]:
+                bar[_HIGH] = price
+            if price < bar[_LOW]:
+                bar[_LOW] = price
+            bar[_CLOSE] = price
+            bar[_VOLUME] += qty
+            bar[_PV] += price * qty
+
+    def flush(self, now_ns: int):
+        """
+        Close every bar whose window (plus grace period) has ended
+        """
+        for key, bar in list(self._bars.items()):
+            size = TIMEFRAME_NS[key[1]]
+            if now_ns >= bar[_START] + size + self.grace_ns:
+                self._close(key, bar)
+
+    def drain(self) -> list[tuple[str, dict]]:
+        """
+        Pop all closed bars waiting to be persisted
+        """
+        out = []
+        while self.closed:
+            out.append(self.closed.popleft())
+        return out
+
+    def open_bar(self, symbol: str, timeframe: str) -> dict | None:
+        bar = self._bars.get((symbol, timeframe))
+        return None if bar is None else self._to_record(symbol, bar)
+
+    def _close(self, key: tuple[str, str], bar: list):
+        symbol, tf = key
+        del self._bars[key]
+        self._last_closed[key] = bar[_START]
+
+        record = self._to_record(symbol, bar)
+        self.closed.append((tf, record))
+
+        for listener in self.listeners:
+            listener(tf, record)
+
+    @staticmethod
+    def _to_record(symbol: str, bar: list) -> dict:
+        volume = bar[_VOLUME]
+        return {
+            "timestamp": from_epoch_ns(bar[_START]),
+            "symbol": symbol,
+            "open": bar[_OPEN],
+            "high": bar[_HIGH],
+            "low": bar[_LOW],
+            "close": bar[_CLOSE],
+            "volume": volume,
+            "vwap": bar[_PV] / volume if volume else bar[_CLOSE],
+        }
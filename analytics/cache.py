@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+from storage.duckdb_manager import DuckDBManager
+from utils.metrics import registry
+
+
+class PairResultCache:
+    """
+    LRU cache for pair computations (hedge ratio, spread, z-score, ...).
+
+    Keys include the bar watermark of the timeframe, so a result is reused
+    until a new bar is written and then naturally falls out of the LRU.
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_compute(self, key: tuple, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._data[key]
+            self.stats["misses"] += 1
+
+        # Compute outside the lock; concurrent misses may both compute
+        value = fn()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats["evictions"] += 1
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def summary(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._data),
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+pair_cache = PairResultCache()
+
+
+def collect_cache_metrics():
+    summary = pair_cache.summary()
+    for stat in ("hits", "misses", "evictions"):
+        yield (
+            f"qa_pair_cache_{stat}_total",
+            "counter",
+            f"Pair result cache {stat}",
+            [({}, summary[stat])],
+        )
+    yield ("qa_pair_cache_size", "gauge", "Cached pair results", [({}, summary["size"])])
+
+
+registry.register_collector(collect_cache_metrics)
+
+
+def bar_watermark(timeframe: str) -> tuple:
+    """
+    (latest bar timestamp, write version) for a timeframe, or (None, 0)
+    if no bars were written by this process yet
+    """
+    return DuckDBManager().pool.bar_watermarks.get(timeframe, (None, 0))
+
+
+def cached_pair_result(
+    kind: str,
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str,
+    fn: Callable[[], Any],
+    *params,
+) -> Any:
+    key = (kind, symbol_x, symbol_y, timeframe, params, bar_watermark(timeframe))
+    return pair_cache.get_or_compute(key, fn)
@@ -0,0 +1,376 @@
+import json
+import math
+import threading
+
+import pandas as pd
+from analytics.cache import cached_pair_result
+from analytics.regression import HedgeRatioOLS
+from storage.duckdb_manager import DuckDBManager
+from utils.config import KALMAN_DELTA, RLS_FORGETTING
+
+
+class RecursiveLeastSquares:
+    """
+    Online least squares for X = alpha + beta * Y with forgetting factor.
+
+    Keeps exponentially weighted means and co-moments (Welford-style), which
+    is the exact weighted LS solution updated in O(1) per bar.
+    forgetting=1.0 reproduces batch OLS over all bars.
+
+    update() returns the prior (alpha, beta) for the bar, fitted on the
+    bars before it, so the spread at t does not see X_t (same as
+    KalmanHedgeRatio).
+    """
+
+    def __init__(self, forgetting: float = 1.0):
+        if not 0 < forgetting <= 1:
+            raise ValueError(f"forgetting must be in (0, 1], got {forgetting}")
+        self.forgetting = forgetting
+        self.weight = 0.0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.c_xx = 0.0
+        self.c_yy = 0.0
+        self.c_xy = 0.0
+        self.n = 0
+
+    def update(self, x: float, y: float) -> tuple[float, float]:
+        lam = self.forgetting
+        prior = (self.alpha, self.beta) if self.n else (math.nan, math.nan)
+
+        self.weight = lam * self.weight + 1.0
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.weight
+        self.mean_y += dy / self.weight
+
+        self.c_xx = lam * self.c_xx + dx * (x - self.mean_x)
+        self.c_yy = lam * self.c_yy + dy * (y - self.mean_y)
+        self.c_xy = lam * self.c_xy + dy * (x - self.mean_x)
+        self.n += 1
+
+        return prior
+
+    @property
+    def beta(self) -> float:
+        return self.c_xy / self.c_yy if self.c_yy > 0 else math.nan
+
+    @property
+    def alpha(self) -> float:
+        return self.mean_x - self.beta * self.mean_y
+
+    @property
+    def r2(self) -> float:
+        denom = self.c_xx * self.c_yy
+        return self.c_xy**2 / denom if denom > 0 else math.nan
+
+    def to_state(self) -> dict:
+        return dict(vars(self))
+
+    @classmethod
+    def from_state(cls, state: dict) -> "RecursiveLeastSquares":
+        obj = cls(state["forgetting"])
+        vars(obj).update(state)
+        return obj
+
+
+class KalmanHedgeRatio:
+    """
+    Kalman filter with (alpha, beta) as a random-walk state observed
+    through X = alpha + beta * Y + noise.
+
+    delta sets how fast the state may drift (process noise
+    delta / (1 - delta)); obs_noise is the observation noise std as a
+    fraction of the price of X, so the filter behaves the same at any
+    price level.
+
+    update() returns the prior (alpha, beta) for the bar, i.e. the state
+    before X_t is seen. The posterior has absorbed X_t, so X_t - beta * Y_t
+    built from it collapses to alpha.
+    """
+
+    def __init__(self, delta: float = 1e-4, obs_noise: float = 1e-3):
+        if not 0 < delta < 1:
+            raise ValueError(f"delta must be in (0, 1), got {delta}")
+        self.delta = delta
+        self.obs_noise = obs_noise
+        self.alpha_ = 0.0
+        self.beta_ = 0.0
+        # State covariance [[p00, p01], [p01, p11]]
+        self.p00 = self.p11 = 1.0
+        self.p01 = 0.0
+        self.n = 0
+
+    def update(self, x: float, y: float) -> tuple[float, float]:
+        q = self.delta / (1.0 - self.delta)
+
+        # Predict: random walk → mean unchanged, covariance grows by Q
+        prior = (self.alpha_, self.beta_) if self.n else (math.nan, math.nan)
+        p00 = self.p00 + q
+        p01 = self.p01
+        p11 = self.p11 + q
+
+        # Observation h = [1, y]
+        e = x - (self.alpha_ + self.beta_ * y)
+        ph0 = p00 + p01 * y
+        ph1 = p01 + p11 * y
+        s = ph0 + ph1 * y + (self.obs_noise * x) ** 2
+        k0 = ph0 / s
+        k1 = ph1 / s
+
+        self.alpha_ += k0 * e
+        self.beta_ += k1 * e
+
+        self.p00 = p00 - k0 * ph0
+        self.p01 = p01 - k0 * ph1
+        self.p11 = p11 - k1 * ph1
+        self.n += 1
+
+        return prior
+
+    @property
+    def alpha(self) -> float:
+        return self.alpha_
+
+    @property
+    def beta(self) -> float:
+        return self.beta_
+
+    @property
+    def r2(self) -> float:
+        return math.nan
+
+    def to_state(self) -> dict:
+        return dict(vars(self))
+
+    @classmethod
+    def from_state(cls, state: dict) -> "KalmanHedgeRatio":
+        obj = cls(state["delta"], state["obs_noise"])
+        vars(obj).update(state)
+        return obj
+
+
+ESTIMATORS = {
+    "rls": RecursiveLeastSquares,
+    "kalman": KalmanHedgeRatio,
+}
+
+# Values an OnlineHedgeRatio may persist state for (QA_RLS_FORGETTING,
+# QA_KALMAN_DELTA); client-chosen floats would each add a model
+ALLOWED_PARAMS = {
+    "rls": {"forgetting": RLS_FORGETTING},
+    "kalman": {"delta": KALMAN_DELTA},
+}
+
+_update_lock = threading.Lock()
+
+
+def check_online_params(method: str, params: dict):
+    """
+    ValueError unless every parameter is in ALLOWED_PARAMS[method]
+    """
+    for name, value in params.items():
+        allowed = ALLOWED_PARAMS[method].get(name, ())
+        if value not in allowed:
+            raise ValueError(f"{name}={value} not allowed for {method}, use one of {allowed}")
+
+
+def _finite(v: float):
+    return None if math.isnan(v) else v
+
+
+class OnlineHedgeRatio:
+    """
+    Time-varying hedge ratio maintained bar by bar.
+
+    Estimator state and the (alpha, beta) series are persisted in DuckDB,
+    so each call only feeds bars newer than the last one processed.
+    """
+
+    def __init__(self, timeframe: str = "1m", method: str = "rls", **params):
+        if method not in ESTIMATORS:
+            raise ValueError(f"Unknown online method: {method}")
+        check_online_params(method, params)
+
+        self.db = DuckDBManager()
+        self.timeframe = timeframe
+        self.method = method
+        self.params = params
+        self.reg = HedgeRatioOLS(timeframe=timeframe)
+
+        # e.g. "rls(forgetting=0.99)" – one state per parameter set
+        args = ",".join(f"{k}={v}" for k, v in sorted(params.items()))
+        self.model = f"{method}({args})"
+
+        self.db.pool.run_once("hedge_state", self._init_tables)
+
+    def _init_tables(self):
+        self.db.con.execute("""
+        CREATE TABLE IF NOT EXISTS hedge_state (
+            pair VARCHAR,
+            timeframe VARCHAR,
+            model VARCHAR,
+            last_ts TIMESTAMP,
+            state VARCHAR
+        )
+        """)
+        self.db.con.execute("""
+        CREATE TABLE IF NOT EXISTS hedge_series (
+            timestamp TIMESTAMP,
+            pair VARCHAR,
+            timeframe VARCHAR,
+            model VARCHAR,
+            alpha DOUBLE,
+            beta DOUBLE
+        )
+        """)
+
+    def update(self, symbol_x: str, symbol_y: str):
+        """
+        Feed bars newer than the persisted state into the estimator
+        """
+        pair = f"{symbol_x}-{symbol_y}"
+
+        with _update_lock:
+            row = self.db.con.execute(
+                """
+                SELECT last_ts, state FROM hedge_state
+                WHERE pair = ? AND timeframe = ? AND model = ?
+                """,
+                [pair, self.timeframe, self.model],
+            ).fetchone()
+
+            if row is None:
+                last_ts = None
+                est = ESTIMATORS[self.method](**self.params)
+            else:
+                last_ts = row[0]
+                est = ESTIMATORS[self.method].from_state(json.loads(row[1]))
+
+            data = self.reg.load_pair_data(symbol_x, symbol_y, since=last_ts)
+
+            # The latest bar is rewritten by the resampler's next pass
+            # (>= watermark), so only feed bars that can no longer change
+            data = data.iloc[:-1]
+            if data.empty:
+                return est
+
+            xs = data[symbol_x].to_numpy()
+            ys = data[symbol_y].to_numpy()
+            alphas = []
+            betas = []
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                a, b = est.update(x, y)
+                alphas.append(a)
+                betas.append(b)
+
+            series = pd.DataFrame(
+                {
+                    "timestamp": data.index,
+                    "pair": pair,
+                    "timeframe": self.timeframe,
+                    "model": self.model,
+                    "alpha": alphas,
+                    "beta": betas,
+                }
+            )
+
+            with self.db.write() as con:
+                con.execute(
+                    """
+                    DELETE FROM hedge_state
+                    WHERE pair = ? AND timeframe = ? AND model = ?
+                    """,
+                    [pair, self.timeframe, self.model],
+                )
+                con.execute(
+                    "INSERT INTO hedge_state VALUES (?, ?, ?, ?, ?)",
+                    [
+                        pair,
+                        self.timeframe,
+                        self.model,
+                        data.index[-1],
+                        json.dumps(est.to_state()),
+                    ],
+                )
+                con.append("hedge_series", series)
+
+            return est
+
+    def beta_series(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        start=None,
+        end=None,
+        lookback: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Time-varying (alpha, beta) indexed by bar timestamp
+        """
+        df = self.db.con.execute(
+            f"""
+            SELECT timestamp, alpha, beta FROM hedge_series
+            WHERE pair = ? AND timeframe = ? AND model = ?
+            AND (?::TIMESTAMP IS NULL OR timestamp >= ?::TIMESTAMP)
+            AND (?::TIMESTAMP IS NULL OR timestamp <= ?::TIMESTAMP)
+            ORDER BY timestamp {"DESC" if lookback else "ASC"}
+            LIMIT ?
+            """,
+            [
+                f"{symbol_x}-{symbol_y}",
+                self.timeframe,
+                self.model,
+                start,
+                start,
+                end,
+                end,
+                lookback,
+            ],
+        ).fetchdf()
+
+        return df.sort_values("timestamp").set_index("timestamp")
+
+    def compute(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        start=None,
+        end=None,
+        lookback: int | None = None,
+    ) -> dict:
+        """
+        Latest online hedge ratio plus its beta series
+        (cached until the next bar is written)
+        """
+        return cached_pair_result(
+            "hedge_ratio_online",
+            symbol_x,
+            symbol_y,
+            self.timeframe,
+            lambda: self._compute(symbol_x, symbol_y, start, end, lookback),
+            self.model,
+            start,
+            end,
+            lookback,
+        )
+
+    def _compute(self, symbol_x, symbol_y, start, end, lookback) -> dict:
+        est = self.update(symbol_x, symbol_y)
+        # First RLS bar has no variance yet → NaN beta
+        series = self.beta_series(symbol_x, symbol_y, start, end, lookback).dropna()
+
+        if series.empty:
+            raise ValueError("No bar data available for regression")
+
+        return {
+            "symbol_x": symbol_x,
+            "symbol_y": symbol_y,
+            "method": self.method,
+            "model": self.model,
+            "alpha": _finite(est.alpha),
+            "beta": _finite(est.beta),
+            "r2": _finite(est.r2),
+            "n_obs": est.n,
+            "series": series.reset_index().to_dict(orient="records"),
+        }
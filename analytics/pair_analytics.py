@@ -0,0 +1,113 @@
+import numpy as np
+from analytics.alerts import AlertEngine
+from analytics.cache import cached_pair_result
+from analytics.regression import HedgeRatioOLS
+from analytics.stats import RollingCorrelationCalculator, ZScoreCalculator
+
+PAIR_FIELDS = ("hedge_ratio", "spread", "zscore", "correlation", "alerts")
+
+
+class PairAnalytics:
+    """
+    Hedge ratio, spread, z-score, rolling correlation and alerts from one
+    aligned bar load and one OLS fit, in the same shapes as the
+    individual routes (/hedge-ratio, /spread, /zscore, /correlation,
+    /alerts).
+    """
+
+    def __init__(
+        self,
+        timeframe: str = "1m",
+        window: int = 20,
+        z_threshold: float = 2.0,
+        corr_threshold: float = 0.7,
+    ):
+        self.timeframe = timeframe
+        self.window = window
+        self.reg = HedgeRatioOLS(timeframe=timeframe)
+        self.engine = AlertEngine(z_threshold, corr_threshold)
+
+    def compute(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        fields: tuple[str, ...] = PAIR_FIELDS,
+        start=None,
+        end=None,
+        lookback: int | None = None,
+    ) -> dict:
+        """
+        Requested fields only (cached until the next bar is written)
+        """
+        unknown = set(fields) - set(PAIR_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        return cached_pair_result(
+            "pair_analytics",
+            symbol_x,
+            symbol_y,
+            self.timeframe,
+            lambda: self._compute(symbol_x, symbol_y, fields, start, end, lookback),
+            self.window,
+            self.engine.z_threshold,
+            self.engine.corr_threshold,
+            tuple(sorted(fields)),
+            start,
+            end,
+            lookback,
+        )
+
+    def _compute(self, symbol_x, symbol_y, fields, start, end, lookback) -> dict:
+        # 1️⃣ One aligned load, one fit
+        pivot = self.reg.load_pair_data(
+            symbol_x, symbol_y, start=start, end=end, lookback=lookback
+        )
+        hr = self.reg.fit(pivot, symbol_x, symbol_y)
+        result = {}
+
+        if "hedge_ratio" in fields:
+            result["hedge_ratio"] = hr
+
+        # 2️⃣ Spread / z-score (alerts need the z-score too)
+        spread_df = (pivot[symbol_x] - hr["beta"] * pivot[symbol_y]).to_frame("spread")
+
+        if "spread" in fields:
+            result["spread"] = spread_df.reset_index().to_dict(orient="records")
+
+        z_df = None
+        if {"zscore", "alerts"} & set(fields):
+            z_df = ZScoreCalculator(window=self.window).compute(spread_df)
+
+        if "zscore" in fields:
+            # 🔴 Same guard as /zscore: not enough data → empty
+            if len(spread_df) < self.window:
+                result["zscore"] = []
+            else:
+                result["zscore"] = (
+                    z_df.dropna(subset=["zscore"])
+                    .reset_index()
+                    .to_dict(orient="records")
+                )
+
+        # 3️⃣ Rolling correlation on the same prices
+        corr_df = None
+        if {"correlation", "alerts"} & set(fields):
+            rc = RollingCorrelationCalculator(window=self.window)
+            corr_df = rc.compute(pivot, symbol_x, symbol_y)
+
+        if "correlation" in fields:
+            # Drops NaN / inf; unlike replace(..., None) it keeps the
+            # column float64, which serialises several times faster
+            finite = np.isfinite(corr_df["rolling_corr"].to_numpy())
+            result["correlation"] = (
+                corr_df[finite].reset_index().to_dict(orient="records")
+            )
+
+        # 4️⃣ Alerts
+        if "alerts" in fields:
+            result["alerts"] = self.engine.evaluate(
+                z_df, corr_df, symbol_x, symbol_y
+            )
+
+        return result
@@ -0,0 +1,109 @@
+from typing import get_args
+
+import numpy as np
+import pandas as pd
+from analytics.resampler import TimeFrame
+from storage.duckdb_manager import DuckDBManager
+
+
+class PairData:
+    """
+    Close prices of two symbols aligned on bar timestamp, as NumPy arrays
+    """
+
+    def __init__(self, timestamp: np.ndarray, x: np.ndarray, y: np.ndarray):
+        self.timestamp = timestamp
+        self.x = x
+        self.y = y
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def to_frame(self, symbol_x: str, symbol_y: str) -> pd.DataFrame:
+        """
+        Same layout as the old pandas pivot: index=timestamp, column per symbol
+        """
+        index = pd.DatetimeIndex(self.timestamp, name="timestamp")
+        return pd.DataFrame({symbol_x: self.x, symbol_y: self.y}, index=index)
+
+
+def load_pair(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str = "1m",
+    start=None,
+    end=None,
+    lookback: int | None = None,
+    since=None,
+    db: DuckDBManager | None = None,
+) -> PairData:
+    """
+    Align two symbols' bars inside DuckDB (self-join on timestamp).
+
+    start / end bound the range (inclusive), since is exclusive (for
+    incremental consumers) and lookback keeps only the last N aligned bars.
+    """
+    if timeframe not in get_args(TimeFrame):
+        raise ValueError(f"Unknown timeframe: {timeframe}")
+
+    db = db or DuckDBManager()
+    args = [symbol_x, symbol_y, timeframe, start, end, since, lookback, db]
+
+    if lookback:
+        # Cut the join input to symbol_x's newest `lookback` bars first;
+        # gaps in symbol_y can leave fewer aligned bars → fall back
+        pair = _query(*args, cutoff=True)
+        if len(pair) == lookback:
+            return pair
+
+    return _query(*args, cutoff=False)
+
+
+def _query(symbol_x, symbol_y, timeframe, start, end, since, lookback, db, cutoff):
+    cutoff_sql = ""
+    cutoff_args = []
+    if cutoff:
+        cutoff_sql = f"""
+        AND x.timestamp >= (
+            SELECT MIN(timestamp) FROM (
+                SELECT timestamp FROM bars_{timeframe}
+                WHERE symbol = ?
+                AND (?::TIMESTAMP IS NULL OR timestamp >= ?::TIMESTAMP)
+                AND (?::TIMESTAMP IS NULL OR timestamp <= ?::TIMESTAMP)
+                AND (?::TIMESTAMP IS NULL OR timestamp > ?::TIMESTAMP)
+                ORDER BY timestamp DESC
+                LIMIT ?
+            )
+        )
+        """
+        cutoff_args = [symbol_x, start, start, end, end, since, since, lookback]
+
+    # Newest-first when limited, so LIMIT keeps the most recent bars
+    order = "DESC" if lookback else "ASC"
+    query = f"""
+    SELECT x.timestamp, x.close AS x, y.close AS y
+    FROM bars_{timeframe} x
+    JOIN bars_{timeframe} y ON x.timestamp = y.timestamp
+    WHERE x.symbol = ? AND y.symbol = ?
+    AND (?::TIMESTAMP IS NULL OR x.timestamp >= ?::TIMESTAMP)
+    AND (?::TIMESTAMP IS NULL OR x.timestamp <= ?::TIMESTAMP)
+    AND (?::TIMESTAMP IS NULL OR x.timestamp > ?::TIMESTAMP)
+    {cutoff_sql}
+    ORDER BY x.timestamp {order}
+    LIMIT ?
+    """
+    cols = db.con.execute(
+        query,
+        [symbol_x, symbol_y, start, start, end, end, since, since]
+        + cutoff_args
+        + [lookback],
+    ).fetchnumpy()
+
+    ts = cols["timestamp"]
+    x = np.asarray(cols["x"], dtype="float64")
+    y = np.asarray(cols["y"], dtype="float64")
+
+    if lookback:
+        ts, x, y = ts[::-1], x[::-1], y[::-1]
+
+    return PairData(ts.astype("datetime64[ns]"), x, y)
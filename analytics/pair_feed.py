@@ -0,0 +1,297 @@
+import asyncio
+import json
+import math
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+from analytics.alerts import DIRECTIONS, AlertEngine, AlertState
+from analytics.cache import bar_watermark
+from analytics.online_regression import ESTIMATORS, RecursiveLeastSquares
+from analytics.pair_data import load_pair
+from analytics.stats import StreamingCorrelation
+from storage.duckdb_manager import DuckDBManager
+from utils.executor import run_blocking
+
+
+def _finite(v: float):
+    return None if math.isnan(v) else float(v)
+
+
+def _json_default(obj):
+    if isinstance(obj, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(obj).isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Not JSON serializable: {type(obj).__name__}")
+
+
+def to_json(payload: dict) -> str:
+    return json.dumps(payload, default=_json_default)
+
+
+class PairFeed:
+    """
+    Push feed for one pair / timeframe / parameter set.
+
+    Each closed bar is processed once, however many clients are
+    subscribed: the hedge ratio, z-score, rolling correlation and alert
+    state are advanced in O(window) and the resulting delta is fanned out
+    to every subscriber queue. The newest bar is held back (the resampler
+    may still rewrite it), like the streaming /correlation route does.
+
+    The z-score of bar t uses the hedge ratio known at t (method "ols" is
+    least squares over every bar up to t), so values never change once
+    pushed, unless the resampler rewrites a bar already pushed: then the
+    feed rebuilds from the stored bars and pushes a fresh snapshot.
+    """
+
+    def __init__(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        timeframe: str = "1m",
+        window: int = 20,
+        z_threshold: float = 2.0,
+        corr_threshold: float = 0.7,
+        method: str = "ols",
+        history: int = 500,
+        **params,
+    ):
+        self.db = DuckDBManager()
+        self.symbol_x = symbol_x
+        self.symbol_y = symbol_y
+        self.timeframe = timeframe
+        self.window = window
+        self.method = method
+        self.params = params
+        self.history = history
+        self.engine = AlertEngine(z_threshold, corr_threshold)
+
+        self.reset()
+        # Bar rewrite counts the committed bars were read at
+        self.rewrites = None
+        self.seq = 0
+        self.lock = threading.Lock()
+
+        self.subscribers: set[asyncio.Queue] = set()
+        self.task: asyncio.Task | None = None
+
+    def reset(self):
+        """
+        Forget every committed bar, e.g. after older bars were rewritten
+        """
+        # ols = recursive least squares without forgetting
+        if self.method == "ols":
+            self.estimator = RecursiveLeastSquares(forgetting=1.0)
+        else:
+            self.estimator = ESTIMATORS[self.method](**self.params)
+
+        self.corr = StreamingCorrelation(window=self.window, history=1)
+        self.xs: deque = deque(maxlen=self.window)
+        self.ys: deque = deque(maxlen=self.window)
+        self.alert_state = AlertState(max_events=self.history)
+
+        # Recent points / bars for the snapshot a new subscriber starts from
+        self.points: deque = deque(maxlen=self.history)
+        self.bars: deque = deque(maxlen=2 * self.history)
+
+        self.last_ts = None
+
+    def _zscore(self, beta: float) -> float:
+        if len(self.xs) < self.window or math.isnan(beta):
+            return math.nan
+        spread = np.asarray(self.xs) - beta * np.asarray(self.ys)
+        std = spread.std(ddof=1)
+        return (spread[-1] - spread.mean()) / std if std > 0 else math.nan
+
+    def advance(self) -> dict | None:
+        """
+        Process bars closed since the last call; returns the delta
+        (None when nothing new), or the whole rebuilt state flagged
+        `resync` when bars already pushed were rewritten
+        """
+        with self.lock:
+            # Bars already committed were replaced (e.g. resampler
+            # reconciliation) → rebuild from the stored bars
+            rewrites = (
+                self.db.pool.bar_rewrites(self.symbol_x, self.timeframe),
+                self.db.pool.bar_rewrites(self.symbol_y, self.timeframe),
+            )
+            resync = rewrites != self.rewrites and self.last_ts is not None
+            if resync:
+                print(
+                    f"[FEED] {self.symbol_x}-{self.symbol_y} {self.timeframe} "
+                    "bars rewritten, resyncing"
+                )
+                self.reset()
+            self.rewrites = rewrites
+
+            pair = load_pair(
+                self.symbol_x,
+                self.symbol_y,
+                self.timeframe,
+                since=self.last_ts,
+                db=self.db,
+            )
+            # 🔴 Latest bar is still open
+            n = len(pair) - 1
+            if n <= 0:
+                if resync:
+                    self.seq += 1
+                    return {**self._state(), "resync": True}
+                return None
+
+            history = self.points.maxlen
+            points = []
+            for i, (ts, x, y) in enumerate(
+                zip(pair.timestamp[:n].tolist(), pair.x[:n].tolist(), pair.y[:n].tolist())
+            ):
+                alpha, beta = self.estimator.update(x, y)
+                corr = self.corr.update(ts, x, y)
+                self.xs.append(x)
+                self.ys.append(y)
+
+                # Warm-up over the full history only keeps the tail
+                if n - i > history:
+                    continue
+
+                points.append(
+                    {
+                        "timestamp": pd.Timestamp(ts),
+                        "x": x,
+                        "y": y,
+                        "alpha": _finite(alpha),
+                        "beta": _finite(beta),
+                        "spread": _finite(x - beta * y),
+                        "zscore": _finite(self._zscore(beta)),
+                        "rolling_corr": _finite(corr),
+                    }
+                )
+
+            first_ts, self.last_ts = points[0]["timestamp"], points[-1]["timestamp"]
+            bars = self._load_bars(first_ts, self.last_ts)
+            alerts = self._evaluate_alerts(points)
+
+            self.points.extend(points)
+            self.bars.extend(bars)
+            self.seq += 1
+
+            if resync:
+                return {**self._state(), "resync": True}
+            return {
+                "seq": self.seq,
+                "points": points,
+                "bars": bars,
+                "alerts": alerts,
+                "active": DIRECTIONS.get(self.alert_state.active),
+            }
+
+    def _load_bars(self, start, end) -> list[dict]:
+        return (
+            self.db.con.execute(
+                f"""
+                SELECT * FROM bars_{self.timeframe}
+                WHERE symbol IN (?, ?) AND timestamp BETWEEN ? AND ?
+                ORDER BY timestamp, symbol
+                """,
+                [self.symbol_x, self.symbol_y, start, end],
+            )
+            .fetchdf()
+            .to_dict(orient="records")
+        )
+
+    def _evaluate_alerts(self, points: list[dict]) -> list[dict]:
+        df = pd.DataFrame(points).set_index("timestamp")
+        z_df = df[["zscore"]].astype("float64")
+        corr_df = df[["rolling_corr"]].astype("float64")
+        return self.engine.evaluate_incremental(
+            self.alert_state, z_df, corr_df, self.symbol_x, self.symbol_y
+        )
+
+    def _state(self) -> dict:
+        return {
+            "seq": self.seq,
+            "points": list(self.points),
+            "bars": list(self.bars),
+            "alerts": list(self.alert_state.events),
+            "active": DIRECTIONS.get(self.alert_state.active),
+        }
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return self._state()
+
+    async def subscribe(self, maxsize: int = 100) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.subscribers.add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+        # Last viewer gone → stop polling
+        if not self.subscribers and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def publish(self, delta: dict):
+        # Serialised once, whatever the number of subscribers; a resync
+        # replaces what clients hold, like the snapshot they started from
+        event = "snapshot" if delta.get("resync") else "update"
+        message = (delta["seq"], event, to_json(delta))
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # 🔴 Slow client: drop it rather than buffer without bound;
+                # None tells it to disconnect and resync from a snapshot
+                self.subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def run(self, interval: float = 0.5):
+        """
+        Advance whenever the timeframe's bar watermark moves
+        """
+        seen = None
+        while True:
+            try:
+                watermark = bar_watermark(self.timeframe)
+                if watermark != seen or self.last_ts is None:
+                    seen = watermark
+                    delta = await run_blocking(self.advance)
+                    if delta:
+                        self.publish(delta)
+            except Exception as e:
+                print(f"[FEED] {self.symbol_x}-{self.symbol_y} error: {e}")
+
+            await asyncio.sleep(interval)
+
+
+pair_feeds: dict[tuple, PairFeed] = {}
+pair_feeds_lock = threading.Lock()
+
+
+def get_pair_feed(key: tuple, factory) -> PairFeed:
+    """
+    Process-wide feed per (pair, timeframe, params) key
+    """
+    with pair_feeds_lock:
+        if key not in pair_feeds:
+            pair_feeds[key] = factory()
+        return pair_feeds[key]
+
+
+def release_pair_feed(key: tuple, feed: PairFeed, queue: asyncio.Queue):
+    """
+    Unsubscribe `queue`; once the last subscriber is gone the feed is
+    dropped from the registry, so only watched parameter sets use memory
+    """
+    feed.unsubscribe(queue)
+    with pair_feeds_lock:
+        if not feed.subscribers and pair_feeds.get(key) is feed:
+            del pair_feeds[key]
@@ -1,42 +1,147 @@
+import numpy as np
 import pandas as pd
 import statsmodels.api as sm
+from analytics.cache import cached_pair_result
+from analytics.pair_data import load_pair
 from storage.duckdb_manager import DuckDBManager
 
 
+def window_moments(
+    x: np.ndarray, y: np.ndarray, window: int | None = None, min_periods: int = 2
+) -> dict[str, np.ndarray]:
+    """
+    Per bar: count, means and centred co-moments (c_xx, c_yy, c_xy) of the
+    trailing `window` bars (expanding from the first bar when None), from
+    prefix sums of x, y, x², y², xy in one O(n) pass.
+
+    `valid` is False before the first full window (rolling) or before
+    `min_periods` bars (expanding).
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    n = len(x)
+
+    # Moments are shift invariant; centring keeps the prefix sums small
+    mx, my = (x.mean(), y.mean()) if n else (0.0, 0.0)
+    xc, yc = x - mx, y - my
+
+    def prefix(v):
+        out = np.zeros(n + 1)
+        np.cumsum(v, out=out[1:])
+        return out
+
+    sums = [prefix(v) for v in (xc, yc, xc * xc, yc * yc, xc * yc)]
+
+    end = np.arange(1, n + 1)
+    if window is None:
+        start = np.zeros(n, dtype=int)
+        valid = end >= max(min_periods, 2)
+    else:
+        start = np.maximum(end - window, 0)
+        valid = end >= max(window, 2)
+
+    cnt = (end - start).astype("float64")
+    sx, sy, sxx, syy, sxy = (s[end] - s[start] for s in sums)
+
+    return {
+        "n": cnt,
+        "mean_x": sx / cnt + mx,
+        "mean_y": sy / cnt + my,
+        "c_xx": sxx - sx * sx / cnt,
+        "c_yy": syy - sy * sy / cnt,
+        "c_xy": sxy - sx * sy / cnt,
+        "valid": valid,
+    }
+
+
+def window_ols(
+    x: np.ndarray, y: np.ndarray, window: int | None = None, min_periods: int = 2
+) -> dict[str, np.ndarray]:
+    """
+    OLS X = alpha + beta * Y over every trailing window of `window` bars
+    (expanding from the first bar when None), in one vectorized pass.
+
+    Bars before the first full window (rolling) or before `min_periods`
+    bars (expanding) are NaN.
+    """
+    m = window_moments(x, y, window, min_periods)
+    c_xx, c_yy, c_xy, valid = m["c_xx"], m["c_yy"], m["c_xy"], m["valid"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = np.where(valid & (c_yy > 0), c_xy / c_yy, np.nan)
+        r2 = np.where(valid & (c_xx * c_yy > 0), c_xy**2 / (c_xx * c_yy), np.nan)
+    alpha = m["mean_x"] - beta * m["mean_y"]
+
+    return {"alpha": alpha, "beta": beta, "r2": r2, "n_obs": m["n"].astype(int)}
+
+
 class HedgeRatioOLS:
     def __init__(self, timeframe: str = "1m"):
         self.db = DuckDBManager()
         self.timeframe = timeframe
 
-    def load_pair_data(self, symbol_x: str, symbol_y: str) -> pd.DataFrame:
+    def load_pair_data(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        since=None,
+        start=None,
+        end=None,
+        lookback: int | None = None,
+    ) -> pd.DataFrame:
         """
         Load and align bar data for two symbols
+        (aligned in DuckDB; only bars after `since` when given)
         """
-        query = f"""
-        SELECT timestamp, symbol, close
-        FROM bars_{self.timeframe}
-        WHERE symbol IN (?, ?)
-        ORDER BY timestamp
-        """
-        df = self.db.con.execute(query, [symbol_x, symbol_y]).fetchdf()
+        pair = load_pair(
+            symbol_x,
+            symbol_y,
+            self.timeframe,
+            start=start,
+            end=end,
+            lookback=lookback,
+            since=since,
+            db=self.db,
+        )
 
-        if df.empty:
+        if len(pair) == 0 and since is None:
             raise ValueError("No bar data available for regression")
 
-        # Pivot → columns = symbols
-        pivot = df.pivot(index="timestamp", columns="symbol", values="close")
-
-        # Keep only aligned timestamps
-        pivot = pivot.dropna()
+        return pair.to_frame(symbol_x, symbol_y)
 
-        return pivot
-
-    def compute(self, symbol_x: str, symbol_y: str) -> dict:
+    def compute(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        start=None,
+        end=None,
+        lookback: int | None = None,
+    ) -> dict:
         """
         Compute OLS hedge ratio: X ~ alpha + beta * Y
+        (cached until the next bar is written)
         """
-        data = self.load_pair_data(symbol_x, symbol_y)
+        return cached_pair_result(
+            "hedge_ratio",
+            symbol_x,
+            symbol_y,
+            self.timeframe,
+            lambda: self.fit(
+                self.load_pair_data(
+                    symbol_x, symbol_y, start=start, end=end, lookback=lookback
+                ),
+                symbol_x,
+                symbol_y,
+            ),
+            start,
+            end,
+            lookback,
+        )
 
+    def fit(self, data: pd.DataFrame, symbol_x: str, symbol_y: str) -> dict:
+        """
+        Fit OLS hedge ratio on already aligned prices
+        """
         y = data[symbol_x]
         x = data[symbol_y]
 
@@ -57,3 +162,72 @@ class HedgeRatioOLS:
             "r2": r2,
             "n_obs": int(model.nobs),
         }
+
+    def fit_series(
+        self,
+        data: pd.DataFrame,
+        symbol_x: str,
+        symbol_y: str,
+        window: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Rolling (`window` bars) or expanding (window=None) OLS hedge ratio
+        on already aligned prices, one row per bar
+        """
+        fit = window_ols(
+            data[symbol_x].to_numpy(), data[symbol_y].to_numpy(), window
+        )
+        return pd.DataFrame(
+            {k: fit[k] for k in ("alpha", "beta", "r2")}, index=data.index
+        )
+
+    def compute_series(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        window: int | None = None,
+        start=None,
+        end=None,
+        lookback: int | None = None,
+    ) -> dict:
+        """
+        Latest rolling / expanding hedge ratio plus its beta series
+        (cached until the next bar is written)
+        """
+        return cached_pair_result(
+            "hedge_ratio_series",
+            symbol_x,
+            symbol_y,
+            self.timeframe,
+            lambda: self._compute_series(
+                symbol_x, symbol_y, window, start, end, lookback
+            ),
+            window,
+            start,
+            end,
+            lookback,
+        )
+
+    def _compute_series(self, symbol_x, symbol_y, window, start, end, lookback):
+        data = self.load_pair_data(
+            symbol_x, symbol_y, start=start, end=end, lookback=lookback
+        )
+        series = self.fit_series(data, symbol_x, symbol_y, window).dropna(
+            subset=["beta"]
+        )
+
+        if series.empty:
+            raise ValueError("Not enough bars for the regression window")
+
+        latest = series.iloc[-1]
+        return {
+            "symbol_x": symbol_x,
+            "symbol_y": symbol_y,
+            "method": "expanding" if window is None else "rolling",
+            "window": window,
+            "alpha": float(latest["alpha"]),
+            "beta": float(latest["beta"]),
+            "r2": float(latest["r2"]),
+            "n_obs": int(len(data)),
+            "series": series.reset_index().to_dict(orient="records"),
+        }
@@ -1,13 +1,18 @@
 import asyncio
 from analytics.resampler import TickResampler
+from utils.config import SYMBOLS
+from utils.executor import run_blocking
 
 async def resample_loop(interval: int = 60):
     """
     Periodically resample ticks into bars.
     interval: seconds (60 = 1 minute)
+
+    Runs incrementally: each cycle only touches ticks from the last
+    persisted bar onwards instead of rebuilding the full history.
     """
     resampler = TickResampler()
-    symbols = ["BTCUSDT", "ETHUSDT"]
+    symbols = SYMBOLS
     timeframes = ["1m", "5m"]
 
     print("[RESAMPLER] Started resampling loop")
@@ -16,7 +21,10 @@ async def resample_loop(interval: int = 60):
         try:
             for symbol in symbols:
                 for tf in timeframes:
-                    resampler.resample(symbol, tf)
+                    # pandas + DuckDB work off the event loop
+                    await run_blocking(
+                        resampler.resample, symbol, tf, incremental=True
+                    )
         except Exception as e:
             print(f"[RESAMPLER] Error: {e}")
 
@@ -0,0 +1,343 @@
+import asyncio
+import multiprocessing as mp
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import get_args
+
+import numpy as np
+import pandas as pd
+from analytics.adf import adf_on_array
+from analytics.resampler import TimeFrame
+from storage.duckdb_manager import DuckDBManager
+from utils.config import (
+    SCAN_ENABLED,
+    SCAN_INTERVAL,
+    SCAN_LOOKBACK,
+    SCAN_SYMBOLS,
+    SCAN_TIMEFRAME,
+    SCAN_TOP_K,
+    SCAN_WORKERS,
+)
+from utils.executor import run_blocking
+
+# Set by the first /scanner read: until then no scan runs and no
+# worker process is started
+scan_requested = threading.Event()
+_first_scan = threading.Lock()
+
+SCAN_COLUMNS = [
+    "scanned_at",
+    "timeframe",
+    "rank",
+    "symbol_x",
+    "symbol_y",
+    "correlation",
+    "alpha",
+    "beta",
+    "r2",
+    "adf_statistic",
+    "p_value",
+    "is_stationary",
+    "n_obs",
+]
+
+
+def _init_table(db: DuckDBManager):
+    db.pool.run_once(
+        "pair_scan",
+        lambda: db.con.execute("""
+        CREATE TABLE IF NOT EXISTS pair_scan (
+            scanned_at TIMESTAMP,
+            timeframe VARCHAR,
+            rank INTEGER,
+            symbol_x VARCHAR,
+            symbol_y VARCHAR,
+            correlation DOUBLE,
+            alpha DOUBLE,
+            beta DOUBLE,
+            r2 DOUBLE,
+            adf_statistic DOUBLE,
+            p_value DOUBLE,
+            is_stationary BOOLEAN,
+            n_obs INTEGER
+        )
+        """),
+    )
+
+
+def load_close_matrix(
+    symbols: list[str],
+    timeframe: str = "1m",
+    lookback: int | None = None,
+    min_coverage: float = 0.9,
+    db: DuckDBManager | None = None,
+) -> pd.DataFrame:
+    """
+    Close prices of many symbols in one query, aligned on timestamp
+    (index=timestamp, column per symbol).
+
+    Symbols present on fewer than `min_coverage` of the timestamps are
+    dropped, then only timestamps where every remaining symbol has a bar
+    are kept.
+    """
+    if timeframe not in get_args(TimeFrame):
+        raise ValueError(f"Unknown timeframe: {timeframe}")
+
+    db = db or DuckDBManager()
+    placeholders = ", ".join("?" * len(symbols))
+
+    # Newest `lookback` timestamps across the universe
+    df = db.con.execute(
+        f"""
+        SELECT timestamp, symbol, close
+        FROM bars_{timeframe}
+        WHERE symbol IN ({placeholders})
+        AND timestamp >= COALESCE((
+            SELECT MIN(timestamp) FROM (
+                SELECT DISTINCT timestamp FROM bars_{timeframe}
+                WHERE symbol IN ({placeholders})
+                ORDER BY timestamp DESC
+                LIMIT ?
+            )
+        ), TIMESTAMP '-infinity')
+        """,
+        [*symbols, *symbols, lookback],
+    ).fetchdf()
+
+    matrix = df.pivot(index="timestamp", columns="symbol", values="close")
+    matrix = matrix.sort_index()
+
+    coverage = matrix.notna().mean()
+    matrix = matrix.loc[:, coverage >= min_coverage].dropna()
+    return matrix[[s for s in symbols if s in matrix.columns]]
+
+
+def pairwise_ols(prices: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Correlation and OLS (X_i = alpha + beta * X_j) for every ordered pair
+    from one covariance matrix; [i, j] holds the fit of column i on j
+    """
+    means = prices.mean(axis=0)
+    centered = prices - means
+    cov = centered.T @ centered / (len(prices) - 1)
+
+    var = np.diag(cov)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(var)
+        corr = cov / np.outer(std, std)
+        beta = cov / var[np.newaxis, :]
+    alpha = means[:, np.newaxis] - beta * means[np.newaxis, :]
+
+    return {"corr": corr, "beta": beta, "alpha": alpha, "r2": corr**2}
+
+
+class UniverseScanner:
+    """
+    Screens every pair of a symbol universe for cointegration.
+
+    One aligned price matrix, one covariance matrix for all correlations /
+    hedge ratios, then ADF only on the `top_k` most correlated pairs, in
+    worker processes. The ranked result (lowest ADF p-value first) is
+    stored in `pair_scan`, one scan per timeframe.
+    """
+
+    def __init__(
+        self,
+        symbols: list[str] = SCAN_SYMBOLS,
+        timeframe: str = SCAN_TIMEFRAME,
+        lookback: int = SCAN_LOOKBACK,
+        top_k: int = SCAN_TOP_K,
+        workers: int = SCAN_WORKERS,
+        db: DuckDBManager | None = None,
+    ):
+        self.db = db or DuckDBManager()
+        self.symbols = symbols
+        self.timeframe = timeframe
+        self.lookback = lookback
+        self.top_k = top_k
+        self.workers = workers
+        self._pool: ProcessPoolExecutor | None = None
+
+        _init_table(self.db)
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        # Spawned by the first scan that reaches ADF, then reused
+        # (workers only import pandas/statsmodels)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=mp.get_context("spawn")
+            )
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def candidates(self, prices: pd.DataFrame) -> pd.DataFrame:
+        """
+        Top-k pairs by |correlation| with their OLS fit
+        """
+        fit = pairwise_ols(prices.to_numpy(dtype="float64"))
+        symbols = prices.columns.to_numpy()
+
+        # Each unordered pair once: X = earlier symbol, Y = later one
+        i, j = np.triu_indices(len(symbols), k=1)
+        score = np.abs(fit["corr"][i, j])
+        score = np.nan_to_num(score, nan=-1.0)
+
+        k = min(self.top_k, len(score))
+        top = np.argpartition(-score, k - 1)[:k] if k else np.array([], int)
+        top = top[np.argsort(-score[top])]
+        i, j = i[top], j[top]
+
+        return pd.DataFrame(
+            {
+                "x": i,
+                "y": j,
+                "symbol_x": symbols[i],
+                "symbol_y": symbols[j],
+                "correlation": fit["corr"][i, j],
+                "alpha": fit["alpha"][i, j],
+                "beta": fit["beta"][i, j],
+                "r2": fit["r2"][i, j],
+            }
+        )
+
+    def scan(self) -> pd.DataFrame:
+        """
+        Run one scan, store it and return the ranked table
+        """
+        prices = load_close_matrix(
+            self.symbols, self.timeframe, self.lookback, db=self.db
+        )
+        if prices.shape[1] < 2 or len(prices) < 20:
+            print(f"[SCANNER] Not enough aligned data ({prices.shape})")
+            return pd.DataFrame(columns=SCAN_COLUMNS)
+
+        cands = self.candidates(prices)
+
+        # Spread = X - beta * Y, same as SpreadCalculator
+        values = prices.to_numpy(dtype="float64")
+        spreads = [
+            values[:, x] - beta * values[:, y]
+            for x, y, beta in zip(cands["x"], cands["y"], cands["beta"])
+        ]
+        if self.workers > 1:
+            adf = list(self.pool.map(adf_on_array, spreads))
+        else:
+            adf = [adf_on_array(s) for s in spreads]
+
+        cands["adf_statistic"] = [r.get("adf_statistic") for r in adf]
+        cands["p_value"] = [r.get("p_value") for r in adf]
+        cands["is_stationary"] = [r.get("is_stationary", False) for r in adf]
+        cands["n_obs"] = len(prices)
+
+        ranked = cands.sort_values(
+            ["p_value", "correlation"], ascending=[True, False], na_position="last"
+        ).reset_index(drop=True)
+        ranked["rank"] = np.arange(1, len(ranked) + 1)
+        ranked["timeframe"] = self.timeframe
+        ranked["scanned_at"] = datetime.now(timezone.utc).replace(tzinfo=None)
+        ranked = ranked[SCAN_COLUMNS]
+
+        self.store(ranked)
+        print(
+            f"[SCANNER] {prices.shape[1]} symbols, {len(prices)} bars, "
+            f"{len(ranked)} pairs tested"
+        )
+        return ranked
+
+    def last_scanned_at(self) -> datetime | None:
+        return self.db.con.execute(
+            "SELECT MAX(scanned_at) FROM pair_scan WHERE timeframe = ?",
+            [self.timeframe],
+        ).fetchone()[0]
+
+    def store(self, ranked: pd.DataFrame):
+        # Latest scan replaces the previous one for this timeframe
+        with self.db.write() as con:
+            con.execute("DELETE FROM pair_scan WHERE timeframe = ?", [self.timeframe])
+            con.register("scan_rows", ranked)
+            try:
+                con.execute("INSERT INTO pair_scan SELECT * FROM scan_rows")
+            finally:
+                con.unregister("scan_rows")
+
+
+def latest_scan(
+    timeframe: str = "1m", limit: int = 50, db: DuckDBManager | None = None
+) -> pd.DataFrame:
+    """
+    Ranked pairs of the last scan. The first read with nothing stored
+    scans inline (single process, no pool) instead of returning empty
+    """
+    db = db or DuckDBManager()
+    _init_table(db)
+
+    def stored() -> pd.DataFrame:
+        return db.con.execute(
+            """
+            SELECT * FROM pair_scan
+            WHERE timeframe = ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            [timeframe, limit],
+        ).fetchdf()
+
+    if scan_requested.is_set():
+        return stored()
+
+    with _first_scan:
+        df = stored()
+        if (
+            df.empty
+            and SCAN_ENABLED
+            and timeframe == SCAN_TIMEFRAME
+            and not scan_requested.is_set()
+        ):
+            try:
+                UniverseScanner(
+                    SCAN_SYMBOLS,
+                    timeframe,
+                    SCAN_LOOKBACK,
+                    SCAN_TOP_K,
+                    workers=1,
+                    db=db,
+                ).scan()
+                df = stored()
+            except Exception as e:
+                print(f"[SCANNER] Error: {e}")
+        scan_requested.set()
+    return df
+
+
+async def scanner_loop(interval: float = SCAN_INTERVAL):
+    """
+    Periodic universe scan, off the event loop. Idle until the
+    ranking is first read (scan_requested).
+    """
+    while not scan_requested.is_set():
+        await asyncio.sleep(1.0)
+
+    scanner = await run_blocking(UniverseScanner)
+    try:
+        # The first read may have just scanned inline; wait out the rest
+        # of its interval rather than scanning again straight away
+        last = await run_blocking(scanner.last_scanned_at)
+        if last is not None:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            await asyncio.sleep(max(0.0, interval - (now - last).total_seconds()))
+
+        while True:
+            try:
+                await run_blocking(scanner.scan)
+            except Exception as e:
+                print(f"[SCANNER] Error: {e}")
+
+            await asyncio.sleep(interval)
+    finally:
+        scanner.close()
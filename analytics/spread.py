@@ -1,35 +1,106 @@
 import pandas as pd
 from storage.duckdb_manager import DuckDBManager
+from analytics.cache import cached_pair_result
+from analytics.online_regression import OnlineHedgeRatio
 from analytics.regression import HedgeRatioOLS
 
 
+# OLS refit from the loaded bars (no estimator state)
+WINDOW_METHODS = ("rolling", "expanding")
+
+
 class SpreadCalculator:
-    def __init__(self, timeframe: str = "1m"):
+    def __init__(
+        self,
+        timeframe: str = "1m",
+        method: str = "ols",
+        beta_window: int | None = None,
+        **params,
+    ):
         self.db = DuckDBManager()
         self.timeframe = timeframe
+        self.method = method
         self.reg = HedgeRatioOLS(timeframe=timeframe)
 
-    def compute(self, symbol_x: str, symbol_y: str) -> pd.DataFrame:
+        # rolling / expanding → beta_t from OLS over the bars up to t
+        if method == "rolling" and not beta_window:
+            raise ValueError("method=rolling needs beta_window")
+        self.beta_window = beta_window if method == "rolling" else None
+
+        # rls / kalman → time-varying beta from the online estimator
+        self.online = (
+            None
+            if method == "ols" or method in WINDOW_METHODS
+            else OnlineHedgeRatio(timeframe=timeframe, method=method, **params)
+        )
+
+    def compute(
+        self,
+        symbol_x: str,
+        symbol_y: str,
+        start=None,
+        end=None,
+        lookback: int | None = None,
+    ) -> pd.DataFrame:
         """
         Compute spread time series: X - beta * Y
+        (beta_t per bar for online methods; cached until the next bar is written)
         """
-        # 1️⃣ Compute hedge ratio
-        hr = self.reg.compute(symbol_x, symbol_y)
-        beta = hr["beta"]
+        window = {"start": start, "end": end, "lookback": lookback}
+        return cached_pair_result(
+            "spread",
+            symbol_x,
+            symbol_y,
+            self.timeframe,
+            lambda: self._compute(symbol_x, symbol_y, **window),
+            self.online.model if self.online else (self.method, self.beta_window),
+            start,
+            end,
+            lookback,
+        )
 
-        # 2️⃣ Load aligned data
-        query = f"""
-        SELECT timestamp, symbol, close
-        FROM bars_{self.timeframe}
-        WHERE symbol IN (?, ?)
-        ORDER BY timestamp
-        """
-        df = self.db.con.execute(query, [symbol_x, symbol_y]).fetchdf()
+    def _compute(self, symbol_x: str, symbol_y: str, **window) -> pd.DataFrame:
+        if self.online:
+            return self._compute_online(symbol_x, symbol_y, **window)
+        if self.method in WINDOW_METHODS:
+            return self._compute_window(symbol_x, symbol_y, **window)
 
-        pivot = df.pivot(index="timestamp", columns="symbol", values="close")
-        pivot = pivot.dropna()
+        # 1️⃣ Load aligned data once, for both the fit and the spread
+        pivot = self.reg.load_pair_data(symbol_x, symbol_y, **window)
+
+        # 2️⃣ Compute hedge ratio
+        hr = self.reg.fit(pivot, symbol_x, symbol_y)
+        beta = hr["beta"]
 
         # 3️⃣ Compute spread
         pivot["spread"] = pivot[symbol_x] - beta * pivot[symbol_y]
 
         return pivot[["spread"]]
+
+    def _compute_window(self, symbol_x: str, symbol_y: str, **window) -> pd.DataFrame:
+        # 1️⃣ One aligned load; betas for every bar in one pass
+        pivot = self.reg.load_pair_data(symbol_x, symbol_y, **window)
+        betas = self.reg.fit_series(pivot, symbol_x, symbol_y, self.beta_window)
+
+        # 2️⃣ Spread with the beta fitted up to each bar
+        pivot["spread"] = pivot[symbol_x] - betas["beta"] * pivot[symbol_y]
+
+        return pivot[["spread"]].dropna()
+
+    def _compute_online(self, symbol_x: str, symbol_y: str, **window) -> pd.DataFrame:
+        # 1️⃣ Bring the online estimator up to date
+        self.online.update(symbol_x, symbol_y)
+        pivot = self.reg.load_pair_data(symbol_x, symbol_y, **window)
+        if pivot.empty:
+            return pd.DataFrame({"spread": []}, index=pivot.index)
+
+        # 2️⃣ Align beta_t with prices (beta_t only uses bars before t)
+        betas = self.online.beta_series(
+            symbol_x, symbol_y, start=pivot.index[0], end=pivot.index[-1]
+        )
+        pivot = pivot.join(betas, how="inner").dropna()
+
+        # 3️⃣ Time-varying spread
+        pivot["spread"] = pivot[symbol_x] - pivot["beta"] * pivot[symbol_y]
+
+        return pivot[["spread"]]
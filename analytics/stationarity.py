@@ -0,0 +1,323 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from statsmodels.tsa.adfvalues import mackinnoncrit, mackinnonp
+
+from analytics.cache import bar_watermark
+from analytics.spread import SpreadCalculator
+from utils.config import ADF_MAX_PAIRS, ADF_PAIRS, ADF_REFRESH_EVERY, ADF_TIMEFRAMES
+from utils.executor import run_blocking
+
+
+# MacKinnon (1994), "Approximate Asymptotic Distribution Functions for
+# Unit-Root and Cointegration Tests", Journal of Business & Economic
+# Statistics 12(2), 167-176: tau p-value polynomials for the constant-only
+# regression, N=1 (lowest power first, scaled as statsmodels' mackinnonp
+# uses them)
+_TAU_SMALLP = (2.1659, 1.4412, 0.038269)
+_TAU_LARGEP = (1.7339, 0.93202, -0.12745, -0.010368)
+_TAU_STAR = -1.61  # small-p polynomial at or below this statistic
+_TAU_MAX = 2.74  # p = 1 above
+_TAU_MIN = -18.83  # p = 0 below
+
+
+def adf_pvalues(stat: np.ndarray) -> np.ndarray:
+    """
+    mackinnonp(stat, regression="c", N=1) for a whole array (the scalar
+    version costs ~90µs per call, mostly argument checking)
+    """
+    small = np.polyval(_TAU_SMALLP[::-1], stat)
+    large = np.polyval(_TAU_LARGEP[::-1], stat)
+    p = norm.cdf(np.where(stat <= _TAU_STAR, small, large))
+    p = np.where(stat > _TAU_MAX, 1.0, p)
+    return np.where(stat < _TAU_MIN, 0.0, p)
+
+
+def default_maxlag(n: int) -> int:
+    """
+    Schwert's rule, capped like statsmodels.adfuller (constant only)
+    """
+    maxlag = int(np.ceil(12.0 * np.power(n / 100.0, 1 / 4.0)))
+    return max(min(n // 2 - 2, maxlag), 0)
+
+
+def adf_design(x: np.ndarray, lag: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    ADF regression Δx_t ~ const + x_{t-1} + Δx_{t-1..t-lag}, rows aligned
+    the same way as adfuller (first `lag` differences dropped)
+    """
+    dx = np.diff(x)
+    n = len(dx) - lag
+
+    X = np.empty((n, lag + 2))
+    X[:, 0] = 1.0
+    X[:, 1] = x[lag:-1]
+    for i in range(1, lag + 1):
+        X[:, i + 1] = dx[lag - i : len(dx) - i]
+
+    return dx[lag:], X
+
+
+def select_lag(x: np.ndarray, maxlag: int | None = None) -> int:
+    """
+    AIC lag order over 0..maxlag on a common sample, as adfuller(autolag="AIC").
+
+    Lag k uses the first k + 2 columns of the maxlag design, so one QR
+    gives every candidate's residual sum of squares (no refit per lag).
+    """
+    if maxlag is None:
+        maxlag = default_maxlag(len(x))
+
+    y, X = adf_design(x, maxlag)
+    q, _ = np.linalg.qr(X)
+    b = q.T @ y
+
+    n = len(y)
+    k = np.arange(2, maxlag + 3)
+    ssr = y @ y - np.cumsum(b**2)[k - 1]
+    ssr = np.maximum(ssr, np.finfo(float).tiny)
+    aic = n * np.log(ssr / n) + 2 * k
+
+    # First minimum, same tie-break as adfuller
+    return int(np.argmin(aic))
+
+
+def adf_statistic(x: np.ndarray, lag: int) -> tuple[float, int]:
+    """
+    t-statistic of x_{t-1} at a fixed lag order, and the regression nobs
+    """
+    y, X = adf_design(x, lag)
+    q, r = np.linalg.qr(X)
+    coef = np.linalg.solve(r, q.T @ y)
+
+    resid = y - X @ coef
+    s2 = resid @ resid / (len(y) - X.shape[1])
+    r_inv = np.linalg.inv(r)
+    se = np.sqrt(s2 * (r_inv[1] ** 2).sum())
+
+    return float(coef[1] / se), len(y)
+
+
+class FastADF:
+    """
+    Drop-in for ADFTest (same result dict) on NumPy least squares.
+
+    The AIC lag search is the expensive part of adfuller and the chosen
+    order barely moves from one bar to the next, so it is kept between
+    runs and only searched again every `refresh_every` runs (or when the
+    series becomes too short for it). With a fresh search the result
+    equals adfuller's.
+    """
+
+    def __init__(self, refresh_every: int = ADF_REFRESH_EVERY):
+        self.refresh_every = refresh_every
+        self.lag: int | None = None
+        self.runs_since_search = 0
+        self.lock = threading.Lock()
+
+    def run(self, spread_df: pd.DataFrame) -> dict:
+        """
+        Run ADF test on spread series
+        """
+        if "spread" not in spread_df.columns:
+            return {
+                "status": "error",
+                "message": "Missing 'spread' column",
+            }
+
+        series = spread_df["spread"].dropna()
+
+        if len(series) < 20:
+            return {
+                "status": "insufficient_data",
+                "n_obs": int(len(series)),
+            }
+
+        # Level shifts only move the constant; centring keeps X well scaled
+        x = series.to_numpy(dtype="float64")
+        x = x - x.mean()
+
+        lag = self.lag_for(x)
+        stat, nobs = adf_statistic(x, lag)
+        p_value = mackinnonp(stat, regression="c", N=1)
+        crit = mackinnoncrit(N=1, regression="c", nobs=nobs)
+
+        return {
+            "status": "ok",
+            "adf_statistic": stat,
+            "p_value": float(p_value),
+            "lags_used": lag,
+            "n_obs": nobs,
+            "critical_values": {
+                "1%": float(crit[0]),
+                "5%": float(crit[1]),
+                "10%": float(crit[2]),
+            },
+            "is_stationary": bool(p_value < 0.05),
+        }
+
+    def lag_for(self, x: np.ndarray) -> int:
+        maxlag = default_maxlag(len(x))
+        with self.lock:
+            stale = (
+                self.lag is None
+                or self.lag > maxlag
+                or self.runs_since_search >= self.refresh_every
+            )
+            if stale:
+                self.lag = select_lag(x, maxlag)
+                self.runs_since_search = 0
+            self.runs_since_search += 1
+            return self.lag
+
+
+def rolling_adf(
+    spread: pd.Series, window: int, step: int = 1, lag: int | None = None
+) -> pd.DataFrame:
+    """
+    ADF statistic / p-value over trailing windows of `window` points,
+    one row per `step`-th window end.
+
+    The lag order is fixed (AIC over the whole series unless given), so
+    every window shares one design matrix: X'X and X'y per window come
+    from cumulative sums and all windows are solved in one batch.
+    """
+    spread = spread.dropna()
+    x = spread.to_numpy(dtype="float64")
+    x = x - x.mean() if len(x) else x
+
+    if lag is None:
+        lag = select_lag(x) if len(x) >= 20 else 0
+
+    columns = ["timestamp", "adf_statistic", "p_value", "is_stationary"]
+    rows = window - 1 - lag  # regression rows per window
+    k = lag + 2
+    if window < 20 or rows <= k or len(x) < window:
+        return pd.DataFrame(columns=columns)
+
+    y, X = adf_design(x, lag)
+
+    # 1️⃣ Prefix sums of X'X, X'y, y'y (leading zero row)
+    sxx = np.zeros((len(y) + 1, k, k))
+    sxy = np.zeros((len(y) + 1, k))
+    syy = np.zeros(len(y) + 1)
+    np.cumsum(np.einsum("ni,nj->nij", X, X), axis=0, out=sxx[1:])
+    np.cumsum(X * y[:, None], axis=0, out=sxy[1:])
+    np.cumsum(y * y, out=syy[1:])
+
+    # 2️⃣ Window sums for every `step`-th window end
+    ends = np.arange(rows, len(y) + 1)[::-1][::step][::-1]
+    xtx = sxx[ends] - sxx[ends - rows]
+    xty = sxy[ends] - sxy[ends - rows]
+    yty = syy[ends] - syy[ends - rows]
+
+    # 3️⃣ Batched normal equations → t-stat of x_{t-1}
+    inv = np.linalg.inv(xtx)
+    coef = np.einsum("wij,wj->wi", inv, xty)
+    ssr = yty - np.einsum("wi,wi->w", coef, xty)
+    s2 = np.maximum(ssr, 0.0) / (rows - k)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stat = coef[:, 1] / np.sqrt(s2 * inv[:, 1, 1])
+
+    p_value = adf_pvalues(stat)
+
+    # Window ending at regression row e-1 ends at spread point e + lag
+    return pd.DataFrame(
+        {
+            "timestamp": spread.index[ends + lag],
+            "adf_statistic": stat,
+            "p_value": p_value,
+            "is_stationary": p_value < 0.05,
+        }
+    )
+
+
+# ---------------- Scheduled results ----------------
+
+adf_tests: dict[tuple, FastADF] = {}
+adf_results: dict[tuple, dict] = {}
+adf_lock = threading.Lock()
+
+
+def track_pair(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str,
+    adf: FastADF | None = None,
+) -> FastADF | None:
+    """
+    Register a pair for recomputation on bar close (idempotent).
+    None once ADF_MAX_PAIRS pairs are tracked.
+    """
+    key = (symbol_x, symbol_y, timeframe)
+    with adf_lock:
+        if key not in adf_tests:
+            if len(adf_tests) >= ADF_MAX_PAIRS:
+                return None
+            adf_tests[key] = adf or FastADF()
+        return adf_tests[key]
+
+
+def compute_pair_adf(symbol_x: str, symbol_y: str, timeframe: str) -> dict:
+    """
+    ADF of the full-history OLS spread (what /adf-test returns without a
+    bar range). The pair is tracked and its result stored only once it
+    computes, so unknown symbols never reach the scheduler.
+    """
+    key = (symbol_x, symbol_y, timeframe)
+    with adf_lock:
+        adf = adf_tests.get(key) or FastADF()
+
+    spread_df = SpreadCalculator(timeframe=timeframe).compute(symbol_x, symbol_y)
+    if spread_df.empty:
+        raise ValueError("Spread dataframe is empty")
+
+    result = {
+        **adf.run(spread_df),
+        "as_of": spread_df.index[-1].isoformat(),
+        "computed_at": time.time(),
+    }
+
+    # Over the cap → still answered, but neither tracked nor stored
+    if track_pair(symbol_x, symbol_y, timeframe, adf) is not None:
+        with adf_lock:
+            adf_results[key] = result
+    return result
+
+
+def stored_adf(symbol_x: str, symbol_y: str, timeframe: str) -> dict | None:
+    return adf_results.get((symbol_x, symbol_y, timeframe))
+
+
+async def adf_scheduler_loop(interval: float = 1.0):
+    """
+    Recompute the ADF of every tracked pair when its timeframe's bar
+    watermark moves (i.e. on bar close), off the event loop
+    """
+    for pair in ADF_PAIRS:
+        for tf in ADF_TIMEFRAMES:
+            track_pair(*pair, tf)
+
+    seen: dict[tuple, tuple] = {}
+
+    print("[ADF] Started stationarity scheduler")
+
+    while True:
+        with adf_lock:
+            keys = list(adf_tests)
+
+        for key in keys:
+            watermark = bar_watermark(key[2])
+            if seen.get(key) == watermark:
+                continue
+            try:
+                await run_blocking(compute_pair_adf, *key)
+            except Exception as e:
+                print(f"[ADF] {key[0]}-{key[1]} {key[2]} error: {e}")
+            seen[key] = watermark
+
+        await asyncio.sleep(interval)
@@ -1,4 +1,10 @@
+import math
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
 import pandas as pd
+from utils.config import STREAM_MAX_STATS
 
 
 class ZScoreCalculator:
@@ -38,20 +44,194 @@ class RollingCorrelationCalculator:
         return df[["rolling_corr"]]
 
 
-from storage.duckdb_manager import DuckDBManager
+class RollingMoments:
+    """
+    Sliding-window means and co-moments of (x, y), updated in O(1).
+
+    Welford-style add/remove keeps the sums centred, and the window is
+    re-summed exactly every `resync` updates so rounding cannot drift.
+    """
+
+    def __init__(self, window: int, resync: int = 1000):
+        self.window = window
+        self.resync = resync
+        self.xs: deque = deque()
+        self.ys: deque = deque()
+        self.n = 0
+        self.mean_x = self.mean_y = 0.0
+        self.c_xx = self.c_yy = self.c_xy = 0.0
+        self.updates = 0
+
+    def push(self, x: float, y: float = 0.0):
+        if self.n == self.window:
+            self._remove(self.xs.popleft(), self.ys.popleft())
+        self._add(x, y)
+        self.xs.append(x)
+        self.ys.append(y)
+
+        self.updates += 1
+        if self.updates % self.resync == 0:
+            self._recompute()
+
+    def _add(self, x: float, y: float):
+        self.n += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.n
+        self.mean_y += dy / self.n
+        self.c_xx += dx * (x - self.mean_x)
+        self.c_yy += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def _remove(self, x: float, y: float):
+        # Exact inverse of _add
+        if self.n == 1:
+            self.n = 0
+            self.mean_x = self.mean_y = 0.0
+            self.c_xx = self.c_yy = self.c_xy = 0.0
+            return
+        ex = x - self.mean_x
+        ey = y - self.mean_y
+        self.n -= 1
+        self.mean_x -= ex / self.n
+        self.mean_y -= ey / self.n
+        self.c_xx -= (x - self.mean_x) * ex
+        self.c_yy -= (y - self.mean_y) * ey
+        self.c_xy -= (x - self.mean_x) * ey
+
+    def _recompute(self):
+        x = np.fromiter(self.xs, dtype="float64", count=len(self.xs))
+        y = np.fromiter(self.ys, dtype="float64", count=len(self.ys))
+        self.mean_x, self.mean_y = x.mean(), y.mean()
+        dx, dy = x - self.mean_x, y - self.mean_y
+        self.c_xx, self.c_yy, self.c_xy = dx @ dx, dy @ dy, dx @ dy
+
+    def zscore(self, x: float) -> float:
+        # Sample std (ddof=1), like pandas rolling().std()
+        if self.n < self.window or self.c_xx <= 0:
+            return math.nan
+        return (x - self.mean_x) / math.sqrt(self.c_xx / (self.n - 1))
+
+    def corr(self) -> float:
+        denom = self.c_xx * self.c_yy
+        if self.n < self.window or denom <= 0:
+            return math.nan
+        return self.c_xy / math.sqrt(denom)
+
+
+class StreamingZScore:
+    """
+    Rolling z-score of an append-only series (e.g. the online spread).
+    Keeps the latest `history` values in memory.
+    """
+
+    def __init__(self, window: int = 20, history: int = 10_000):
+        self.window = window
+        self.moments = RollingMoments(window)
+        self.history: deque = deque(maxlen=history)
+        self.last_ts = None
+        # Bar rewrite counts the committed bars were read at (set by the caller)
+        self.rewrites = None
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """
+        Forget every committed bar, e.g. after older bars were rewritten
+        """
+        self.moments = RollingMoments(self.window)
+        self.history.clear()
+        self.last_ts = None
+
+    def update(self, ts, spread: float) -> float:
+        self.moments.push(spread)
+        z = self.moments.zscore(spread)
+        self.last_ts = ts
+        if not math.isnan(z):
+            self.history.append((ts, spread, z))
+        return z
 
-def load_aligned_prices(symbol_x: str, symbol_y: str, timeframe="1m"):
-    db = DuckDBManager()
+    def to_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.history, columns=["timestamp", "spread", "zscore"])
+        return df.set_index("timestamp")
 
-    query = f"""
-    SELECT timestamp, symbol, close
-    FROM bars_{timeframe}
-    WHERE symbol IN (?, ?)
-    ORDER BY timestamp
+
+class StreamingCorrelation:
     """
-    df = db.con.execute(query, [symbol_x, symbol_y]).fetchdf()
+    Rolling correlation of two price series, one bar at a time.
 
-    pivot = df.pivot(index="timestamp", columns="symbol", values="close")
-    pivot = pivot.dropna()
+    peek() evaluates a bar without committing it, for the latest bar that
+    the resampler may still rewrite.
+    """
 
-    return pivot
+    def __init__(self, window: int = 20, history: int = 10_000):
+        self.window = window
+        self.moments = RollingMoments(window)
+        self.history: deque = deque(maxlen=history)
+        self.last_ts = None
+        # Bar rewrite counts the committed bars were read at (set by the caller)
+        self.rewrites = None
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """
+        Forget every committed bar, e.g. after older bars were rewritten
+        """
+        self.moments = RollingMoments(self.window)
+        self.history.clear()
+        self.last_ts = None
+
+    def update(self, ts, x: float, y: float) -> float:
+        self.moments.push(x, y)
+        corr = self.moments.corr()
+        self.last_ts = ts
+        if not math.isnan(corr):
+            self.history.append((ts, corr))
+        return corr
+
+    def peek(self, x: float, y: float) -> float:
+        m = self.moments
+        saved = (m.n, m.mean_x, m.mean_y, m.c_xx, m.c_yy, m.c_xy)
+        if m.n == m.window:
+            m._remove(m.xs[0], m.ys[0])
+        m._add(x, y)
+        corr = m.corr()
+        m.n, m.mean_x, m.mean_y, m.c_xx, m.c_yy, m.c_xy = saved
+        return corr
+
+    def to_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.history, columns=["timestamp", "rolling_corr"])
+        return df.set_index("timestamp")
+
+
+# Keys include the client's window, so only the STREAM_MAX_STATS most
+# recently used calculators are kept; an evicted one is rebuilt from bars
+streaming_stats: OrderedDict[tuple, object] = OrderedDict()
+streaming_stats_lock = threading.Lock()
+
+
+def get_streaming_stat(key: tuple, factory):
+    """
+    Process-wide streaming calculator per (kind, pair, timeframe, params) key
+    """
+    with streaming_stats_lock:
+        if key in streaming_stats:
+            streaming_stats.move_to_end(key)
+        else:
+            streaming_stats[key] = factory()
+            while len(streaming_stats) > STREAM_MAX_STATS:
+                streaming_stats.popitem(last=False)
+        return streaming_stats[key]
+
+
+from analytics.pair_data import load_pair
+
+def load_aligned_prices(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe="1m",
+    start=None,
+    end=None,
+    lookback: int | None = None,
+):
+    pair = load_pair(symbol_x, symbol_y, timeframe, start, end, lookback)
+    return pair.to_frame(symbol_x, symbol_y)
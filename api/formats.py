@@ -0,0 +1,106 @@
+import json
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException, Query, Request
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: only needed for format=arrow
+    pa = None
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Lets route metrics count rows of pre-serialised responses
+ROW_COUNT_HEADER = "X-Row-Count"
+FORMATS = ("records", "columns", "arrow")
+
+
+def response_format(
+    request: Request,
+    format: str | None = Query(
+        None, description="records (default), columns or arrow"
+    ),
+) -> str:
+    """
+    Series format: `format` query parameter, else the Accept header
+    (Arrow IPC stream when asked for), else JSON records
+    """
+    if format is None:
+        accept = request.headers.get("accept", "")
+        format = "arrow" if ARROW_MEDIA_TYPE in accept else "records"
+
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
+    if format == "arrow" and pa is None:
+        raise HTTPException(status_code=406, detail="pyarrow is not installed")
+    return format
+
+
+def frame_response(df: pd.DataFrame, fmt: str):
+    """
+    records → list of dicts (FastAPI encodes it as before, NaN as null);
+    columns → {"column": [values, ...]} JSON; arrow → Arrow IPC stream
+    """
+    if fmt == "arrow":
+        return arrow_response(pa.Table.from_pandas(df, preserve_index=False))
+    if fmt == "columns":
+        return Response(
+            columns_json(df),
+            media_type="application/json",
+            headers={ROW_COUNT_HEADER: str(len(df))},
+        )
+    return records(df)
+
+
+def records(df: pd.DataFrame) -> list[dict]:
+    """
+    List of dicts with NaN as None (FastAPI's JSON encoder rejects NaN)
+    """
+    nan_cols = [c for c in df.columns if df[c].dtype.kind == "f" and df[c].isna().any()]
+    if nan_cols:
+        df = df.astype({c: object for c in nan_cols})
+        df[nan_cols] = df[nan_cols].where(df[nan_cols].notna(), None)
+    return df.to_dict(orient="records")
+
+
+def arrow_response(table) -> Response:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Response(
+        sink.getvalue().to_pybytes(),
+        media_type=ARROW_MEDIA_TYPE,
+        headers={ROW_COUNT_HEADER: str(table.num_rows)},
+    )
+
+
+def columns_json(df: pd.DataFrame) -> bytes:
+    """
+    One array per column; timestamps as ISO 8601, NaN as null
+    """
+    if orjson is not None:
+        # Numeric / datetime columns go straight from the NumPy buffers
+        cols = {
+            c: df[c].to_numpy() if df[c].dtype.kind in "fiumM" else df[c].tolist()
+            for c in df.columns
+        }
+        return orjson.dumps(cols, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    cols = {}
+    for c in df.columns:
+        s = df[c]
+        if s.dtype.kind == "M":
+            cols[c] = [None if pd.isna(t) else t.isoformat() for t in s]
+        elif s.dtype.kind == "f":
+            values = s.to_numpy()
+            cols[c] = np.where(np.isnan(values), None, values).tolist()
+        else:
+            cols[c] = s.tolist()
+    return json.dumps(cols).encode()
@@ -0,0 +1,98 @@
+import functools
+import inspect
+import time
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+
+from api.formats import ROW_COUNT_HEADER
+from utils.metrics import SIZE_BUCKETS, registry
+
+request_seconds = registry.histogram(
+    "qa_http_request_seconds",
+    "Route handler latency",
+    labels=("route", "status"),
+)
+response_rows = registry.histogram(
+    "qa_http_response_rows",
+    "Rows returned per request",
+    labels=("route",),
+    buckets=SIZE_BUCKETS,
+)
+
+
+def result_rows(result) -> int | None:
+    """
+    Rows in a route's return value: records lists, a single object, or
+    responses built by api.formats (row count header)
+    """
+    if isinstance(result, Response):
+        rows = result.headers.get(ROW_COUNT_HEADER)
+        return None if rows is None else int(rows)
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return 1
+    return None
+
+
+class _Observed:
+    def __init__(self, route: str):
+        self.route = route
+        self.result = None
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is None:
+            status = getattr(self.result, "status_code", 200)
+        elif isinstance(exc, HTTPException):
+            status = exc.status_code
+        else:
+            status = 500
+        request_seconds.observe(time.perf_counter() - self.t0, self.route, str(status))
+
+        rows = result_rows(self.result)
+        if rows is not None:
+            response_rows.observe(rows, self.route)
+
+
+def instrument(route: str, endpoint):
+    """
+    Wrap a route handler to record its latency and result size.
+    functools.wraps keeps the signature FastAPI reads parameters from.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            with _Observed(route) as obs:
+                obs.result = await endpoint(*args, **kwargs)
+                return obs.result
+
+    else:
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            with _Observed(route) as obs:
+                obs.result = endpoint(*args, **kwargs)
+                return obs.result
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    APIRoute that times its handler (qa_http_request_seconds) and counts
+    the rows it returns (qa_http_response_rows), labelled by path template
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        # include_router() re-creates routes from the already wrapped endpoint
+        if not getattr(endpoint, "instrumented", False):
+            endpoint = instrument(path, endpoint)
+        super().__init__(path, endpoint, **kwargs)
@@ -1,12 +1,43 @@
-from analytics.adf import ADFTest
-from fastapi import APIRouter, HTTPException
+import asyncio
+import math
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from analytics.online_regression import OnlineHedgeRatio, check_online_params
+from analytics.pair_analytics import PAIR_FIELDS, PairAnalytics
+from analytics.pair_data import load_pair
+from analytics.pair_feed import PairFeed, get_pair_feed, release_pair_feed, to_json
 from analytics.regression import HedgeRatioOLS
-from analytics.spread import SpreadCalculator
-from analytics.stats import ZScoreCalculator, RollingCorrelationCalculator
-from analytics.alerts import AlertEngine
+from analytics.scanner import latest_scan
+from analytics.spread import WINDOW_METHODS, SpreadCalculator
+from analytics.stationarity import (
+    FastADF,
+    compute_pair_adf,
+    rolling_adf,
+    stored_adf,
+)
+from analytics.stats import (
+    RollingCorrelationCalculator,
+    StreamingCorrelation,
+    StreamingZScore,
+    ZScoreCalculator,
+    get_streaming_stat,
+)
+from analytics.alerts import DIRECTIONS, AlertEngine, get_alert_state
+from analytics.backtest import PairBacktest
+from analytics.cache import cached_pair_result, pair_cache
+from api.formats import arrow_response, frame_response, response_format
+from api.instrumentation import InstrumentedRoute
 from storage.duckdb_manager import DuckDBManager
+from storage.tick_writer import writer_stats
+from utils.executor import run_blocking
+from utils.loop_monitor import loop_lag_summary
+from utils.metrics import CONTENT_TYPE, registry
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 db = DuckDBManager()
 
 
@@ -15,17 +46,94 @@ def health():
     return {"status": "ok"}
 
 
+@router.get("/runtime-stats")
+def runtime_stats():
+    return {
+        "event_loop_lag": loop_lag_summary(),
+        "tick_writer": writer_stats,
+        "db_pool": db.pool.stats,
+        "pair_cache": pair_cache.summary(),
+    }
+
+
+@router.get("/metrics")
+def metrics():
+    """
+    Ingestion, writer, resampler, DB pool, pair cache, event loop lag and
+    per-route metrics in Prometheus text format
+    """
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+def _naive_utc(ts: datetime | None) -> datetime | None:
+    if ts is not None and ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def bar_range(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    lookback: int | None = Query(None, gt=0),
+) -> dict:
+    """
+    Bar range shared by the pair routes: start / end (inclusive, UTC)
+    and/or the last `lookback` aligned bars; pushed down into DuckDB
+    """
+    return {"start": _naive_utc(start), "end": _naive_utc(end), "lookback": lookback}
+
+
 @router.get("/bars")
-def get_bars(symbol: str, timeframe: str = "1m", limit: int = 100):
+def get_bars(
+    symbol: str,
+    timeframe: str = "1m",
+    limit: int = 100,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    fmt: str = Depends(response_format),
+):
+    start, end = _naive_utc(start), _naive_utc(end)
     query = f"""
     SELECT *
     FROM bars_{timeframe}
     WHERE symbol = ?
+    AND (?::TIMESTAMP IS NULL OR timestamp >= ?::TIMESTAMP)
+    AND (?::TIMESTAMP IS NULL OR timestamp <= ?::TIMESTAMP)
     ORDER BY timestamp DESC
     LIMIT ?
     """
-    df = db.con.execute(query, [symbol, limit]).fetchdf()
-    return df.to_dict(orient="records")
+    result = db.con.execute(query, [symbol, start, start, end, end, limit])
+    if fmt == "arrow":
+        # Straight from DuckDB's columnar result, no pandas in between
+        return arrow_response(result.fetch_arrow_table())
+    return frame_response(result.fetchdf(), fmt)
+
+
+def online_params(
+    method: str, forgetting: float, delta: float, beta_window: int | None = None
+) -> dict:
+    """
+    Estimator parameters for the hedge ratio method
+    (ols: static fit, rolling / expanding: OLS per bar over the last
+    `beta_window` bars / all bars so far, rls: forgetting factor,
+    kalman: state drift; both limited to the configured ALLOWED_PARAMS)
+    """
+    if method in ("rls", "kalman"):
+        params = {"forgetting": forgetting} if method == "rls" else {"delta": delta}
+        try:
+            check_online_params(method, params)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return params
+    if method == "rolling":
+        if beta_window is None:
+            raise HTTPException(
+                status_code=400, detail="method=rolling needs beta_window"
+            )
+        return {"beta_window": beta_window}
+    if method not in ("ols", "expanding"):
+        raise HTTPException(status_code=400, detail=f"Unknown method: {method}")
+    return {}
 
 
 @router.get("/hedge-ratio")
@@ -33,10 +141,23 @@ def hedge_ratio(
     symbol_x: str,
     symbol_y: str,
     timeframe: str = "1m",
+    method: str = "ols",
+    forgetting: float = Query(1.0, gt=0, le=1),
+    delta: float = Query(1e-4, gt=0, lt=1),
+    beta_window: int | None = Query(None, gt=1),
+    bars: dict = Depends(bar_range),
 ):
+    params = online_params(method, forgetting, delta, beta_window)
     try:
-        hr = HedgeRatioOLS(timeframe=timeframe)
-        return hr.compute(symbol_x, symbol_y)
+        if method == "ols":
+            hr = HedgeRatioOLS(timeframe=timeframe)
+        elif method in WINDOW_METHODS:
+            return HedgeRatioOLS(timeframe=timeframe).compute_series(
+                symbol_x, symbol_y, params.get("beta_window"), **bars
+            )
+        else:
+            hr = OnlineHedgeRatio(timeframe=timeframe, method=method, **params)
+        return hr.compute(symbol_x, symbol_y, **bars)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -46,10 +167,29 @@ def spread(
     symbol_x: str,
     symbol_y: str,
     timeframe: str = "1m",
+    method: str = "ols",
+    forgetting: float = Query(1.0, gt=0, le=1),
+    delta: float = Query(1e-4, gt=0, lt=1),
+    beta_window: int | None = Query(None, gt=1),
+    bars: dict = Depends(bar_range),
+    fmt: str = Depends(response_format),
 ):
-    sc = SpreadCalculator(timeframe=timeframe)
-    df = sc.compute(symbol_x, symbol_y)
-    return df.reset_index().to_dict(orient="records")
+    params = online_params(method, forgetting, delta, beta_window)
+    sc = SpreadCalculator(timeframe=timeframe, method=method, **params)
+    if fmt != "records":
+        return frame_response(sc.compute(symbol_x, symbol_y, **bars).reset_index(), fmt)
+    return cached_pair_result(
+        "spread_records",
+        symbol_x,
+        symbol_y,
+        timeframe,
+        lambda: sc.compute(symbol_x, symbol_y, **bars)
+        .reset_index()
+        .to_dict(orient="records"),
+        method,
+        *params.values(),
+        *bars.values(),
+    )
 
 
 @router.get("/zscore")
@@ -57,25 +197,108 @@ def zscore(
     symbol_x: str,
     symbol_y: str,
     timeframe: str = "1m",
-    window: int = 20,
+    window: int = Query(20, gt=1),
+    method: str = "ols",
+    forgetting: float = Query(1.0, gt=0, le=1),
+    delta: float = Query(1e-4, gt=0, lt=1),
+    beta_window: int | None = Query(None, gt=1),
+    bars: dict = Depends(bar_range),
+    fmt: str = Depends(response_format),
 ):
-    sc = SpreadCalculator(timeframe=timeframe)
-    spread_df = sc.compute(symbol_x, symbol_y)
+    params = online_params(method, forgetting, delta, beta_window)
+    cache_params = (window, method, *params.values(), *bars.values())
+
+    z_df = cached_pair_result(
+        "zscore_frame",
+        symbol_x,
+        symbol_y,
+        timeframe,
+        lambda: _zscore(
+            symbol_x, symbol_y, timeframe, window, method, params, bars
+        ),
+        *cache_params,
+    )
+    if fmt != "records":
+        return frame_response(z_df, fmt)
+    return cached_pair_result(
+        "zscore",
+        symbol_x,
+        symbol_y,
+        timeframe,
+        lambda: z_df.to_dict(orient="records"),
+        *cache_params,
+    )
 
-    # 🔴 Guard: not enough data
-    if spread_df.shape[0] < window:
-        return []
 
-    zs = ZScoreCalculator(window=window)
-    z_df = zs.compute(spread_df)
+def _zscore(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str,
+    window: int,
+    method: str = "ols",
+    params: dict | None = None,
+    bars: dict | None = None,
+):
+    sc = SpreadCalculator(timeframe=timeframe, method=method, **(params or {}))
+
+    if sc.online:
+        # Online spread is append-only (beta_t never changes once written),
+        # so its z-score can be streamed bar by bar over the full history...
+        spread_df = sc.compute(symbol_x, symbol_y)
+        z_df, complete = _stream_zscore(
+            spread_df, window, (symbol_x, symbol_y, timeframe, sc.online.model)
+        )
+        requested = _bar_slice(spread_df, bars)
+        if not complete and len(requested) and requested.index[0] < z_df.index[0]:
+            # ...unless the request reaches past the streamed history
+            z_df = ZScoreCalculator(window=window).compute(spread_df)
+        # ...and cut to the requested bars
+        z_df = z_df[z_df.index.isin(requested.index)]
+    else:
+        spread_df = sc.compute(symbol_x, symbol_y, **(bars or {}))
+        if spread_df.shape[0] < window:
+            # 🔴 Guard: not enough data
+            return pd.DataFrame(columns=["timestamp", "spread", "zscore"])
+
+        # Static OLS beta is refit on every bar → whole spread shifts
+        zs = ZScoreCalculator(window=window)
+        z_df = zs.compute(spread_df)
 
     # Drop rows where zscore is NaN
     z_df = z_df.dropna(subset=["zscore"])
 
-    if z_df.empty:
-        return []
+    return z_df.reset_index()
+
+
+def _bar_slice(df: pd.DataFrame, bars: dict | None) -> pd.DataFrame:
+    """
+    Rows of a timestamp-indexed frame inside a bar_range()
+    """
+    bars = bars or {}
+    if bars.get("start") is not None:
+        df = df[df.index >= bars["start"]]
+    if bars.get("end") is not None:
+        df = df[df.index <= bars["end"]]
+    if bars.get("lookback"):
+        df = df.iloc[-bars["lookback"]:]
+    return df
+
 
-    return z_df.reset_index().to_dict(orient="records")
+def _stream_zscore(spread_df, window: int, key: tuple):
+    """
+    Streamed z-score frame, and whether it still covers every bar (the
+    calculator keeps the latest 10k)
+    """
+    zs = get_streaming_stat(
+        ("zscore", window, *key), lambda: StreamingZScore(window=window)
+    )
+    with zs.lock:
+        new = spread_df
+        if zs.last_ts is not None:
+            new = spread_df.iloc[spread_df.index.searchsorted(zs.last_ts, side="right"):]
+        for ts, value in zip(new.index, new["spread"].tolist()):
+            zs.update(ts, value)
+        return zs.to_frame(), len(zs.history) < zs.history.maxlen
 
 
 
@@ -84,41 +307,104 @@ def correlation(
     symbol_x: str,
     symbol_y: str,
     timeframe: str = "1m",
-    window: int = 20,
+    window: int = Query(20, gt=1),
+    bars: dict = Depends(bar_range),
+    fmt: str = Depends(response_format),
 ):
-    df = db.con.execute(
-        f"""
-        SELECT timestamp, symbol, close
-        FROM bars_{timeframe}
-        WHERE symbol IN (?, ?)
-        ORDER BY timestamp
-        """,
-        [symbol_x, symbol_y],
-    ).fetchdf()
+    corr_df = cached_pair_result(
+        "correlation_frame",
+        symbol_x,
+        symbol_y,
+        timeframe,
+        lambda: _correlation(symbol_x, symbol_y, timeframe, window, bars),
+        window,
+        *bars.values(),
+    )
+    if fmt != "records":
+        return frame_response(corr_df, fmt)
+    return cached_pair_result(
+        "correlation",
+        symbol_x,
+        symbol_y,
+        timeframe,
+        lambda: corr_df.to_dict(orient="records"),
+        window,
+        *bars.values(),
+    )
 
-    if df.empty:
-        return []
 
-    pivot = (
-        df.pivot(index="timestamp", columns="symbol", values="close")
-        .dropna()
+def _correlation(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str,
+    window: int,
+    bars: dict | None = None,
+):
+    if bars and any(v is not None for v in bars.values()):
+        # Bounded range → one batch pass over just those bars
+        corr_df = _rolling_corr(symbol_x, symbol_y, timeframe, window, bars)
+        return corr_df.reset_index()
+
+    rc = get_streaming_stat(
+        ("correlation", symbol_x, symbol_y, timeframe, window),
+        lambda: StreamingCorrelation(window=window),
     )
 
-    # Not enough aligned data
-    if pivot.shape[0] < window:
-        return []
+    with rc.lock:
+        # Bars already committed were replaced (e.g. resampler
+        # reconciliation) → rebuild from the stored bars
+        rewrites = (
+            db.pool.bar_rewrites(symbol_x, timeframe),
+            db.pool.bar_rewrites(symbol_y, timeframe),
+        )
+        if rewrites != rc.rewrites:
+            if rc.last_ts is not None:
+                print(f"[CORR] {symbol_x}/{symbol_y} {timeframe} bars rewritten, resyncing")
+            rc.reset()
+            rc.rewrites = rewrites
+
+        # Only bars after the last committed one; O(1) per new bar
+        pivot = load_pair(
+            symbol_x, symbol_y, timeframe, since=rc.last_ts, db=db
+        ).to_frame(symbol_x, symbol_y)
+
+        if pivot.empty and rc.last_ts is None:
+            return pd.DataFrame(columns=["timestamp", "rolling_corr"])
+
+        xs = pivot[symbol_x].tolist()
+        ys = pivot[symbol_y].tolist()
+
+        # The latest bar is still rewritten by the resampler → peek only
+        for ts, x, y in zip(pivot.index[:-1], xs[:-1], ys[:-1]):
+            rc.update(ts, x, y)
+
+        if len(rc.history) == rc.history.maxlen:
+            # Full history is longer than the stream keeps (latest 10k)
+            rows = None
+        else:
+            rows = list(rc.history)
+            if xs:
+                latest = rc.peek(xs[-1], ys[-1])
+                if not math.isnan(latest):
+                    rows.append((pivot.index[-1], latest))
+
+    if rows is None:
+        return _rolling_corr(symbol_x, symbol_y, timeframe, window, {}).reset_index()
+    return pd.DataFrame(rows, columns=["timestamp", "rolling_corr"])
+
+
+def _rolling_corr(
+    symbol_x: str, symbol_y: str, timeframe: str, window: int, bars: dict
+):
+    price_df = load_pair(
+        symbol_x, symbol_y, timeframe, db=db, **bars
+    ).to_frame(symbol_x, symbol_y)
 
     rc = RollingCorrelationCalculator(window=window)
-    corr_df = rc.compute(pivot, symbol_x, symbol_y)
-
-    # 🔴 CRITICAL FIX: remove NaN / inf
-    corr_df = corr_df.replace([float("inf"), float("-inf")], None)
-    corr_df = corr_df.dropna(subset=["rolling_corr"])
-
-    if corr_df.empty:
-        return []
+    corr_df = rc.compute(price_df, symbol_x, symbol_y)
 
-    return corr_df.reset_index().to_dict(orient="records")
+    # 🔴 CRITICAL FIX: remove NaN / inf (mask keeps the column float64)
+    return corr_df[np.isfinite(corr_df["rolling_corr"].to_numpy())]
 
 
 
@@ -127,36 +413,42 @@ def alerts(
     symbol_x: str,
     symbol_y: str,
     timeframe: str = "1m",
-    window: int = 20,
+    window: int = Query(20, gt=1),
     z_threshold: float = 2.0,
     corr_threshold: float = 0.7,
+    bars: dict = Depends(bar_range),
 ):
-    # Spread
-    sc = SpreadCalculator(timeframe=timeframe)
-    spread_df = sc.compute(symbol_x, symbol_y)
-
-    # Z-score
-    zs = ZScoreCalculator(window=window)
-    z_df = zs.compute(spread_df)
-
-    # Correlation
-    df = db.con.execute(
-        f"""
-        SELECT timestamp, symbol, close
-        FROM bars_{timeframe}
-        WHERE symbol IN (?, ?)
-        ORDER BY timestamp
-        """,
-        [symbol_x, symbol_y],
-    ).fetchdf()
-
-    price_df = (
-        df.pivot(index="timestamp", columns="symbol", values="close")
-        .dropna()
+    return cached_pair_result(
+        "alerts",
+        symbol_x,
+        symbol_y,
+        timeframe,
+        lambda: _alerts(
+            symbol_x,
+            symbol_y,
+            timeframe,
+            window,
+            z_threshold,
+            corr_threshold,
+            bars,
+        ),
+        window,
+        z_threshold,
+        corr_threshold,
+        *bars.values(),
     )
 
-    rc = RollingCorrelationCalculator(window=window)
-    corr_df = rc.compute(price_df, symbol_x, symbol_y)
+
+def _alerts(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str,
+    window: int,
+    z_threshold: float,
+    corr_threshold: float,
+    bars: dict | None = None,
+):
+    z_df, corr_df = _alert_inputs(symbol_x, symbol_y, timeframe, window, bars)
 
     # Alerts
     ae = AlertEngine(
@@ -172,18 +464,333 @@ def alerts(
     )
 
 
+@router.get("/alerts/events")
+def alert_events(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str = "1m",
+    window: int = Query(20, gt=1),
+    z_threshold: float = 2.0,
+    corr_threshold: float = 0.7,
+):
+    """
+    ENTRY / EXIT events; only bars newer than the last evaluation are checked
+    """
+    z_df, corr_df = _alert_inputs(symbol_x, symbol_y, timeframe, window)
+
+    state = get_alert_state(
+        (symbol_x, symbol_y, timeframe, window, z_threshold, corr_threshold)
+    )
+    ae = AlertEngine(
+        z_threshold=z_threshold,
+        corr_threshold=corr_threshold,
+    )
+    new_events = ae.evaluate_incremental(state, z_df, corr_df, symbol_x, symbol_y)
+
+    return {
+        "active": DIRECTIONS.get(state.active),
+        "last_evaluated": state.last_ts,
+        "new_events": new_events,
+        "events": list(state.events),
+    }
+
+
+def _alert_inputs(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str,
+    window: int,
+    bars: dict | None = None,
+):
+    """
+    Z-score and rolling correlation frames the alert rules run on
+    (cached until the next bar is written)
+    """
+    bars = bars or {"start": None, "end": None, "lookback": None}
+    return cached_pair_result(
+        "alert_inputs",
+        symbol_x,
+        symbol_y,
+        timeframe,
+        lambda: _compute_alert_inputs(symbol_x, symbol_y, timeframe, window, bars),
+        window,
+        *bars.values(),
+    )
+
+
+def _compute_alert_inputs(
+    symbol_x: str, symbol_y: str, timeframe: str, window: int, bars: dict
+):
+    # Spread
+    sc = SpreadCalculator(timeframe=timeframe)
+    spread_df = sc.compute(symbol_x, symbol_y, **bars)
+
+    # Z-score
+    zs = ZScoreCalculator(window=window)
+    z_df = zs.compute(spread_df)
+
+    # Correlation
+    price_df = load_pair(
+        symbol_x, symbol_y, timeframe, db=db, **bars
+    ).to_frame(symbol_x, symbol_y)
+
+    rc = RollingCorrelationCalculator(window=window)
+    corr_df = rc.compute(price_df, symbol_x, symbol_y)
+
+    return z_df, corr_df
+
+
+
+@router.get("/pair-analytics")
+def pair_analytics(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str = "1m",
+    window: int = Query(20, gt=1),
+    z_threshold: float = 2.0,
+    corr_threshold: float = 0.7,
+    fields: str = Query(
+        ",".join(PAIR_FIELDS),
+        description="Comma-separated subset of: " + ", ".join(PAIR_FIELDS),
+    ),
+    bars: dict = Depends(bar_range),
+):
+    """
+    Hedge ratio, spread, z-score, rolling correlation and alerts from
+    a single bar load and OLS fit (OLS hedge ratio only)
+    """
+    selected = tuple(f.strip() for f in fields.split(",") if f.strip())
+    pa = PairAnalytics(timeframe, window, z_threshold, corr_threshold)
+    try:
+        result = pa.compute(symbol_x, symbol_y, selected, **bars)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Tens of thousands of records: json.dumps is far cheaper than
+    # FastAPI's per-value jsonable_encoder walk
+    return Response(to_json(result), media_type="application/json")
+
+
+def _floats(values: str, name: str) -> list[float]:
+    try:
+        return [float(v) for v in values.split(",") if v.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: {values}")
+
+
+@router.get("/backtest")
+def backtest(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str = "1m",
+    windows: str = Query("20", description="Comma-separated z-score windows"),
+    z_thresholds: str = Query("2.0", description="Comma-separated"),
+    corr_thresholds: str = Query("0.7", description="Comma-separated"),
+    beta_window: int | None = Query(None, gt=1),
+    cost_bps: float = Query(0.0, ge=0),
+    source: str = "bars",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    fmt: str = Depends(response_format),
+):
+    """
+    PnL / drawdown / turnover of the z-score alert rules over stored
+    history, one row per (window, z_threshold, corr_threshold), best
+    net PnL first
+    """
+    grid = (
+        [int(w) for w in _floats(windows, "windows")],
+        _floats(z_thresholds, "z_thresholds"),
+        _floats(corr_thresholds, "corr_thresholds"),
+    )
+    if any(w < 2 for w in grid[0]):
+        raise HTTPException(status_code=400, detail="windows must be >= 2")
+
+    try:
+        bt = PairBacktest(
+            symbol_x,
+            symbol_y,
+            timeframe,
+            source=source,
+            beta_window=beta_window,
+            cost_bps=cost_bps,
+            start=_naive_utc(start),
+            end=_naive_utc(end),
+        )
+        result = cached_pair_result(
+            "backtest",
+            symbol_x,
+            symbol_y,
+            timeframe,
+            lambda: bt.grid(*grid),
+            *map(tuple, grid),
+            beta_window,
+            cost_bps,
+            source,
+            bt.start,
+            bt.end,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return frame_response(result, fmt)
+
 
 @router.get("/adf-test")
-def adf_test(symbol_x: str, symbol_y: str, timeframe: str = "1m"):
+def adf_test(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str = "1m",
+    bars: dict = Depends(bar_range),
+):
+    """
+    ADF on the OLS spread. Without a bar range the result kept up to date
+    by the stationarity scheduler is returned (computed once on first
+    request, then refreshed on every bar close)
+    """
     try:
+        if not any(bars.values()):
+            stored = stored_adf(symbol_x, symbol_y, timeframe)
+            return stored or compute_pair_adf(symbol_x, symbol_y, timeframe)
+
         sc = SpreadCalculator(timeframe=timeframe)
-        spread_df = sc.compute(symbol_x, symbol_y)
+        spread_df = sc.compute(symbol_x, symbol_y, **bars)
 
         if spread_df.empty:
             raise ValueError("Spread dataframe is empty")
 
-        adf = ADFTest()
-        return adf.run(spread_df)
+        adf = FastADF()
+        return cached_pair_result(
+            "adf",
+            symbol_x,
+            symbol_y,
+            timeframe,
+            lambda: adf.run(spread_df),
+            *bars.values(),
+        )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/adf-test/rolling")
+def adf_test_rolling(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str = "1m",
+    window: int = Query(120, ge=20),
+    step: int = Query(1, gt=0),
+    lag: int | None = Query(None, ge=0),
+    bars: dict = Depends(bar_range),
+    fmt: str = Depends(response_format),
+):
+    """
+    ADF statistic / p-value over trailing windows of the OLS spread
+    (lag order fixed across windows; AIC over the range unless given)
+    """
+    sc = SpreadCalculator(timeframe=timeframe)
+    spread_df = sc.compute(symbol_x, symbol_y, **bars)
+
+    df = cached_pair_result(
+        "adf_rolling",
+        symbol_x,
+        symbol_y,
+        timeframe,
+        lambda: rolling_adf(spread_df["spread"], window, step, lag),
+        window,
+        step,
+        lag,
+        *bars.values(),
+    )
+    return frame_response(df, fmt)
+
+
+@router.get("/scanner")
+def scanner(
+    timeframe: str = "1m",
+    limit: int = Query(50, gt=0, le=1000),
+    fmt: str = Depends(response_format),
+):
+    """
+    Ranked pairs from the last universe scan (lowest ADF p-value first)
+    """
+    return frame_response(latest_scan(timeframe, limit), fmt)
+
+
+@router.get("/stream/pair")
+async def stream_pair(
+    symbol_x: str,
+    symbol_y: str,
+    timeframe: str = "1m",
+    window: int = Query(20, gt=1),
+    z_threshold: float = 2.0,
+    corr_threshold: float = 0.7,
+    method: str = "ols",
+    forgetting: float = Query(1.0, gt=0, le=1),
+    delta: float = Query(1e-4, gt=0, lt=1),
+    history: int = Query(500, gt=0, le=10_000),
+):
+    """
+    Server-Sent Events: one `snapshot` (recent points, bars, alert events),
+    then an `update` with only the new bars / z-scores / correlations /
+    alert events each time a bar closes. A new `snapshot` replaces it all
+    when bars already pushed are rewritten. One shared feed per parameter
+    set, so the work per bar does not grow with the number of viewers.
+    """
+    if method in WINDOW_METHODS:
+        # The feed advances an online estimator bar by bar
+        raise HTTPException(
+            status_code=400, detail=f"method={method} is not streamed"
+        )
+    params = online_params(method, forgetting, delta)
+    key = (
+        symbol_x, symbol_y, timeframe, window, z_threshold, corr_threshold,
+        method, *params.values(), history,
+    )
+    feed = get_pair_feed(
+        key,
+        lambda: PairFeed(
+            symbol_x,
+            symbol_y,
+            timeframe,
+            window,
+            z_threshold,
+            corr_threshold,
+            method,
+            history,
+            **params,
+        ),
+    )
+    return StreamingResponse(
+        _feed_events(key, feed),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _feed_events(key: tuple, created: PairFeed, keepalive: float = 15.0):
+    # Evicted since the route looked it up → register it again; no await
+    # between this and subscribe(), so it cannot be evicted in between
+    feed = get_pair_feed(key, lambda: created)
+    queue = await feed.subscribe()
+    try:
+        snapshot = await run_blocking(feed.snapshot)
+        yield f"event: snapshot\ndata: {to_json(snapshot)}\n\n"
+
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                # SSE comment; keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+
+            if message is None:
+                break
+            seq, event, data = message
+            # Already part of the snapshot
+            if seq <= snapshot["seq"]:
+                continue
+            yield f"event: {event}\ndata: {data}\n\n"
+    finally:
+        release_pair_feed(key, feed, queue)
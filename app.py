@@ -3,9 +3,18 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from ingestion.binance_ws import start_stream
+from ingestion.workers import start_ingest_workers, stop_ingest_workers
 from storage.tick_writer import tick_writer_loop
+from storage.bar_writer import bar_writer_loop
+from storage.queue_writer import queue_writer_loop
+from storage.tiered_storage import tier_maintenance_loop
 from analytics.resample_runner import resample_loop
+from analytics.scanner import scanner_loop
+from analytics.stationarity import adf_scheduler_loop
 from api.routes import router
+from utils.config import INGEST_MODE, INGEST_WORKERS, SCAN_ENABLED, SYMBOLS
+from utils.executor import shutdown_executor
+from utils.loop_monitor import loop_lag_monitor
 
 
 @asynccontextmanager
@@ -14,23 +23,49 @@ async def lifespan(app: FastAPI):
     Application lifespan:
     - Start background ingestion & processing tasks
     - Keep them running for app lifetime
+
+    Only the websocket readers do real work on the event loop; DB
+    writes and resampling are handed to the blocking pool
+    (utils.executor), and loop_lag_monitor records how long the loop
+    is ever blocked.
+
+    With QA_INGEST_MODE=multiprocess the readers run in worker
+    processes instead, and this process only persists what they
+    publish and serves the API from storage.
     """
-    symbols = ["btcusdt", "ethusdt"]
+    tasks = []
+    workers = []
+
+    if INGEST_MODE == "multiprocess":
+        workers, queue = start_ingest_workers(SYMBOLS, INGEST_WORKERS)
+        tasks.append(asyncio.create_task(queue_writer_loop(queue)))
+    else:
+        tasks += [
+            asyncio.create_task(start_stream(SYMBOLS)),
+            asyncio.create_task(tick_writer_loop(flush_interval=1.0)),
+            asyncio.create_task(bar_writer_loop(flush_interval=1.0)),
+        ]
 
-    ws_task = asyncio.create_task(start_stream(symbols))
-    writer_task = asyncio.create_task(tick_writer_loop(flush_interval=1.0))
-    resample_task = asyncio.create_task(resample_loop(interval=60))
+    # Bars now come from the streaming builder; the resampler only
+    # reconciles them against persisted ticks (e.g. after a restart)
+    tasks.append(asyncio.create_task(resample_loop(interval=300)))
+    tasks.append(asyncio.create_task(tier_maintenance_loop()))
+    if SCAN_ENABLED:
+        tasks.append(asyncio.create_task(scanner_loop()))
+    tasks.append(asyncio.create_task(adf_scheduler_loop()))
+    tasks.append(asyncio.create_task(loop_lag_monitor(interval=0.1)))
 
-    print("[LIFESPAN] Background tasks started")
+    print(f"[LIFESPAN] Background tasks started ({INGEST_MODE})")
 
     try:
         yield
     finally:
         # Graceful shutdown
         print("[LIFESPAN] Shutting down background tasks")
-        ws_task.cancel()
-        writer_task.cancel()
-        resample_task.cancel()
+        for task in tasks:
+            task.cancel()
+        stop_ingest_workers(workers)
+        shutdown_executor()
 
 
 app = FastAPI(
@@ -0,0 +1,93 @@
+"""
+ADF: statsmodels adfuller (ADFTest) vs the NumPy path in
+analytics.stationarity, with a fresh AIC lag search and with the cached
+lag order, plus rolling ADF vs one adfuller call per window.
+
+    python -m benchmarks.bench_adf --lengths 500 1440 10000 100000 --window 240
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def spread_series(n: int, seed: int = 3) -> pd.Series:
+    # AR(1) spread around a level, like a cointegrated pair's residual
+    rng = np.random.default_rng(seed)
+    shocks = rng.normal(0, 1, n)
+    x = np.zeros(n)
+    for t in range(1, n):
+        x[t] = 0.95 * x[t - 1] + shocks[t]
+    return pd.Series(
+        250 + x, index=pd.date_range("2024-01-01", periods=n, freq="1min")
+    )
+
+
+def run(lengths: list[int], window: int, windows: int, repeat: int):
+    from statsmodels.tsa.stattools import adfuller
+
+    from analytics.adf import ADFTest
+    from analytics.stationarity import FastADF, rolling_adf
+
+    print(f"\n{'bars':>8} {'adfuller':>10} {'numpy':>10} {'cached lag':>11}")
+    for n in lengths:
+        df = spread_series(n).to_frame("spread")
+
+        # Same statistic, p-value and lag as statsmodels
+        ref, got = ADFTest().run(df), FastADF().run(df)
+        assert ref["lags_used"] == got["lags_used"] and ref["n_obs"] == got["n_obs"]
+        assert np.isclose(ref["adf_statistic"], got["adf_statistic"])
+        assert np.isclose(ref["p_value"], got["p_value"])
+
+        cached = FastADF()
+        cached.run(df)
+        print(
+            f"{n:>8} {timed(lambda: ADFTest().run(df), repeat):>8.2f}ms "
+            f"{timed(lambda: FastADF().run(df), repeat):>8.2f}ms "
+            f"{timed(lambda: cached.run(df), repeat):>9.2f}ms"
+        )
+
+    # Rolling: fixed lag, every window end
+    spread = spread_series(window + windows - 1)
+    lag = FastADF().run(spread.to_frame("spread"))["lags_used"]
+    rolled = rolling_adf(spread, window, lag=lag)
+    assert len(rolled) == windows
+
+    def per_window():
+        values = spread.to_numpy()
+        return [
+            adfuller(values[e - window + 1 : e + 1], maxlag=lag, autolag=None)[0]
+            for e in range(window - 1, len(values))
+        ]
+
+    t0 = time.perf_counter()
+    stats = per_window()
+    loop_ms = (time.perf_counter() - t0) * 1000
+    assert np.allclose(stats, rolled["adf_statistic"].to_numpy())
+
+    print(f"\nrolling ADF, window={window}, {windows} windows, lag={lag}")
+    print(f"adfuller per window:  {loop_ms:10.1f}ms")
+    print(f"rolling_adf (batch):  {timed(lambda: rolling_adf(spread, window, lag=lag), repeat):10.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lengths", type=int, nargs="+", default=[500, 1440, 10_000, 100_000])
+    parser.add_argument("--window", type=int, default=240)
+    parser.add_argument("--windows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore", FutureWarning)
+    run(args.lengths, args.window, args.windows, args.repeat)
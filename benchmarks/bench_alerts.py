@@ -0,0 +1,111 @@
+"""
+AlertEngine: iterrows() baseline vs vectorized evaluate vs incremental
+evaluation of one new bar.
+
+Also checks the vectorized alerts match the baseline exactly and that
+feeding bars in chunks yields the same ENTRY/EXIT events as one pass.
+
+    python -m benchmarks.bench_alerts --bars 5000 --pairs 20
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics.alerts import AlertEngine, AlertState
+
+
+def evaluate_iterrows(engine, z_df, corr_df, symbol_x, symbol_y) -> list[dict]:
+    # The previous row-by-row implementation, kept as the baseline
+    alerts = []
+    df = z_df.join(corr_df, how="inner")
+    for ts, row in df.iterrows():
+        z = row.get("zscore")
+        corr = row.get("rolling_corr")
+        if pd.isna(z) or pd.isna(corr):
+            continue
+        if abs(z) >= engine.z_threshold and corr >= engine.corr_threshold:
+            direction = "SHORT_SPREAD" if z > 0 else "LONG_SPREAD"
+            alerts.append(
+                {
+                    "timestamp": ts,
+                    "pair": f"{symbol_x}-{symbol_y}",
+                    "zscore": float(z),
+                    "correlation": float(corr),
+                    "direction": direction,
+                    "message": f"{direction}: |z|={abs(z):.2f}, corr={corr:.2f}",
+                }
+            )
+    return alerts
+
+
+def synthetic_frames(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01", periods=n, freq="1min", name="timestamp")
+    spread = pd.Series(np.cumsum(rng.normal(0, 1, n)) * 0.1 + rng.normal(0, 1, n))
+    z = (spread - spread.rolling(20).mean()) / spread.rolling(20).std()
+    corr = np.clip(0.8 + rng.normal(0, 0.15, n), -1, 1)
+    corr[:19] = np.nan
+    z_df = pd.DataFrame({"spread": spread.to_numpy(), "zscore": z.to_numpy()}, index=index)
+    corr_df = pd.DataFrame({"rolling_corr": corr}, index=index)
+    return z_df, corr_df
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def run(n_bars: int, n_pairs: int):
+    engine = AlertEngine(z_threshold=2.0, corr_threshold=0.7)
+    frames = [synthetic_frames(n_bars, seed) for seed in range(n_pairs)]
+
+    # Equivalence with the baseline (incl. frames with different indexes)
+    cases = frames[:3] + [(frames[0][0].iloc[5:], frames[0][1].iloc[::2])]
+    for z_df, corr_df in cases:
+        assert engine.evaluate(z_df, corr_df, "X", "Y") == evaluate_iterrows(
+            engine, z_df, corr_df, "X", "Y"
+        )
+
+    # Chunked incremental == one pass
+    z_df, corr_df = frames[0]
+    one, chunked = AlertState(max_events=None), AlertState(max_events=None)
+    engine.evaluate_incremental(one, z_df, corr_df, "X", "Y")
+    for end in range(50, n_bars + 50, 97):
+        engine.evaluate_incremental(chunked, z_df.iloc[:end], corr_df.iloc[:end], "X", "Y")
+    assert list(one.events) == list(chunked.events)
+    print(f"\nequivalence ✅ ({len(one.events)} entry/exit events on pair 0)")
+
+    base = timed(lambda: [evaluate_iterrows(engine, z, c, "X", "Y") for z, c in frames], 1)
+    vec = timed(lambda: [engine.evaluate(z, c, "X", "Y") for z, c in frames])
+
+    # Incremental: state is current, one new bar per pair arrives
+    states = []
+    for z, c in frames:
+        st = AlertState()
+        engine.evaluate_incremental(st, z.iloc[:-1], c.iloc[:-1], "X", "Y")
+        states.append(st)
+
+    t0 = time.perf_counter()
+    for st, (z, c) in zip(states, frames):
+        engine.evaluate_incremental(st, z, c, "X", "Y")
+    inc = (time.perf_counter() - t0) * 1000
+
+    print(f"bars={n_bars} pairs={n_pairs}")
+    print(f"iterrows:          {base:8.1f}ms ({base / n_pairs:.2f}ms/pair)")
+    print(f"vectorized:        {vec:8.1f}ms ({vec / n_pairs:.3f}ms/pair)")
+    print(f"incremental (+1):  {inc:8.2f}ms ({inc / n_pairs:.3f}ms/pair)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=5_000)
+    parser.add_argument("--pairs", type=int, default=20)
+    args = parser.parse_args()
+
+    run(args.bars, args.pairs)
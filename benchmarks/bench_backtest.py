@@ -0,0 +1,172 @@
+"""
+Backtest throughput (bars/sec): one parameter set, a threshold grid per
+window (inline vs process pool) and the incremental alert replay, plus the
+live PairFeed path for reference. Checks the vectorized z-score /
+correlation against PairFeed and the tick-built bars against the
+resampler.
+
+    python -m benchmarks.bench_backtest --bars 500000 --windows 20 40 60 120 --workers 2
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def pair_bars(n_bars: int, symbols=("XUSDT", "YUSDT"), seed: int = 21) -> pd.DataFrame:
+    # Random-walk Y, X = 15 * Y + OU spread
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range("2024-01-01", periods=n_bars, freq="1min")
+    y = 2_000.0 + np.cumsum(rng.normal(0, 1, n_bars))
+    noise = np.zeros(n_bars)
+    shocks = rng.normal(0, 5, n_bars)
+    for i in range(1, n_bars):
+        noise[i] = 0.98 * noise[i - 1] + shocks[i]
+    x = 15 * y + noise
+
+    frames = []
+    for sym, close in zip(symbols, (x, y)):
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": ts,
+                    "symbol": sym,
+                    "open": close,
+                    "high": close,
+                    "low": close,
+                    "close": close,
+                    "volume": 1.0,
+                    "vwap": close,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def timed(fn) -> tuple[float, object]:
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def check_live_path(db):
+    """
+    Vectorized z-score / correlation / beta == PairFeed bar by bar
+    """
+    from analytics.backtest import PairBacktest, pair_signals
+    from analytics.pair_feed import PairFeed
+
+    with db.write() as con:
+        con.append("bars_1m", pair_bars(3_000, ("FXUSDT", "FYUSDT"), seed=4))
+
+    feed = PairFeed("FXUSDT", "FYUSDT", window=30, history=3_000)
+    elapsed, _ = timed(feed.advance)
+    points = pd.DataFrame(list(feed.points)).astype({"zscore": float, "rolling_corr": float})
+
+    bt = PairBacktest("FXUSDT", "FYUSDT", db=db)
+    pair, beta = bt.load()
+    z, corr = pair_signals(pair.x, pair.y, beta, 30)
+
+    n = len(points)  # PairFeed holds the newest bar back
+    assert np.allclose(points["beta"].astype(float), beta[:n], equal_nan=True)
+    assert np.allclose(points["zscore"], z[:n], equal_nan=True, atol=1e-6)
+    assert np.allclose(points["rolling_corr"], corr[:n], equal_nan=True, atol=1e-9)
+    return n / elapsed
+
+
+def check_tick_source(db):
+    """
+    Closes built from ticks == bars from TickResampler
+    """
+    from analytics.backtest import load_ticks_as_bars
+    from analytics.pair_data import load_pair
+    from analytics.resampler import TickResampler
+    from benchmarks.synthetic import generate_ticks
+
+    db.insert_ticks(generate_ticks(("TXUSDT", "TYUSDT"), n_ticks=50_000))
+    resampler = TickResampler(db)
+    for sym in ("TXUSDT", "TYUSDT"):
+        resampler.resample(sym, "1m")
+
+    ref = load_pair("TXUSDT", "TYUSDT", db=db)
+    got = load_ticks_as_bars("TXUSDT", "TYUSDT", db=db)
+    assert np.array_equal(ref.timestamp, got.timestamp)
+    assert np.allclose(ref.x, got.x) and np.allclose(ref.y, got.y)
+
+
+def run(n_bars: int, windows: list[int], workers: int, replay_bars: int):
+    from analytics.backtest import _POOL_MIN, PairBacktest
+    from analytics.resampler import TickResampler
+    from storage.duckdb_manager import DuckDBManager
+
+    db = DuckDBManager()
+    TickResampler(db)
+    with db.write() as con:
+        con.append("bars_1m", pair_bars(n_bars))
+
+    live_rate = check_live_path(db)
+    check_tick_source(db)
+
+    z_thresholds = [1.5, 2.0, 2.5, 3.0]
+    corr_thresholds = [0.0, 0.5, 0.7, 0.9]
+    grid_size = len(windows) * len(z_thresholds) * len(corr_thresholds)
+
+    bt = PairBacktest("XUSDT", "YUSDT", beta_window=1440, cost_bps=1.0, db=db)
+    load_s, _ = timed(bt.load)
+
+    single_s, single = timed(lambda: bt.run(windows[0], 2.0, 0.7))
+    inline_s, inline = timed(
+        lambda: bt.grid(windows, z_thresholds, corr_thresholds, workers=1)
+    )
+    pool_s, pooled = timed(
+        lambda: bt.grid(windows, z_thresholds, corr_thresholds, workers=workers)
+    )
+    pd.testing.assert_frame_equal(inline, pooled)
+
+    # Replay emits one ENTRY per trade the vectorized path counts
+    small = PairBacktest(
+        "XUSDT", "YUSDT", beta_window=1440, cost_bps=1.0,
+        end=pd.Timestamp("2024-01-01") + pd.Timedelta(minutes=replay_bars - 1),
+        db=db,
+    )
+    small.load()
+    replay_s, events = timed(lambda: small.replay(windows[0], 2.0, 0.7, batch=1))
+    batch_s, batched = timed(lambda: small.replay(windows[0], 2.0, 0.7, batch=1_000))
+    entries = sum(e["event"] == "ENTRY" for e in events)
+    assert entries == small.run(windows[0], 2.0, 0.7)["trades"]
+    assert [e["timestamp"] for e in events] == [e["timestamp"] for e in batched]
+
+    print(f"\nbars={n_bars}, windows={windows}, grid={grid_size} parameter sets")
+    print(f"load + beta_t:               {load_s * 1000:10.1f}ms")
+    print(f"single run:                  {n_bars / single_s:14,.0f} bars/s")
+    print(f"grid inline:                 {n_bars * grid_size / inline_s:14,.0f} bar-evals/s ({inline_s:.2f}s)")
+    if n_bars * grid_size >= _POOL_MIN:
+        print(f"grid, {workers} processes:         {n_bars * grid_size / pool_s:14,.0f} bar-evals/s ({pool_s:.2f}s)")
+    else:
+        print(f"grid, {workers} workers:           inline, sweep below the pool minimum ({_POOL_MIN:,} bar-evals)")
+    print(f"replay, 1 bar per step:      {replay_bars / replay_s:14,.0f} bars/s")
+    print(f"replay, 1000 bars per step:  {replay_bars / batch_s:14,.0f} bars/s")
+    print(f"live PairFeed (reference):   {live_rate:14,.0f} bars/s")
+    print(f"one year of 1m bars, single run: {525_600 / (n_bars / single_s) * 1000:.0f}ms")
+
+    best = inline.iloc[:1][["window", "z_threshold", "corr_threshold", "net_pnl", "trades"]]
+    print("\nbest:", best.to_dict(orient="records")[0])
+    print("single:", single)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=500_000)
+    parser.add_argument("--windows", type=int, nargs="+", default=[20, 40, 60, 120])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--replay-bars", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before storage.duckdb_manager is imported
+        os.environ["QA_DB_FILE"] = str(Path(tmp) / "bench.duckdb")
+        run(args.bars, args.windows, args.workers, args.replay_bars)
@@ -0,0 +1,77 @@
+"""
+StreamingBarBuilder per-tick cost, checked against the pandas resampler.
+
+    python -m benchmarks.bench_bar_builder --ticks 500000
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from analytics.bar_builder import StreamingBarBuilder
+from analytics.resampler import BAR_COLUMNS, TickResampler
+from benchmarks.synthetic import generate_ticks
+
+
+def run(n_ticks: int):
+    ticks = generate_ticks(n_ticks=n_ticks)
+    records = ticks.to_dict(orient="records")
+
+    builder = StreamingBarBuilder()
+
+    t0 = time.perf_counter()
+    for tick in records:
+        builder.update(tick)
+    elapsed = time.perf_counter() - t0
+
+    print(f"\nticks={n_ticks}")
+    print(
+        f"update: {elapsed:.3f}s "
+        f"({elapsed / n_ticks * 1e6:.2f} µs/tick, 3 timeframes)"
+    )
+
+
+def check(n_ticks: int):
+    ticks = generate_ticks(n_ticks=n_ticks)
+
+    builder = StreamingBarBuilder()
+    for tick in ticks.to_dict(orient="records"):
+        builder.update(tick)
+    builder.flush(2**62)
+
+    streamed: dict[str, list[dict]] = {}
+    for tf, bar in builder.drain():
+        streamed.setdefault(tf, []).append(bar)
+
+    for tf, bars in streamed.items():
+        online = (
+            pd.DataFrame(bars)
+            .sort_values(["symbol", "timestamp"])
+            .reset_index(drop=True)
+        )
+
+        batch = pd.concat(
+            [
+                TickResampler._build_bars(
+                    g[["timestamp", "price", "qty"]].copy(), symbol, tf
+                )
+                for symbol, g in ticks.groupby("symbol")
+            ]
+        ).reset_index(drop=True)
+
+        online["timestamp"] = online["timestamp"].astype(
+            batch["timestamp"].dtype
+        )
+        pd.testing.assert_frame_equal(
+            online[BAR_COLUMNS], batch[BAR_COLUMNS], check_exact=False
+        )
+        print(f"{tf}: bars={len(online)} matches resampler ✔")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    run(args.ticks)
+    check(min(args.ticks, 50_000))
@@ -0,0 +1,93 @@
+"""
+Event-loop lag while ingesting, writing and resampling, with DB work
+run inline on the loop vs offloaded to the blocking pool.
+
+    python -m benchmarks.bench_event_loop --rate 10000 --seconds 10
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from analytics.resampler import TickResampler
+from benchmarks.bench_tick_writer import produce
+from benchmarks.synthetic import generate_ticks
+from storage.duckdb_manager import DuckDBManager
+from storage.hot_buffer import TickBuffer
+from storage.tick_writer import collect_ticks, write_batch
+from utils.executor import run_blocking
+from utils.loop_monitor import loop_lag_monitor, loop_lag_samples
+
+
+async def call(offload: bool, fn, *args, **kwargs):
+    if offload:
+        return await run_blocking(fn, *args, **kwargs)
+    return fn(*args, **kwargs)
+
+
+async def writer(buffer, db, offload: bool):
+    cursors: dict[str, int] = {}
+    while True:
+        batch = collect_ticks(buffer, cursors)
+        await call(offload, write_batch, db, batch)
+        await asyncio.sleep(0.5)
+
+
+async def resampler_task(resampler: TickResampler, symbols: list[str], offload: bool):
+    while True:
+        await asyncio.sleep(2)
+        for symbol in symbols:
+            # Full rebuild on purpose: the heaviest thing the loop can hit
+            await call(offload, resampler.resample, symbol, "1s")
+
+
+async def run_case(
+    offload: bool, ticks: list[dict], symbols: list[str], rate: int, db_file: Path
+):
+    db = DuckDBManager(db_file)
+    resampler = TickResampler(db)
+    buffer = TickBuffer()
+
+    loop_lag_samples.clear()
+    tasks = [
+        asyncio.create_task(loop_lag_monitor(interval=0.01, warn_ms=1e9)),
+        asyncio.create_task(writer(buffer, db, offload)),
+        asyncio.create_task(resampler_task(resampler, symbols, offload)),
+    ]
+
+    t0 = time.perf_counter()
+    await produce(buffer, ticks, rate)
+    elapsed = time.perf_counter() - t0
+
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    lag = sorted(loop_lag_samples)
+    name = "offloaded" if offload else "inline"
+    print(
+        f"{name:>10}: ingest={len(ticks) / elapsed:,.0f} ticks/s "
+        f"lag p50={lag[len(lag) // 2]:.1f}ms "
+        f"p99={lag[int(len(lag) * 0.99)]:.1f}ms max={lag[-1]:.1f}ms"
+    )
+
+
+async def run(rate: int, seconds: int):
+    df = generate_ticks(n_ticks=rate * seconds, trades_per_sec=rate)
+    ticks = df.to_dict(orient="records")
+    symbols = sorted(df["symbol"].unique())
+
+    print(f"\nrate={rate}/s seconds={seconds}")
+    with tempfile.TemporaryDirectory() as tmp:
+        await run_case(False, ticks, symbols, rate, Path(tmp) / "inline.duckdb")
+        await run_case(True, ticks, symbols, rate, Path(tmp) / "offload.duckdb")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=int, default=10_000)
+    parser.add_argument("--seconds", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rate, args.seconds))
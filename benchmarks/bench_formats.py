@@ -0,0 +1,108 @@
+"""
+Response formats for the series routes: JSON records (FastAPI encoder)
+vs columnar JSON vs Arrow IPC. Server time per request and payload size
+for /bars and /spread, with a round-trip equality check.
+
+    python -m benchmarks.bench_formats --bars 10000 50000 200000
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ("records", "columns", "arrow")
+
+
+def decode(resp, fmt: str) -> pd.DataFrame:
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        return pa.ipc.open_stream(io.BytesIO(resp.content)).read_pandas()
+    # Records and columns both load straight into a DataFrame
+    return pd.DataFrame(resp.json())
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def run(sizes: list[int], repeat: int):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from analytics.resampler import TickResampler
+    from api.routes import router
+    from benchmarks.bench_pair_query import synthetic_bars
+    from storage.duckdb_manager import DuckDBManager
+
+    db = DuckDBManager()
+    resampler = TickResampler(db)
+    resampler.upsert_bars("1m", synthetic_bars(max(sizes), ["BTCUSDT", "ETHUSDT"]))
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    print(f"\nbest of {repeat}; ms per request / payload KB")
+    print(f"{'route':>8} {'rows':>8} " + " ".join(f"{f:>18}" for f in FORMATS))
+
+    for n in sizes:
+        routes = {
+            "/bars": {"symbol": "BTCUSDT", "limit": n},
+            "/spread": {
+                "symbol_x": "BTCUSDT", "symbol_y": "ETHUSDT", "lookback": n
+            },
+        }
+        for route, params in routes.items():
+            cells = []
+            frames = {}
+            for fmt in FORMATS:
+                def call():
+                    return client.get(route, params={**params, "format": fmt})
+
+                resp = call()
+                resp.raise_for_status()
+                frames[fmt] = decode(resp, fmt)
+                ms = timed(call, repeat)
+                cells.append(f"{ms:>8.1f} {len(resp.content) / 1024:>9.0f}")
+
+            # Same values whichever format
+            ref = frames["records"]
+            for fmt in ("columns", "arrow"):
+                got = frames[fmt]
+                assert list(got.columns) == list(ref.columns)
+                assert len(got) == len(ref)
+                for c in ref.columns:
+                    if c == "timestamp":
+                        assert (
+                            pd.to_datetime(got[c]).to_numpy("datetime64[us]")
+                            == pd.to_datetime(ref[c]).to_numpy("datetime64[us]")
+                        ).all()
+                    elif ref[c].dtype.kind == "f":
+                        assert np.allclose(got[c], ref[c], equal_nan=True)
+                    else:
+                        assert (got[c].astype(str) == ref[c].astype(str)).all()
+
+            print(f"{route:>8} {n:>8} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, nargs="+", default=[10_000, 50_000, 200_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before storage.duckdb_manager is imported
+        os.environ["QA_DB_FILE"] = str(Path(tmp) / "bench.duckdb")
+        run(args.bars, args.repeat)
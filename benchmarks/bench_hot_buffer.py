@@ -0,0 +1,80 @@
+"""
+Columnar TickBuffer vs the old deque-of-dicts buffer: memory and
+recent-window read latency.
+
+    python -m benchmarks.bench_hot_buffer --maxlen 10000
+"""
+import argparse
+import time
+import tracemalloc
+from collections import deque
+
+from benchmarks.synthetic import generate_ticks
+from storage.hot_buffer import TickBuffer
+
+
+class DequeTickBuffer:
+    """
+    Previous implementation, kept here as the baseline
+    """
+
+    def __init__(self, maxlen: int):
+        self.buffers = {}
+        self.maxlen = maxlen
+
+    def add_tick(self, tick: dict):
+        self.buffers.setdefault(
+            tick["symbol"], deque(maxlen=self.maxlen)
+        ).append(tick)
+
+    def get_recent_ticks(self, symbol: str, n: int = 100):
+        return list(self.buffers[symbol])[-n:]
+
+
+def fill(buffer_cls, ticks: list[dict], maxlen: int):
+    tracemalloc.start()
+    buf = buffer_cls(maxlen)
+    for tick in ticks:
+        # Fresh dict per tick, like normalize_trade produces
+        buf.add_tick(dict(tick))
+    mem, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return buf, mem
+
+
+def time_reads(fn, repeat: int = 2_000) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def run(maxlen: int, n: int):
+    df = generate_ticks(n_ticks=4 * maxlen)
+    df["timestamp"] = df["timestamp"].map(lambda t: t.isoformat())
+    ticks = df.to_dict(orient="records")
+    symbol = ticks[0]["symbol"]
+
+    old, old_mem = fill(DequeTickBuffer, ticks, maxlen)
+    new, new_mem = fill(TickBuffer, ticks, maxlen)
+
+    print(f"\nmaxlen={maxlen} symbols=2 ticks_written={len(ticks)}")
+    print(
+        f"memory: deque={old_mem / 1e6:.2f}MB "
+        f"columnar={new_mem / 1e6:.2f}MB "
+        f"({old_mem / new_mem:.1f}x smaller)"
+    )
+    print(
+        f"last {n} ticks: deque={time_reads(lambda: old.get_recent_ticks(symbol, n)):.1f}µs "
+        f"columnar views={time_reads(lambda: new.get_recent_arrays(symbol, n)):.2f}µs "
+        f"columnar dicts={time_reads(lambda: new.get_recent_ticks(symbol, n)):.1f}µs"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--maxlen", type=int, default=10_000)
+    parser.add_argument("-n", type=int, default=100)
+    args = parser.parse_args()
+
+    run(args.maxlen, args.n)
@@ -0,0 +1,118 @@
+"""
+Replay harness for the websocket ingestion path.
+
+Starts a local websocket server that mimics Binance's combined-stream
+endpoint (/stream?streams=a@trade/b@trade) and replays pre-encoded trade
+messages as fast as the client reads them, then measures messages/sec
+through start_stream → decode → hot buffer → bar builder on one core.
+
+    python -m benchmarks.bench_ingestion --symbols 100 --messages 200000
+    python -m benchmarks.bench_ingestion --decoder json
+"""
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import websockets
+
+import ingestion.binance_ws as binance_ws
+
+
+def encode_trades(symbols: list[str], n: int, seed: int = 7) -> dict[str, list[str]]:
+    """
+    Pre-encode n combined-stream trade messages per symbol group
+    """
+    rng = np.random.default_rng(seed)
+    ts0 = 1_704_067_200_000
+    messages: dict[str, list[str]] = {s: [] for s in symbols}
+
+    picks = rng.integers(0, len(symbols), n)
+    prices = 100 + np.cumsum(rng.normal(0, 0.01, n))
+    for i, k in enumerate(picks.tolist()):
+        s = symbols[k]
+        messages[s].append(
+            json.dumps(
+                {
+                    "stream": f"{s.lower()}@trade",
+                    "data": {
+                        "e": "trade",
+                        "E": ts0 + i,
+                        "T": ts0 + i,
+                        "s": s,
+                        "t": i,
+                        "p": f"{prices[i]:.4f}",
+                        "q": "0.010",
+                        "X": "MARKET",
+                        "m": bool(i & 1),
+                    },
+                }
+            )
+        )
+    return messages
+
+
+def make_server(messages: dict[str, list[str]]):
+    async def handler(ws):
+        query = parse_qs(urlparse(ws.request.path).query)
+        streams = query["streams"][0].split("/")
+        symbols = [s.split("@")[0].upper() for s in streams]
+
+        for s in symbols:
+            for m in messages.get(s, []):
+                await ws.send(m)
+
+        # Keep the socket open; the client is cancelled when done
+        await ws.wait_closed()
+
+    return handler
+
+
+async def run(n_symbols: int, n_messages: int, n_connections: int):
+    symbols = [f"SYM{i:03d}USDT" for i in range(n_symbols)]
+    messages = encode_trades(symbols, n_messages)
+
+    async with websockets.serve(make_server(messages), "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+
+        t0 = time.perf_counter()
+        client = asyncio.create_task(
+            binance_ws.start_stream(
+                symbols,
+                n_connections=n_connections,
+                base_url=f"ws://127.0.0.1:{port}",
+            )
+        )
+
+        buffers = binance_ws.tick_buffer.buffers
+        while sum(r.seq for r in buffers.values()) < n_messages:
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - t0
+
+        client.cancel()
+        await asyncio.gather(client, return_exceptions=True)
+
+    print(
+        f"\nsymbols={n_symbols} connections={n_connections} "
+        f"decoder={binance_ws.loads.__module__}"
+    )
+    print(
+        f"messages={n_messages} in {elapsed:.2f}s → "
+        f"{n_messages / elapsed:,.0f} msg/s (single core, incl. bar builder)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--connections", type=int, default=2)
+    parser.add_argument("--decoder", choices=["orjson", "json"], default="orjson")
+    args = parser.parse_args()
+
+    if args.decoder == "json":
+        binance_ws.loads = json.loads
+
+    asyncio.run(run(args.symbols, args.messages, args.connections))
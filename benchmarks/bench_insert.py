@@ -0,0 +1,72 @@
+"""
+DuckDBManager.insert_ticks: columnar bulk insert vs the old
+executemany-per-tuple path, in rows/sec.
+
+    python -m benchmarks.bench_insert --rows 200000 --batch 5000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import generate_ticks
+from storage.duckdb_manager import DuckDBManager
+
+
+def insert_rowwise(db: DuckDBManager, ticks: list[dict]):
+    """
+    Previous implementation, kept here as the baseline
+    """
+    db.con.executemany(
+        "INSERT INTO ticks VALUES (?, ?, ?, ?)",
+        [(t["timestamp"], t["symbol"], t["price"], t["qty"]) for t in ticks],
+    )
+
+
+def run(rows: int, batch: int, rowwise_rows: int):
+    df = generate_ticks(n_ticks=rows)
+    batches = [df.iloc[i:i + batch] for i in range(0, rows, batch)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DuckDBManager(Path(tmp) / "bench.duckdb")
+
+        # Bulk: DataFrame batches straight from the writer
+        t0 = time.perf_counter()
+        for b in batches:
+            db.insert_ticks(b)
+        bulk = rows / (time.perf_counter() - t0)
+
+        # Bulk: list of dicts (converted to a frame internally)
+        records = [b.to_dict(orient="records") for b in batches]
+        t0 = time.perf_counter()
+        for r in records:
+            db.insert_ticks(r)
+        bulk_dicts = rows / (time.perf_counter() - t0)
+
+        # Row-wise baseline on a smaller sample (it is very slow)
+        sample = df.iloc[:rowwise_rows].to_dict(orient="records")
+        t0 = time.perf_counter()
+        for i in range(0, len(sample), batch):
+            insert_rowwise(db, sample[i:i + batch])
+        rowwise = len(sample) / (time.perf_counter() - t0)
+
+        assert db.count_ticks() == 2 * rows + len(sample)
+        t0 = time.perf_counter()
+        db.count_ticks()
+        count_us = (time.perf_counter() - t0) * 1e6
+
+    print(f"\nrows={rows} batch={batch}")
+    print(f"bulk (DataFrame): {bulk:,.0f} rows/s")
+    print(f"bulk (dicts):     {bulk_dicts:,.0f} rows/s")
+    print(f"executemany:      {rowwise:,.0f} rows/s ({rowwise_rows} rows)")
+    print(f"count_ticks (cached): {count_us:.1f}µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--rowwise-rows", type=int, default=5_000)
+    args = parser.parse_args()
+
+    run(args.rows, args.batch, args.rowwise_rows)
@@ -0,0 +1,97 @@
+"""
+Online hedge ratio (RLS / Kalman) vs refitting statsmodels OLS per bar.
+
+Also checks that RLS with forgetting=1 matches batch OLS on every prefix,
+and that a persisted/restored estimator continues identically.
+
+    python -m benchmarks.bench_online_hedge --bars 5000
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import statsmodels.api as sm
+
+from analytics.online_regression import KalmanHedgeRatio, RecursiveLeastSquares
+
+
+def synthetic_pair(n: int, beta: float = 0.05, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    y = 2000 + np.cumsum(rng.normal(0, 2.0, n))
+    x = 10 + beta * y + rng.normal(0, 0.5, n)
+    return x, y
+
+
+def ols(x, y) -> tuple[float, float]:
+    params = sm.OLS(x, sm.add_constant(y)).fit().params
+    return params[0], params[1]
+
+
+def check_equivalence(x, y, checkpoints: int = 20):
+    rls = RecursiveLeastSquares(forgetting=1.0)
+    marks = set(np.linspace(2, len(x) - 1, checkpoints, dtype=int).tolist())
+    worst = 0.0
+
+    for i, (xi, yi) in enumerate(zip(x.tolist(), y.tolist())):
+        rls.update(xi, yi)
+        if i in marks:
+            a, b = ols(x[: i + 1], y[: i + 1])
+            worst = max(worst, abs(rls.beta - b) / abs(b), abs(rls.alpha - a) / abs(a))
+
+    assert worst < 1e-8, f"RLS(λ=1) diverges from OLS: rel err {worst:.2e}"
+    print(f"RLS(λ=1) vs sm.OLS: max rel err {worst:.2e} over {len(marks)} prefixes ✅")
+
+
+def check_state_roundtrip(x, y):
+    for cls, kwargs in ((RecursiveLeastSquares, {"forgetting": 0.99}), (KalmanHedgeRatio, {})):
+        half = len(x) // 2
+        full = cls(**kwargs)
+        part = cls(**kwargs)
+        for xi, yi in zip(x.tolist(), y.tolist()):
+            full.update(xi, yi)
+        for xi, yi in zip(x[:half].tolist(), y[:half].tolist()):
+            part.update(xi, yi)
+
+        restored = cls.from_state(json.loads(json.dumps(part.to_state())))
+        for xi, yi in zip(x[half:].tolist(), y[half:].tolist()):
+            restored.update(xi, yi)
+
+        assert restored.beta == full.beta, cls.__name__
+    print("state persist/restore mid-stream: identical ✅")
+
+
+def time_updates(x, y):
+    xs, ys = x.tolist(), y.tolist()
+    for name, est in (
+        ("rls", RecursiveLeastSquares(forgetting=0.995)),
+        ("kalman", KalmanHedgeRatio()),
+    ):
+        t0 = time.perf_counter()
+        for xi, yi in zip(xs, ys):
+            est.update(xi, yi)
+        per = (time.perf_counter() - t0) / len(xs) * 1e6
+        print(f"{name:>6}: {per:.2f}µs per bar (beta={est.beta:.5f})")
+
+
+def time_refit(x, y, samples: int = 50):
+    # Refit cost at history length n, as HedgeRatioOLS.compute pays per bar
+    n = len(x)
+    t0 = time.perf_counter()
+    for _ in range(samples):
+        ols(x, y)
+    per = (time.perf_counter() - t0) / samples * 1e6
+    print(f"   ols: {per:.0f}µs per bar at n={n} (full refit, grows with history)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=5_000)
+    args = parser.parse_args()
+
+    x, y = synthetic_pair(args.bars)
+    print(f"\nbars={args.bars}")
+    check_equivalence(x, y)
+    check_state_roundtrip(x, y)
+    time_updates(x, y)
+    time_refit(x, y)
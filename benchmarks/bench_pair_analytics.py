@@ -0,0 +1,107 @@
+"""
+One dashboard refresh after a new bar: the per-route fan-out
+(/hedge-ratio, /spread, /zscore, /correlation, /alerts) vs a single
+/pair-analytics call, plus an equivalence check of the payloads.
+
+    python -m benchmarks.bench_pair_analytics --ticks 1000000 --refreshes 5
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ENDPOINTS = {
+    "hedge_ratio": "/hedge-ratio",
+    "spread": "/spread",
+    "zscore": "/zscore",
+    "correlation": "/correlation",
+    "alerts": "/alerts",
+}
+PARAMS = {"symbol_x": "BTCUSDT", "symbol_y": "ETHUSDT", "timeframe": "1m"}
+
+
+def assert_same(a, b, path="") -> None:
+    # Rolling correlation is streamed on /correlation → float noise only
+    if isinstance(a, dict):
+        assert a.keys() == b.keys(), path
+        for k in a:
+            assert_same(a[k], b[k], f"{path}.{k}")
+    elif isinstance(a, list):
+        assert len(a) == len(b), path
+        for i, (x, y) in enumerate(zip(a, b)):
+            assert_same(x, y, f"{path}[{i}]")
+    elif isinstance(a, float):
+        assert np.isclose(a, b, rtol=1e-9, atol=1e-9), path
+    else:
+        assert a == b, path
+
+
+def run(n_ticks: int, refreshes: int):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from analytics.resampler import TickResampler
+    from api.routes import router
+    from benchmarks.synthetic import generate_ticks
+    from storage.duckdb_manager import DuckDBManager
+
+    db = DuckDBManager()
+    resampler = TickResampler(db)
+    db.insert_ticks(generate_ticks(n_ticks=n_ticks))
+    for symbol in ("BTCUSDT", "ETHUSDT"):
+        resampler.resample(symbol, "1m")
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    last = db.con.execute(
+        "SELECT * FROM bars_1m ORDER BY timestamp DESC LIMIT 1"
+    ).fetchdf()
+
+    def fan_out() -> dict:
+        return {
+            field: client.get(ep, params=PARAMS).json()
+            for field, ep in ENDPOINTS.items()
+        }
+
+    def combined() -> dict:
+        return client.get("/pair-analytics", params=PARAMS).json()
+
+    assert_same(fan_out(), combined())
+
+    def timed_after_new_bar(fn) -> float:
+        best = float("inf")
+        for _ in range(refreshes):
+            # New bar → every cached result is stale
+            resampler.upsert_bars("1m", last)
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        return best * 1000
+
+    bars = db.con.execute(
+        "SELECT COUNT(*) FROM bars_1m WHERE symbol = 'BTCUSDT'"
+    ).fetchone()[0]
+    print(f"\nbars_1m per symbol={bars}; refresh after a new bar (best of {refreshes})")
+    print(f"per-route fan-out (5 calls): {timed_after_new_bar(fan_out):8.1f}ms")
+    print(f"/pair-analytics:             {timed_after_new_bar(combined):8.1f}ms")
+    print(
+        f"/pair-analytics?fields=hedge_ratio,alerts: "
+        f"{timed_after_new_bar(lambda: client.get('/pair-analytics', params={**PARAMS, 'fields': 'hedge_ratio,alerts'})):.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--refreshes", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before storage.duckdb_manager is imported
+        os.environ["QA_DB_FILE"] = str(Path(tmp) / "bench.duckdb")
+        run(args.ticks, args.refreshes)
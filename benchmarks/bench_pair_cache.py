@@ -0,0 +1,71 @@
+"""
+Dashboard-style polling of the pair endpoints with the result cache,
+before and after a new bar is written.
+
+    python -m benchmarks.bench_pair_cache --ticks 300000 --polls 20
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+ENDPOINTS = ["/hedge-ratio", "/spread", "/zscore", "/correlation", "/alerts"]
+PARAMS = {"symbol_x": "BTCUSDT", "symbol_y": "ETHUSDT", "timeframe": "1m"}
+
+
+def poll(client) -> float:
+    t0 = time.perf_counter()
+    for ep in ENDPOINTS:
+        client.get(ep, params=PARAMS).raise_for_status()
+    return (time.perf_counter() - t0) * 1000
+
+
+def run(n_ticks: int, polls: int):
+    from fastapi.testclient import TestClient
+
+    from analytics.cache import pair_cache
+    from analytics.resampler import TickResampler
+    from api.routes import router
+    from benchmarks.synthetic import generate_ticks
+    from fastapi import FastAPI
+    from storage.duckdb_manager import DuckDBManager
+
+    db = DuckDBManager()
+    resampler = TickResampler(db)
+    db.insert_ticks(generate_ticks(n_ticks=n_ticks))
+    for symbol in ("BTCUSDT", "ETHUSDT"):
+        resampler.resample(symbol, "1m")
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    cold = poll(client)
+    warm = [poll(client) for _ in range(polls)]
+
+    # A new bar closes → everything recomputes once
+    last = db.con.execute(
+        "SELECT * FROM bars_1m ORDER BY timestamp DESC LIMIT 1"
+    ).fetchdf()
+    resampler.upsert_bars("1m", last)
+    after_bar = poll(client)
+
+    bars = db.con.execute("SELECT COUNT(*) FROM bars_1m").fetchone()[0]
+    print(f"\nbars_1m={bars} endpoints={len(ENDPOINTS)} per poll")
+    print(f"cold poll:        {cold:.1f}ms")
+    print(f"cached poll (avg): {sum(warm) / len(warm):.2f}ms")
+    print(f"after new bar:    {after_bar:.1f}ms")
+    print(f"cache: {pair_cache.summary()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=300_000)
+    parser.add_argument("--polls", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before storage.duckdb_manager is imported
+        os.environ["QA_DB_FILE"] = str(Path(tmp) / "bench.duckdb")
+        run(args.ticks, args.polls)
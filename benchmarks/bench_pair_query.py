@@ -0,0 +1,114 @@
+"""
+Pair loading: pandas pivot over the full history vs the DuckDB self-join
+in analytics.pair_data, with and without a lookback window.
+
+    python -m benchmarks.bench_pair_query --bars 200000 --symbols 10 --lookback 500
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_bars(n_bars: int, symbols: list[str], seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range("2024-01-01", periods=n_bars, freq="1min")
+    frames = []
+    for i, sym in enumerate(symbols):
+        close = 100 * (i + 1) + np.cumsum(rng.normal(0, 0.5, n_bars))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": ts,
+                    "symbol": sym,
+                    "open": close,
+                    "high": close,
+                    "low": close,
+                    "close": close,
+                    "volume": 1.0,
+                    "vwap": close,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_pivot(db, symbol_x, symbol_y, timeframe="1m") -> pd.DataFrame:
+    # The previous per-module query: full history → pandas pivot
+    df = db.con.execute(
+        f"""
+        SELECT timestamp, symbol, close
+        FROM bars_{timeframe}
+        WHERE symbol IN (?, ?)
+        ORDER BY timestamp
+        """,
+        [symbol_x, symbol_y],
+    ).fetchdf()
+    return df.pivot(index="timestamp", columns="symbol", values="close").dropna()
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def run(n_bars: int, n_symbols: int, lookback: int, repeat: int):
+    from analytics.pair_data import load_pair
+    from analytics.resampler import TickResampler
+    from analytics.stats import ZScoreCalculator
+    from storage.duckdb_manager import DuckDBManager
+
+    db = DuckDBManager()
+    TickResampler(db)
+    symbols = [f"SYM{i:02d}USDT" for i in range(n_symbols)]
+    with db.write() as con:
+        con.append("bars_1m", synthetic_bars(n_bars, symbols))
+
+    x, y = symbols[0], symbols[1]
+
+    # Same data either way
+    ref = load_pivot(db, x, y)
+    got = load_pair(x, y, db=db).to_frame(x, y)
+    assert np.array_equal(ref[x].to_numpy(), got[x].to_numpy())
+    assert np.array_equal(ref.index.to_numpy(), got.index.to_numpy())
+    tail = load_pair(x, y, lookback=lookback, db=db)
+    assert np.array_equal(tail.x, ref[x].to_numpy()[-lookback:])
+
+    def zscore_old():
+        pivot = load_pivot(db, x, y)
+        spread = (pivot[x] - pivot[y]).to_frame("spread")
+        return ZScoreCalculator(20).compute(spread).iloc[-lookback:]
+
+    def zscore_new():
+        pair = load_pair(x, y, lookback=lookback, db=db)
+        spread = pd.DataFrame({"spread": pair.x - pair.y}, index=pair.timestamp)
+        return ZScoreCalculator(20).compute(spread)
+
+    print(f"\nbars={n_bars} per symbol, symbols={n_symbols}, lookback={lookback}")
+    print(f"pivot (full history):      {timed(lambda: load_pivot(db, x, y), repeat):8.1f}ms")
+    print(f"self-join (full history):  {timed(lambda: load_pair(x, y, db=db), repeat):8.1f}ms")
+    print(f"self-join (lookback):      {timed(lambda: load_pair(x, y, lookback=lookback, db=db), repeat):8.1f}ms")
+    print(f"z-score, old path:         {timed(zscore_old, repeat):8.1f}ms")
+    print(f"z-score, lookback path:    {timed(zscore_new, repeat):8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=200_000)
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--lookback", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before storage.duckdb_manager is imported
+        os.environ["QA_DB_FILE"] = str(Path(tmp) / "bench.duckdb")
+        run(args.bars, args.symbols, args.lookback, args.repeat)
@@ -0,0 +1,109 @@
+"""
+Server work and bytes per closed bar for N dashboard viewers: polling the
+five pair endpoints (full history as JSON) vs the /stream/pair push feed
+(one shared update, only the new bar).
+
+    python -m benchmarks.bench_push_feed --ticks 1000000 --viewers 1 10 50
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+ENDPOINTS = ["/hedge-ratio", "/spread", "/zscore", "/correlation", "/alerts"]
+PARAMS = {"symbol_x": "BTCUSDT", "symbol_y": "ETHUSDT", "timeframe": "1m"}
+
+
+def run(n_ticks: int, viewers: list[int], bars: int):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from analytics.pair_feed import PairFeed
+    from analytics.resampler import TickResampler
+    from api.routes import router
+    from benchmarks.synthetic import generate_ticks
+    from storage.duckdb_manager import DuckDBManager
+
+    db = DuckDBManager()
+    resampler = TickResampler(db)
+    ticks = generate_ticks(n_ticks=n_ticks)
+    db.insert_ticks(ticks)
+    for symbol in ("BTCUSDT", "ETHUSDT"):
+        resampler.resample(symbol, "1m")
+
+    history = db.con.execute(
+        "SELECT * FROM bars_1m ORDER BY timestamp, symbol"
+    ).fetchdf()
+    n_bars = len(history) // 2
+
+    client = TestClient(FastAPI())
+    client.app.include_router(router)
+
+    step = history["timestamp"].iloc[-1] - history["timestamp"].iloc[-3]
+    appended = 0
+
+    def rewrite_bar(i: int):
+        # Re-write a past bar → watermark moves, cached results go stale
+        resampler.upsert_bars("1m", history.iloc[[2 * (n_bars - bars + i)]])
+
+    def close_bar():
+        # Append the next bar for both symbols (closes the held-back one)
+        nonlocal appended
+        appended += 1
+        resampler.upsert_bars(
+            "1m",
+            history.iloc[-2:].assign(
+                timestamp=history["timestamp"].iloc[-1] + appended * step
+            ),
+        )
+
+    print(f"\nbars_1m per symbol={n_bars}; per closed bar, avg over {bars} bars")
+    print(f"{'viewers':>8} {'poll ms':>9} {'poll KB':>9} {'push ms':>9} {'push KB':>9}")
+
+    for n in viewers:
+        # Polling: every viewer fetches every endpoint once per bar
+        poll_ms = poll_bytes = 0.0
+        for i in range(bars):
+            rewrite_bar(i)
+            t0 = time.perf_counter()
+            for _ in range(n):
+                for ep in ENDPOINTS:
+                    resp = client.get(ep, params=PARAMS)
+                    poll_bytes += len(resp.content)
+            poll_ms += (time.perf_counter() - t0) * 1000
+
+        # Push: one advance + one serialisation, fanned out to n queues
+        feed = PairFeed("BTCUSDT", "ETHUSDT", "1m")
+        feed.advance()
+        queues = [asyncio.Queue(maxsize=bars + 1) for _ in range(n)]
+        feed.subscribers.update(queues)
+
+        push_ms = push_bytes = 0.0
+        for i in range(bars):
+            close_bar()
+            t0 = time.perf_counter()
+            delta = feed.advance()
+            if delta:
+                feed.publish(delta)
+            push_ms += (time.perf_counter() - t0) * 1000
+            push_bytes += sum(len(q.get_nowait()[2]) for q in queues if not q.empty())
+
+        print(
+            f"{n:>8} {poll_ms / bars:>9.1f} {poll_bytes / bars / 1024:>9.0f} "
+            f"{push_ms / bars:>9.2f} {push_bytes / bars / 1024:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    parser.add_argument("--viewers", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--bars", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before storage.duckdb_manager is imported
+        os.environ["QA_DB_FILE"] = str(Path(tmp) / "bench.duckdb")
+        run(args.ticks, args.viewers, args.bars)
@@ -0,0 +1,73 @@
+"""
+Full-rebuild vs incremental TickResampler.
+
+Feeds the same synthetic tick stream into two databases in chunks,
+resamples after every chunk (like resample_loop does every cycle) and
+checks both paths end with identical bars.
+
+    python -m benchmarks.bench_resampler --ticks 500000 --cycles 20
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analytics.resampler import TickResampler
+from benchmarks.synthetic import generate_ticks
+from storage.duckdb_manager import DuckDBManager
+
+
+def run(n_ticks: int, cycles: int, timeframe: str):
+    ticks = generate_ticks(n_ticks=n_ticks)
+    bounds = np.linspace(0, n_ticks, cycles + 1).astype(int)
+    chunks = [ticks.iloc[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        full = TickResampler(DuckDBManager(Path(tmp) / "full.duckdb"))
+        inc = TickResampler(DuckDBManager(Path(tmp) / "inc.duckdb"))
+
+        timings = {"full": [], "incremental": []}
+
+        for chunk in chunks:
+            for name, resampler in (("full", full), ("incremental", inc)):
+                resampler.db.insert_ticks(chunk)
+                # Flush the WAL now: otherwise the automatic checkpoint lands
+                # in whichever resample commit crosses the threshold (~150ms)
+                resampler.db.con.execute("CHECKPOINT")
+
+                t0 = time.perf_counter()
+                for symbol in chunk["symbol"].unique():
+                    resampler.resample(
+                        symbol,
+                        timeframe,
+                        incremental=(name == "incremental"),
+                    )
+                timings[name].append(time.perf_counter() - t0)
+
+        # Output must be identical
+        query = f"SELECT * FROM bars_{timeframe} ORDER BY symbol, timestamp"
+        bars_full = full.db.con.execute(query).fetchdf()
+        bars_inc = inc.db.con.execute(query).fetchdf()
+        pd.testing.assert_frame_equal(bars_full, bars_inc)
+
+    print(f"\nticks={n_ticks} cycles={cycles} timeframe={timeframe}")
+    print(f"bars={len(bars_full)} (identical output ✔)")
+    for name, t in timings.items():
+        print(
+            f"{name:>12}: total={sum(t):.3f}s "
+            f"median_cycle={np.median(t) * 1000:.1f}ms "
+            f"last_cycle={t[-1] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=200_000)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--timeframe", default="1m")
+    args = parser.parse_args()
+
+    run(args.ticks, args.cycles, args.timeframe)
@@ -0,0 +1,77 @@
+"""
+Rolling / expanding OLS hedge ratio: one prefix-sum pass (window_ols) vs
+one sm.OLS fit per window (timed on a sample of windows and extrapolated
+to every bar).
+
+    python -m benchmarks.bench_rolling_ols --bars 10000 100000 1000000 --window 500
+"""
+import argparse
+import time
+
+import numpy as np
+import statsmodels.api as sm
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def prices(n: int, seed: int = 9) -> tuple[np.ndarray, np.ndarray]:
+    # BTC-like level, ETH-like hedge leg with a slowly drifting beta
+    rng = np.random.default_rng(seed)
+    y = 3000 + np.cumsum(rng.normal(0, 2, n))
+    beta = 16 + np.cumsum(rng.normal(0, 0.001, n))
+    return 500 + beta * y + rng.normal(0, 20, n), y
+
+
+def run(sizes: list[int], window: int, sample: int, repeat: int):
+    from analytics.regression import window_ols
+
+    print(f"\nwindow={window}")
+    print(
+        f"{'bars':>9} {'rolling':>10} {'expanding':>10} "
+        f"{'sm.OLS loop (est.)':>19} {'speed-up':>9}"
+    )
+    for n in sizes:
+        x, y = prices(n)
+        rolling = window_ols(x, y, window)
+        expanding = window_ols(x, y)
+
+        ends = np.random.default_rng(0).integers(window, n, sample)
+        t0 = time.perf_counter()
+        for e in ends:
+            w = slice(e - window + 1, e + 1)
+            fit = sm.OLS(x[w], sm.add_constant(y[w])).fit()
+            # Same fit as per window; alpha is compared against the price
+            # level since it can sit near zero
+            assert np.isclose(fit.params[1], rolling["beta"][e], rtol=1e-6)
+            assert np.isclose(fit.rsquared, rolling["r2"][e], rtol=1e-6)
+            assert abs(fit.params[0] - rolling["alpha"][e]) < 1e-6 * x[w].mean()
+        loop_ms = (time.perf_counter() - t0) / sample * (n - window + 1) * 1000
+
+        e = ends[0]
+        fit = sm.OLS(x[: e + 1], sm.add_constant(y[: e + 1])).fit()
+        assert np.isclose(fit.params[1], expanding["beta"][e])
+
+        rolling_ms = timed(lambda: window_ols(x, y, window), repeat)
+        print(
+            f"{n:>9} {rolling_ms:>8.1f}ms "
+            f"{timed(lambda: window_ols(x, y), repeat):>8.1f}ms "
+            f"{loop_ms:>17.0f}ms {loop_ms / rolling_ms:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--window", type=int, default=500)
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.bars, args.window, args.sample, args.repeat)
@@ -0,0 +1,138 @@
+"""
+Universe scan: one price matrix + one covariance matrix + ADF on the top-k
+pairs in worker processes, vs the per-pair route path (load_pair +
+HedgeRatioOLS.fit + ADF for every pair, timed on a sample and
+extrapolated to all n(n-1)/2 pairs).
+
+    python -m benchmarks.bench_scanner --symbols 50 100 200 --bars 1440 --top-k 20
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def factor_bars(n_bars: int, symbols: list[str], n_factors: int = 10, seed: int = 5):
+    """
+    Symbols driven by a few random-walk factors plus stationary noise, so
+    symbols sharing a factor are cointegrated and the rest are not
+    """
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range("2024-01-01", periods=n_bars, freq="1min")
+    factors = np.cumsum(rng.normal(0, 1, (n_bars, n_factors)), axis=0)
+
+    frames = []
+    for i, sym in enumerate(symbols):
+        noise = np.zeros(n_bars)
+        shocks = rng.normal(0, 1, n_bars)
+        for t in range(1, n_bars):
+            noise[t] = 0.8 * noise[t - 1] + shocks[t]
+        close = 1000 + rng.uniform(0.5, 2) * factors[:, i % n_factors] + noise
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": ts,
+                    "symbol": sym,
+                    "open": close,
+                    "high": close,
+                    "low": close,
+                    "close": close,
+                    "volume": 1.0,
+                    "vwap": close,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def run(sizes: list[int], n_bars: int, top_k: int, workers: int, sample: int):
+    from analytics.adf import ADFTest, adf_on_array
+    from analytics.regression import HedgeRatioOLS
+    from analytics.resampler import TickResampler
+    from analytics.scanner import UniverseScanner, latest_scan, load_close_matrix
+    from storage.duckdb_manager import DuckDBManager
+
+    db = DuckDBManager()
+    TickResampler(db)
+    universe = [f"SYM{i:03d}USDT" for i in range(max(sizes))]
+    with db.write() as con:
+        con.append("bars_1m", factor_bars(n_bars, universe))
+
+    reg = HedgeRatioOLS("1m")
+
+    print(f"\nbars={n_bars}, top_k={top_k}, workers={workers}")
+    print(
+        f"{'symbols':>8} {'pairs':>7} {'load':>8} {'linalg':>8} {'adf':>8} "
+        f"{'total':>8} {'per-pair (est.)':>16}"
+    )
+
+    for n in sizes:
+        symbols = universe[:n]
+        scanner = UniverseScanner(symbols, "1m", n_bars, top_k, workers, db=db)
+        # Spawn workers (and their statsmodels import) outside the timings
+        list(scanner.pool.map(adf_on_array, [np.arange(50.0)] * workers))
+
+        t0 = time.perf_counter()
+        prices = load_close_matrix(symbols, "1m", n_bars, db=db)
+        t1 = time.perf_counter()
+        cands = scanner.candidates(prices)
+        t2 = time.perf_counter()
+        values = prices.to_numpy()
+        spreads = [
+            values[:, x] - b * values[:, y]
+            for x, y, b in zip(cands["x"], cands["y"], cands["beta"])
+        ]
+        list(scanner.pool.map(adf_on_array, spreads))
+        t3 = time.perf_counter()
+
+        t_scan = time.perf_counter()
+        ranked = scanner.scan()
+        t_scan = time.perf_counter() - t_scan
+
+        # Same fit as the /hedge-ratio route for the top pair
+        top = cands.iloc[0]
+        hr = reg.fit(
+            reg.load_pair_data(top["symbol_x"], top["symbol_y"]),
+            top["symbol_x"],
+            top["symbol_y"],
+        )
+        assert np.isclose(hr["beta"], top["beta"]) and np.isclose(hr["alpha"], top["alpha"])
+        assert np.isclose(hr["r2"], top["r2"])
+        assert len(latest_scan("1m", top_k, db=db)) == len(ranked)
+
+        # Per-pair path on a sample of pairs, extrapolated
+        i, j = np.triu_indices(n, k=1)
+        picks = np.random.default_rng(0).choice(len(i), min(sample, len(i)), replace=False)
+        t_naive = time.perf_counter()
+        for p in picks:
+            x, y = symbols[i[p]], symbols[j[p]]
+            data = reg.load_pair_data(x, y)
+            fit = reg.fit(data, x, y)
+            ADFTest().run((data[x] - fit["beta"] * data[y]).to_frame("spread"))
+        per_pair = (time.perf_counter() - t_naive) / len(picks)
+
+        print(
+            f"{n:>8} {len(i):>7} {(t1 - t0) * 1000:>6.1f}ms {(t2 - t1) * 1000:>6.1f}ms "
+            f"{(t3 - t2) * 1000:>6.1f}ms {t_scan * 1000:>6.1f}ms "
+            f"{per_pair * len(i):>14.1f}s"
+        )
+        scanner.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--bars", type=int, default=1440)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--sample", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before storage.duckdb_manager is imported
+        os.environ["QA_DB_FILE"] = str(Path(tmp) / "bench.duckdb")
+        run(args.symbols, args.bars, args.top_k, args.workers, args.sample)
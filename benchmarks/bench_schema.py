@@ -0,0 +1,171 @@
+"""
+Bar read latency on the legacy layout (no keys, bars interleaved across
+symbols by the old delete-then-append writers) vs after the schema
+migrations (PRIMARY KEY (symbol, timestamp), rows clustered by
+symbol, newest first).
+
+Ticks are generated inside DuckDB and resampled to 1m bars there, so
+10M+ ticks take seconds rather than minutes.
+
+    python -m benchmarks.bench_schema --ticks 10000000 --symbols 20 --days 60
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import duckdb
+import numpy as np
+
+# bars_* DDL before storage.migrations: no key, no ordering
+LEGACY_BARS_DDL = """
+CREATE TABLE bars_1m (
+    timestamp TIMESTAMP,
+    symbol VARCHAR,
+    open DOUBLE,
+    high DOUBLE,
+    low DOUBLE,
+    close DOUBLE,
+    volume DOUBLE,
+    vwap DOUBLE
+)
+"""
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def build_legacy(path: Path, n_ticks: int, n_symbols: int, days: int):
+    con = duckdb.connect(str(path))
+    con.execute("""
+    CREATE TABLE ticks (
+        timestamp TIMESTAMP,
+        symbol VARCHAR,
+        price DOUBLE,
+        qty DOUBLE
+    )
+    """)
+    span_s = days * 86_400
+    con.execute(f"""
+    INSERT INTO ticks
+    SELECT
+        TIMESTAMP '2024-01-01' + to_microseconds(CAST(i * {span_s * 1e6 / n_ticks} AS BIGINT)),
+        'SYM' || lpad(CAST(hash(i) % {n_symbols} AS VARCHAR), 2, '0') || 'USDT',
+        100 + (hash(i) % {n_symbols}) * 10 + sin(i / 5e4) * 5 + random(),
+        random()
+    FROM range({n_ticks}) t(i)
+    """)
+
+    # Bars land in arrival order (every symbol's minute, then the next
+    # minute), which is what repeated incremental upserts leave behind
+    con.execute(LEGACY_BARS_DDL)
+    con.execute("""
+    INSERT INTO bars_1m
+    SELECT
+        time_bucket(INTERVAL 1 MINUTE, timestamp) AS ts,
+        symbol,
+        arg_min(price, timestamp), MAX(price), MIN(price),
+        arg_max(price, timestamp), SUM(qty),
+        SUM(price * qty) / SUM(qty)
+    FROM ticks
+    GROUP BY ts, symbol
+    ORDER BY ts, hash(symbol)
+    """)
+    n_bars = con.execute("SELECT COUNT(*) FROM bars_1m").fetchone()[0]
+    con.close()
+    return n_bars
+
+
+def measure(db, symbols: list[str], lookback: int, repeat: int) -> dict:
+    from analytics.pair_data import load_pair
+
+    x, y = symbols[0], symbols[1]
+
+    def bars():
+        # /bars: newest 100 bars of one symbol
+        return db.con.execute(
+            """
+            SELECT * FROM bars_1m WHERE symbol = ?
+            ORDER BY timestamp DESC LIMIT 100
+            """,
+            [x],
+        ).fetchdf()
+
+    def bars_range():
+        # /bars?start=&end=: one day of one symbol
+        return db.con.execute(
+            """
+            SELECT * FROM bars_1m WHERE symbol = ?
+            AND timestamp >= TIMESTAMP '2024-01-10'
+            AND timestamp < TIMESTAMP '2024-01-11'
+            ORDER BY timestamp DESC
+            """,
+            [x],
+        ).fetchdf()
+
+    return {
+        "bars": timed(bars, repeat),
+        "bars_range": timed(bars_range, repeat),
+        "pair_full": timed(lambda: load_pair(x, y, db=db), repeat),
+        "pair_lookback": timed(
+            lambda: load_pair(x, y, lookback=lookback, db=db), repeat
+        ),
+        "checksum": load_pair(x, y, db=db).x.sum(),
+    }
+
+
+def run(n_ticks: int, n_symbols: int, days: int, lookback: int, repeat: int):
+    from storage.duckdb_manager import DuckDBManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "legacy.duckdb"
+
+        t0 = time.perf_counter()
+        n_bars = build_legacy(path, n_ticks, n_symbols, days)
+        print(
+            f"\nticks={n_ticks} symbols={n_symbols} days={days} "
+            f"bars_1m={n_bars} (built in {time.perf_counter() - t0:.1f}s)"
+        )
+
+        con = duckdb.connect(str(path))
+        symbols = [
+            r[0]
+            for r in con.execute(
+                "SELECT DISTINCT symbol FROM bars_1m ORDER BY symbol"
+            ).fetchall()
+        ]
+        before = measure(SimpleNamespace(con=con), symbols, lookback, repeat)
+        con.close()
+
+        # Opening through DuckDBManager applies the migrations
+        t0 = time.perf_counter()
+        db = DuckDBManager(path)
+        print(f"migration: {time.perf_counter() - t0:.1f}s")
+        after = measure(db, symbols, lookback, repeat)
+
+        # Same rows either way
+        assert np.isclose(before.pop("checksum"), after.pop("checksum"))
+
+        print(f"\nlatency in ms (best of {repeat})")
+        print(f"{'query':>16} {'legacy':>9} {'keyed':>9}")
+        for name in before:
+            print(f"{name:>16} {before[name]:>9.2f} {after[name]:>9.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=10_000_000)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--lookback", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.ticks, args.symbols, args.days, args.lookback, args.repeat)
@@ -0,0 +1,118 @@
+"""
+Streaming rolling z-score / correlation vs pandas rolling windows.
+
+Reports numerical drift against pandas and an exact two-pass reference
+over a long random-walk series at realistic price levels (the bounds are
+asserted in tests/test_streaming_stats.py), then times one O(1) bar
+update against the per-request pandas recompute over the full history.
+
+    python -m benchmarks.bench_streaming_stats --bars 200000 --windows 20 100 1000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from analytics.stats import (
+    RollingCorrelationCalculator,
+    StreamingCorrelation,
+    StreamingZScore,
+    ZScoreCalculator,
+)
+
+
+def synthetic_prices(n: int, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    y = 3000 + np.cumsum(rng.normal(0, 1.5, n))
+    x = 60000 + 18 * (y - 3000) + np.cumsum(rng.normal(0, 20, n))
+    index = pd.date_range("2024-01-01", periods=n, freq="1s", name="timestamp")
+    return pd.DataFrame({"X": x, "Y": y}, index=index)
+
+
+def report_drift(prices: pd.DataFrame, window: int):
+    spread = prices["X"] - 18 * prices["Y"]
+
+    zs = StreamingZScore(window=window, history=len(prices))
+    rc = StreamingCorrelation(window=window, history=len(prices))
+    for ts, x, y, s in zip(prices.index, prices["X"].tolist(), prices["Y"].tolist(), spread.tolist()):
+        zs.update(ts, s)
+        rc.update(ts, x, y)
+
+    ref_z = ZScoreCalculator(window).compute(spread.to_frame("spread"))["zscore"].dropna()
+    ref_c = RollingCorrelationCalculator(window).compute(prices, "X", "Y")["rolling_corr"].dropna()
+
+    got_z = zs.to_frame()["zscore"]
+    got_c = rc.to_frame()["rolling_corr"]
+
+    err_z = np.max(np.abs(got_z.to_numpy() - ref_z.to_numpy()))
+    err_c = np.max(np.abs(got_c.to_numpy() - ref_c.to_numpy()))
+
+    # Exact two-pass reference on the tail, where drift would accumulate
+    # (pandas' own rolling sums drift too, so it is not the ground truth)
+    tail = 5_000
+    sw = sliding_window_view(spread.to_numpy()[-(tail + window - 1):], window)
+    exact_z = (sw[:, -1] - sw.mean(1)) / sw.std(1, ddof=1)
+    xw = sliding_window_view(prices["X"].to_numpy()[-(tail + window - 1):], window)
+    yw = sliding_window_view(prices["Y"].to_numpy()[-(tail + window - 1):], window)
+    dx = xw - xw.mean(1, keepdims=True)
+    dy = yw - yw.mean(1, keepdims=True)
+    exact_c = (dx * dy).sum(1) / np.sqrt((dx * dx).sum(1) * (dy * dy).sum(1))
+
+    tail_z = np.max(np.abs(got_z.to_numpy()[-tail:] - exact_z))
+    tail_c = np.max(np.abs(got_c.to_numpy()[-tail:] - exact_c))
+    pandas_z = np.max(np.abs(ref_z.to_numpy()[-tail:] - exact_z))
+
+    print(
+        f"window={window:>5}: vs pandas |Δz|={err_z:.1e} |Δcorr|={err_c:.1e}; "
+        f"tail vs exact |Δz|={tail_z:.1e} |Δcorr|={tail_c:.1e} "
+        f"(pandas |Δz|={pandas_z:.1e})"
+    )
+
+
+def time_update(prices: pd.DataFrame, window: int, history: int):
+    hist = prices.iloc[-history:]
+    spread = hist["X"] - 18 * hist["Y"]
+
+    zs = StreamingZScore(window=window)
+    rc = StreamingCorrelation(window=window)
+    for ts, x, y, s in zip(hist.index, hist["X"].tolist(), hist["Y"].tolist(), spread.tolist()):
+        zs.update(ts, s)
+        rc.update(ts, x, y)
+
+    ts, x, y = hist.index[-1], float(hist["X"].iloc[-1]), float(hist["Y"].iloc[-1])
+    reps = 10_000
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        zs.update(ts, x - 18 * y)
+        rc.update(ts, x, y)
+    stream_us = (time.perf_counter() - t0) / reps * 1e6
+
+    reps = 20
+    spread_df = spread.to_frame("spread")
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        ZScoreCalculator(window).compute(spread_df)
+        RollingCorrelationCalculator(window).compute(hist, "X", "Y")
+    pandas_us = (time.perf_counter() - t0) / reps * 1e6
+
+    print(
+        f"window={window:>5} history={history}: streaming {stream_us:.1f}µs/bar "
+        f"vs pandas recompute {pandas_us:,.0f}µs"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bars", type=int, default=200_000)
+    parser.add_argument("--windows", type=int, nargs="+", default=[20, 100, 1000])
+    parser.add_argument("--history", type=int, default=10_000)
+    args = parser.parse_args()
+
+    prices = synthetic_prices(args.bars)
+    print(f"\nbars={args.bars}")
+    for w in args.windows:
+        report_drift(prices, w)
+    for w in args.windows:
+        time_update(prices, w, args.history)
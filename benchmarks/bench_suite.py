@@ -0,0 +1,347 @@
+"""
+Whole-pipeline benchmark on synthetic cointegrated ticks: generation,
+ingest (write_batch → DuckDBManager.insert_ticks) rows/sec, full and
+incremental TickResampler runs per timeframe, HedgeRatioOLS, per-route
+latency percentiles (result cache cleared = cold, then warm) and process
+memory after each stage. Runs offline against a temporary database and
+writes everything to one JSON file; --compare prints the change against
+an earlier run.
+
+    python -m benchmarks.bench_suite --symbols 4 --days 1 --rate 5
+    python -m benchmarks.bench_suite --out new.json --compare old.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+TIMEFRAMES = ("1s", "1m", "5m")
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def memory_mb() -> dict:
+    """
+    Current and peak resident set size of this process
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak /= 1024**2 if sys.platform == "darwin" else 1024  # bytes vs KiB
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        rss = pages * os.sysconf("SC_PAGE_SIZE") / 1024**2
+    except OSError:
+        rss = None
+    return {"rss_mb": rss, "peak_rss_mb": peak}
+
+
+def percentiles(samples_s: list[float]) -> dict:
+    ms = np.asarray(samples_s) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "n": len(ms),
+        "mean_ms": ms.mean(),
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+        "max_ms": ms.max(),
+    }
+
+
+def stage(results: dict, name: str, fn):
+    """
+    Run one stage, record its wall time and memory afterwards
+    """
+    print(f"[SUITE] {name} ...")
+    t0 = time.perf_counter()
+    out = fn()
+    results[name] = {
+        **out,
+        "seconds": time.perf_counter() - t0,
+        "memory": memory_mb(),
+    }
+
+
+def environment() -> dict:
+    import duckdb
+    import pandas as pd
+    import statsmodels
+
+    try:
+        commit = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "duckdb": duckdb.__version__,
+        "statsmodels": statsmodels.__version__,
+    }
+
+
+def run(args) -> dict:
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from analytics.cache import pair_cache
+    from analytics.regression import HedgeRatioOLS
+    from analytics.resampler import TickResampler
+    from api.routes import router
+    from benchmarks.synthetic import generate_market
+    from storage.duckdb_manager import DB_FILE, DuckDBManager
+    from storage.tick_writer import write_batch
+
+    symbols = tuple(f"SYM{i:03d}USDT" for i in range(args.symbols))
+    sym_x, sym_y = symbols[:2]
+    results = {}
+    state = {}
+
+    # 1️⃣ Synthetic market
+    def generate():
+        ticks = generate_market(symbols, args.days, args.rate, seed=args.seed)
+        state["ticks"] = ticks
+        return {"ticks": len(ticks)}
+
+    stage(results, "generate", generate)
+    ticks = state["ticks"]
+    results["generate"]["ticks_per_sec"] = (
+        len(ticks) / results["generate"]["seconds"]
+    )
+
+    # Last `tail` seconds are held back for the incremental resample
+    cutoff = ticks["timestamp"].iloc[-1] - np.timedelta64(args.tail, "s")
+    head, tail = ticks[ticks["timestamp"] <= cutoff], ticks[ticks["timestamp"] > cutoff]
+
+    db = DuckDBManager()
+    resampler = TickResampler(db)
+
+    # 2️⃣ Ingest in writer-sized batches
+    def ingest():
+        flushes = []
+        for i in range(0, len(head), args.batch):
+            t0 = time.perf_counter()
+            write_batch(db, head.iloc[i : i + args.batch])
+            flushes.append(time.perf_counter() - t0)
+        total = sum(flushes)
+        return {
+            "rows": len(head),
+            "batch": args.batch,
+            "rows_per_sec": len(head) / total,
+            "flush": percentiles(flushes),
+        }
+
+    stage(results, "ingest", ingest)
+
+    # 3️⃣ Full rebuild per symbol, then one incremental cycle on the tail
+    def resample():
+        out = {}
+        for tf in TIMEFRAMES:
+            t0 = time.perf_counter()
+            for symbol in symbols:
+                resampler.resample(symbol, tf)
+            out[tf] = {"full_s": time.perf_counter() - t0}
+
+        write_batch(db, tail)
+        for tf in TIMEFRAMES:
+            t0 = time.perf_counter()
+            for symbol in symbols:
+                resampler.resample(symbol, tf, incremental=True)
+            out[tf]["incremental_ms"] = (time.perf_counter() - t0) * 1000
+            out[tf]["bars"] = db.con.execute(
+                f"SELECT COUNT(*) FROM bars_{tf}"
+            ).fetchone()[0]
+        return out
+
+    stage(results, "resample", resample)
+
+    # 4️⃣ Hedge ratio: aligned load + sm.OLS fit, and the fit alone
+    def hedge_ratio():
+        hr = HedgeRatioOLS(timeframe="1m")
+        data = hr.load_pair_data(sym_x, sym_y)
+        load_fit, fit, rolling = [], [], []
+        for _ in range(args.requests):
+            pair_cache.clear()
+            t0 = time.perf_counter()
+            hr.compute(sym_x, sym_y)
+            load_fit.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            hr.fit(data, sym_x, sym_y)
+            fit.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            hr.fit_series(data, sym_x, sym_y, window=120)
+            rolling.append(time.perf_counter() - t0)
+        return {
+            "bars": len(data),
+            "load_fit": percentiles(load_fit),
+            "fit": percentiles(fit),
+            "rolling_fit": percentiles(rolling),
+        }
+
+    stage(results, "hedge_ratio", hedge_ratio)
+
+    # 5️⃣ Routes: cold (result cache cleared before every call), then warm
+    app = FastAPI()
+    app.include_router(router)
+    # Server errors come back as 500 responses and are reported per route
+    client = TestClient(app, raise_server_exceptions=False)
+    pair = {"symbol_x": sym_x, "symbol_y": sym_y, "timeframe": "1m"}
+    endpoints = {
+        "/bars": {"symbol": sym_x, "timeframe": "1m", "limit": 1000},
+        "/hedge-ratio": pair,
+        "/spread": pair,
+        "/zscore": pair,
+        "/correlation": pair,
+        "/alerts": pair,
+        "/pair-analytics": pair,
+        "/adf-test": {**pair, "lookback": 1440},
+        "/backtest": {**pair, "windows": "20,60", "z_thresholds": "1.5,2"},
+    }
+
+    def sample(path: str, params: dict):
+        """
+        Cold and warm timings of one route, or None after a non-200
+        """
+        timings = {"cold": [], "warm": []}
+        for mode, samples in timings.items():
+            for _ in range(args.requests):
+                if mode == "cold":
+                    pair_cache.clear()
+                t0 = time.perf_counter()
+                r = client.get(path, params=params)
+                samples.append(time.perf_counter() - t0)
+                if r.status_code != 200:
+                    return r, None
+        return r, timings
+
+    def routes():
+        out = {}
+        for path, params in endpoints.items():
+            r, timings = sample(path, params)
+            if timings is None:
+                # Reported, and the remaining routes still run
+                print(f"[SUITE] {path} failed: HTTP {r.status_code} {r.text[:200]}")
+                out[path] = {"error": f"HTTP {r.status_code}: {r.text[:200]}"}
+                continue
+            out[path] = {
+                "bytes": len(r.content),
+                **{mode: percentiles(s) for mode, s in timings.items()},
+            }
+        return out
+
+    stage(results, "endpoints", routes)
+
+    results["db_file_mb"] = Path(DB_FILE).stat().st_size / 1024**2
+    return results
+
+
+def flatten(tree: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in tree.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(new: dict, old: dict):
+    """
+    Side-by-side of every metric present in both runs
+    """
+    if new["config"] != old["config"]:
+        print("\n⚠️ different configs, numbers are not directly comparable")
+        print(f"  old: {old['config']}\n  new: {new['config']}")
+
+    a, b = flatten(old["results"]), flatten(new["results"])
+    print(f"\n{'metric':<48} {'old':>12} {'new':>12} {'change':>8}")
+    for key in [k for k in b if k in a]:
+        change = f"{(b[key] / a[key] - 1) * 100:+7.1f}%" if a[key] else "     n/a"
+        print(f"{key:<48} {a[key]:>12.3f} {b[key]:>12.3f} {change}")
+
+
+def summary(results: dict):
+    print(f"\nticks={results['generate']['ticks']:,}")
+    print(f"ingest:      {results['ingest']['rows_per_sec']:>14,.0f} rows/s")
+    for tf in TIMEFRAMES:
+        r = results["resample"][tf]
+        print(
+            f"resample {tf}: full={r['full_s']:.2f}s "
+            f"incremental={r['incremental_ms']:.1f}ms bars={r['bars']:,}"
+        )
+    hr = results["hedge_ratio"]
+    print(
+        f"hedge ratio: load+fit p50={hr['load_fit']['p50_ms']:.1f}ms "
+        f"fit p50={hr['fit']['p50_ms']:.1f}ms"
+    )
+    print(f"\n{'route':<16} {'cold p50':>10} {'p95':>9} {'p99':>9} {'warm p50':>10}")
+    for path, r in results["endpoints"].items():
+        if path.startswith("/") and "error" in r:
+            print(f"{path:<16} failed: {r['error']}")
+        elif path.startswith("/"):
+            cold, warm = r["cold"], r["warm"]
+            print(
+                f"{path:<16} {cold['p50_ms']:>8.1f}ms {cold['p95_ms']:>7.1f}ms "
+                f"{cold['p99_ms']:>7.1f}ms {warm['p50_ms']:>8.1f}ms"
+            )
+    print(
+        f"\npeak RSS={results['endpoints']['memory']['peak_rss_mb']:.0f}MB "
+        f"db={results['db_file_mb']:.0f}MB"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=4)
+    parser.add_argument("--days", type=float, default=1.0)
+    parser.add_argument("--rate", type=float, default=5.0, help="trades/sec per symbol")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=5_000, help="rows per writer flush")
+    parser.add_argument("--tail", type=int, default=60, help="seconds left for the incremental resample")
+    parser.add_argument("--requests", type=int, default=20, help="calls per route and mode")
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--compare", type=Path)
+    args = parser.parse_args()
+
+    if args.symbols < 2:
+        parser.error("--symbols must be >= 2")
+
+    config = {k: v for k, v in vars(args).items() if k not in ("out", "compare")}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before storage.duckdb_manager is imported
+        os.environ["QA_DB_FILE"] = str(Path(tmp) / "bench.duckdb")
+        report = {"environment": environment(), "config": config, "results": run(args)}
+
+    summary(report["results"])
+
+    env = report["environment"]
+    tag = env["commit"] or env["timestamp"].replace(":", "")
+    out = args.out or RESULTS_DIR / f"suite-{tag}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2, default=float))
+    print(f"\nwritten to {out}")
+
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text()))
@@ -0,0 +1,88 @@
+"""
+Tick hand-off throughput: a producer pushes trades into the hot buffer
+at a target rate while flush_ticks drains them into DuckDB.
+
+Checks that every produced tick lands in the table, including after
+the ring buffer has wrapped many times.
+
+    python -m benchmarks.bench_tick_writer --rate 20000 --seconds 10
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import generate_ticks
+from storage.duckdb_manager import DuckDBManager
+from storage.hot_buffer import TickBuffer
+from storage.tick_writer import flush_ticks, writer_stats
+
+
+async def produce(buffer: TickBuffer, ticks: list[dict], rate: int):
+    step = max(1, rate // 1_000)  # burst every ~1ms
+    t0 = time.perf_counter()
+
+    for i in range(0, len(ticks), step):
+        for tick in ticks[i:i + step]:
+            buffer.add_tick(tick)
+
+        # Pace to target rate
+        ahead = (i + step) / rate - (time.perf_counter() - t0)
+        await asyncio.sleep(max(0.0, ahead))
+
+
+async def drain(buffer, db, cursors, done: asyncio.Event, interval: float):
+    flush_ms = []
+    while True:
+        flush_ticks(buffer, db, cursors)
+        flush_ms.append(writer_stats["last_flush_ms"])
+        if done.is_set():
+            flush_ticks(buffer, db, cursors)
+            return flush_ms
+        await asyncio.sleep(interval)
+
+
+async def run(rate: int, seconds: int, maxlen: int, interval: float):
+    n = rate * seconds
+    df = generate_ticks(n_ticks=n, trades_per_sec=rate)
+    df["timestamp"] = df["timestamp"].map(lambda t: t.isoformat())
+    ticks = df.to_dict(orient="records")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DuckDBManager(Path(tmp) / "bench.duckdb")
+        buffer = TickBuffer(maxlen=maxlen)
+        cursors: dict[str, int] = {}
+        done = asyncio.Event()
+
+        writer = asyncio.create_task(
+            drain(buffer, db, cursors, done, interval)
+        )
+
+        t0 = time.perf_counter()
+        await produce(buffer, ticks, rate)
+        done.set()
+        flush_ms = await writer
+        elapsed = time.perf_counter() - t0
+
+        stored = db.con.execute("SELECT COUNT(*) FROM ticks").fetchone()[0]
+
+    flush_ms.sort()
+    print(f"\ntarget={rate}/s maxlen={maxlen} flush_interval={interval}s")
+    print(f"produced={n} stored={stored} dropped={writer_stats['dropped']}")
+    print(f"throughput={stored / elapsed:,.0f} ticks/s")
+    print(
+        f"flush latency p50={flush_ms[len(flush_ms) // 2]:.1f}ms "
+        f"max={flush_ms[-1]:.1f}ms over {len(flush_ms)} flushes"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=int, default=10_000)
+    parser.add_argument("--seconds", type=int, default=5)
+    parser.add_argument("--maxlen", type=int, default=10_000)
+    parser.add_argument("--interval", type=float, default=0.25)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.rate, args.seconds, args.maxlen, args.interval))
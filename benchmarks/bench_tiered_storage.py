@@ -0,0 +1,93 @@
+"""
+Tick query latency vs history size: everything in the DuckDB `ticks`
+table vs hot DuckDB (last day) + Hive-partitioned Parquet cold tier.
+
+    python -m benchmarks.bench_tiered_storage --days 2 8 32 --ticks-per-day 50000
+"""
+import argparse
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def run_case(days: int, ticks_per_day: int, tiered: bool, tmp: Path, repeat: int):
+    from benchmarks.synthetic import generate_ticks
+    from storage.duckdb_manager import DuckDBManager
+    from storage.tiered_storage import TickArchive
+
+    name = f"{'tiered' if tiered else 'single'}-{days}d"
+    db = DuckDBManager(tmp / f"{name}.duckdb")
+    ticks = generate_ticks(
+        n_ticks=days * ticks_per_day, trades_per_sec=ticks_per_day / 86_400
+    )
+    db.insert_ticks(ticks)
+    last = ticks["timestamp"].iloc[-1]
+
+    if tiered:
+        archive = TickArchive(db, root=tmp / f"{name}-cold", hot_days=1)
+        archive.run_jobs(now=last.floor("s").to_pydatetime())
+
+    since = last - timedelta(minutes=5)
+
+    def recent():
+        return db.get_recent_ticks("BTCUSDT", 100)
+
+    def incremental():
+        # What the incremental resampler reads
+        return db.con.execute(
+            f"""
+            SELECT timestamp, price, qty FROM {db.tick_source(since)}
+            WHERE symbol = ? AND timestamp >= ? ORDER BY timestamp
+            """,
+            ["BTCUSDT", since],
+        ).fetchdf()
+
+    def full_history():
+        return db.con.execute(
+            f"""
+            SELECT COUNT(*), AVG(price) FROM {db.tick_source()}
+            WHERE symbol = ?
+            """,
+            ["BTCUSDT"],
+        ).fetchone()
+
+    hot_rows = db.con.execute("SELECT COUNT(*) FROM ticks").fetchone()[0]
+    assert full_history()[0] == (ticks["symbol"] == "BTCUSDT").sum()
+
+    return {
+        "case": name,
+        "hot_rows": hot_rows,
+        "recent": timed(recent, repeat),
+        "incremental": timed(incremental, repeat),
+        "full": timed(full_history, repeat),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, nargs="+", default=[2, 8, 32])
+    parser.add_argument("--ticks-per-day", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"\nticks/day={args.ticks_per_day}; latency in ms (best of {args.repeat})")
+    print(f"{'case':>12} {'hot rows':>10} {'recent':>8} {'incr':>8} {'full':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for days in args.days:
+            for tiered in (False, True):
+                r = run_case(days, args.ticks_per_day, tiered, Path(tmp), args.repeat)
+                print(
+                    f"{r['case']:>12} {r['hot_rows']:>10} {r['recent']:>8.2f} "
+                    f"{r['incremental']:>8.2f} {r['full']:>8.2f}"
+                )
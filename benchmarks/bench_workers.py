@@ -0,0 +1,75 @@
+"""
+Multi-process ingestion throughput vs worker count.
+
+Each worker process replays its shard of pre-encoded trade messages
+through handle_message → hot buffer → bar builder and publishes batches
+over the queue; this process drains the queue into DuckDB exactly like
+queue_writer_loop does.
+
+    python -m benchmarks.bench_workers --symbols 100 --messages 400000 --workers 1 2 4
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.replay_worker import replay_worker
+from ingestion.workers import start_ingest_workers, stop_ingest_workers
+
+
+def run_case(symbols: list[str], n_messages: int, n_workers: int, db_file: Path):
+    # Imported here, not at module level: spawned workers re-import this
+    # module and must never open DuckDB
+    from analytics.resampler import TickResampler
+    from storage.duckdb_manager import DuckDBManager
+    from storage.queue_writer import drain_queue, write_batches
+
+    db = DuckDBManager(db_file)
+    resampler = TickResampler(db)
+
+    per_worker = n_messages // n_workers
+    t0 = time.perf_counter()
+    processes, queue = start_ingest_workers(
+        symbols,
+        n_workers,
+        target=replay_worker,
+        args=(per_worker, 5_000),
+    )
+
+    done, rows = 0, 0
+    while done < len(processes):
+        batches = drain_queue(queue)
+        if not batches:
+            if not any(p.is_alive() for p in processes):
+                raise RuntimeError("ingest workers exited early")
+            time.sleep(0.01)
+            continue
+
+        done += sum(1 for b in batches if "done" in b)
+        data = [b for b in batches if "done" not in b]
+        if data:
+            rows += write_batches(data, db, resampler)
+
+    elapsed = time.perf_counter() - t0
+    stop_ingest_workers(processes)
+
+    print(
+        f"workers={n_workers}: rows={rows} in {elapsed:.2f}s → "
+        f"{rows / elapsed:,.0f} ticks/s (incl. process start-up)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=400_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    symbols = [f"SYM{i:03d}USDT" for i in range(args.symbols)]
+    print(f"\ncpu_count={os.cpu_count()} symbols={args.symbols} messages={args.messages}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for w in args.workers:
+            run_case(symbols, args.messages, w, Path(tmp) / f"w{w}.duckdb")
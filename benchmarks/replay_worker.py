@@ -0,0 +1,33 @@
+"""
+Ingest worker that replays pre-encoded trades instead of connecting to
+Binance. Lives in its own module because spawned worker processes
+import it, and it must not open DuckDB.
+"""
+import time
+
+from ingestion import binance_ws
+from ingestion.workers import collect_batch
+
+
+def replay_worker(symbols: list[str], queue, n_messages: int, publish_every: int):
+    # Imported here so the parent does not pay for it twice
+    from benchmarks.bench_ingestion import encode_trades
+
+    per_symbol = encode_trades(symbols, n_messages)
+    messages = [m for batch in per_symbol.values() for m in batch]
+
+    cursors: dict[str, int] = {}
+    t0 = time.perf_counter()
+
+    for i, message in enumerate(messages, 1):
+        binance_ws.handle_message(message)
+        if i % publish_every == 0:
+            batch = collect_batch(cursors)
+            if batch is not None:
+                queue.put(batch)
+
+    batch = collect_batch(cursors)
+    if batch is not None:
+        queue.put(batch)
+
+    queue.put({"done": time.perf_counter() - t0})
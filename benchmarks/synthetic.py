@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+
+def generate_market(
+    symbols: tuple[str, ...] = ("BTCUSDT", "ETHUSDT"),
+    days: float = 1.0,
+    trades_per_sec: float = 5.0,
+    start: str = "2024-01-01",
+    seed: int = 42,
+    n_ticks: int | None = None,
+) -> pd.DataFrame:
+    """
+    Generate `days` of cointegrated ticks for any number of symbols.
+
+    Every symbol trades as its own Poisson process at `trades_per_sec`.
+    Prices load on one random-walk factor (last symbol = the factor, the
+    others a random multiple of it) plus per-symbol AR(1) noise, so every
+    pair is cointegrated. With `n_ticks` exactly that many ticks are drawn
+    and `days` is ignored. Returns columns matching the `ticks` table,
+    sorted by timestamp.
+    """
+    rng = np.random.default_rng(seed)
+    rate = trades_per_sec * len(symbols)
+    if n_ticks is None:
+        seconds = days * 86_400
+        n_ticks = rng.poisson(seconds * rate)
+    else:
+        seconds = n_ticks / rate
+
+    # Poisson arrivals = uniform times, sorted
+    t = np.sort(rng.random(n_ticks) * seconds)
+    sym = rng.integers(0, len(symbols), n_ticks)
+
+    # Factor: random walk in time (~0.2 per sqrt(second))
+    dt = np.diff(t, prepend=0.0)
+    factor = 2_000.0 + np.cumsum(rng.normal(0, 0.2, n_ticks) * np.sqrt(dt))
+
+    betas = rng.uniform(2.0, 20.0, len(symbols))
+    betas[-1] = 1.0
+    price = betas[sym] * factor
+
+    # Mean-reverting noise on each symbol's own trades
+    for i, beta in enumerate(betas):
+        mask = sym == i
+        shocks = rng.normal(0, 0.5 * np.sqrt(beta), mask.sum())
+        price[mask] += lfilter([1.0], [1.0, -0.995], shocks)
+
+    ts = pd.Timestamp(start).value + (t * 1e9).astype("int64")
+
+    return pd.DataFrame(
+        {
+            "timestamp": ts.view("datetime64[ns]"),
+            "symbol": np.asarray(symbols, dtype=object)[sym],
+            "price": price,
+            "qty": rng.exponential(0.5, n_ticks),
+        }
+    )
+
+
+def generate_ticks(
+    symbols: tuple[str, ...] = ("BTCUSDT", "ETHUSDT"),
+    n_ticks: int = 100_000,
+    start: str = "2024-01-01",
+    trades_per_sec: float = 20.0,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """
+    generate_market sized by tick count: exactly `n_ticks` ticks, with
+    `trades_per_sec` across all symbols
+    """
+    return generate_market(
+        symbols,
+        trades_per_sec=trades_per_sec / len(symbols),
+        start=start,
+        seed=seed,
+        n_ticks=n_ticks,
+    )
@@ -1,8 +1,12 @@
+import json
+import threading
+import time
+from collections import deque
+
 import streamlit as st
 import requests
 import pandas as pd
 import plotly.graph_objects as go
-from streamlit.runtime.scriptrunner import add_script_run_ctx
 from streamlit_autorefresh import st_autorefresh
 
 
@@ -13,8 +17,9 @@ st.set_page_config(
     layout="wide",
 )
 
-# Auto-refresh every 5 seconds
-st_autorefresh(interval=5000, key="data_refresh")
+# Re-render every second from the local stream buffer (no HTTP calls;
+# new data arrives over /stream/pair in the background)
+st_autorefresh(interval=1000, key="data_refresh")
 
 
 st.title("📊 Quant Analytics – Stat Arb Monitor")
@@ -26,96 +31,158 @@ symbol_x = st.sidebar.selectbox("Symbol X", ["BTCUSDT"])
 symbol_y = st.sidebar.selectbox("Symbol Y", ["ETHUSDT"])
 
 timeframe = st.sidebar.selectbox("Timeframe", ["1m", "5m"])
-window = st.sidebar.slider("Rolling Window", 1, 50, 20)
+window = st.sidebar.slider("Rolling Window", 2, 50, 20)
 
 z_threshold = st.sidebar.slider("Z-Score Threshold", 1.0, 3.0, 2.0)
 corr_threshold = st.sidebar.slider("Correlation Threshold", 0.5, 0.9, 0.7)
 
-# ---------------- Helper ----------------
-def fetch(endpoint, params=None):
-    r = requests.get(f"{API_URL}{endpoint}", params=params)
-    r.raise_for_status()
-    return pd.DataFrame(r.json())
+# ---------------- Stream Client ----------------
+class PairStream:
+    """
+    Background subscriber to /stream/pair: keeps the snapshot and appends
+    every pushed delta. Disconnects after `idle_timeout` seconds without
+    a reader and reconnects (fresh snapshot) on the next read.
+    """
+
+    def __init__(self, params: dict, history: int = 500, idle_timeout: float = 60):
+        self.params = {**params, "history": history}
+        self.idle_timeout = idle_timeout
+        self.points: deque = deque(maxlen=history)
+        self.bars: deque = deque(maxlen=2 * history)
+        self.alerts: deque = deque(maxlen=history)
+        self.active = None
+        self.connected = False
+        self.last_read = time.monotonic()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def ensure_running(self):
+        self.last_read = time.monotonic()
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _idle(self) -> bool:
+        return time.monotonic() - self.last_read > self.idle_timeout
+
+    def _run(self):
+        while not self._idle():
+            try:
+                with requests.get(
+                    f"{API_URL}/stream/pair",
+                    params=self.params,
+                    stream=True,
+                    timeout=(5, 60),
+                ) as r:
+                    r.raise_for_status()
+                    self.connected = True
+                    for event, data in self._events(r):
+                        self._apply(event, data)
+                        if self._idle():
+                            return
+            except requests.RequestException as e:
+                print(f"[STREAM] {e}")
+            finally:
+                self.connected = False
+            time.sleep(2)
+
+    @staticmethod
+    def _events(response):
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                yield event, json.loads(line[5:])
+
+    def _apply(self, event: str, data: dict):
+        with self.lock:
+            if event == "snapshot":
+                self.points.clear()
+                self.bars.clear()
+                self.alerts.clear()
+            self.points.extend(data["points"])
+            self.bars.extend(data["bars"])
+            self.alerts.extend(data["alerts"])
+            self.active = data["active"]
+
+    def frames(self):
+        with self.lock:
+            points = pd.DataFrame(list(self.points))
+            bars = pd.DataFrame(list(self.bars))
+            return points, bars, list(self.alerts), self.active
+
+
+@st.cache_resource(max_entries=16)
+def get_stream(symbol_x, symbol_y, timeframe, window, z_threshold, corr_threshold):
+    # One connection per parameter set, shared by every browser session
+    return PairStream(
+        {
+            "symbol_x": symbol_x,
+            "symbol_y": symbol_y,
+            "timeframe": timeframe,
+            "window": window,
+            "z_threshold": z_threshold,
+            "corr_threshold": corr_threshold,
+        }
+    )
 
-# ---------------- Hedge Ratio ----------------
-st.subheader("📐 Hedge Ratio (OLS)")
 
-hr = requests.get(
-    f"{API_URL}/hedge-ratio",
-    params={
-        "symbol_x": symbol_x,
-        "symbol_y": symbol_y,
-        "timeframe": timeframe,
-    },
-).json()
+stream = get_stream(symbol_x, symbol_y, timeframe, window, z_threshold, corr_threshold)
+stream.ensure_running()
+points_df, bars_df, alert_events, active = stream.frames()
 
-st.json(hr)
+if points_df.empty:
+    st.info("Waiting for the first closed bars…" if stream.connected else "Connecting to stream…")
+    st.stop()
 
-# ---------------- Spread & Z-score ----------------
-st.subheader("📉 Spread & Z-Score")
+points_df["timestamp"] = pd.to_datetime(points_df["timestamp"])
 
-spread_df = fetch(
-    "/spread",
-    {
-        "symbol_x": symbol_x,
-        "symbol_y": symbol_y,
-        "timeframe": timeframe,
-    },
-)
+# ---------------- Hedge Ratio ----------------
+st.subheader("📐 Hedge Ratio (OLS)")
 
-z_df = fetch(
-    "/zscore",
+latest = points_df.iloc[-1]
+st.json(
     {
-        "symbol_x": symbol_x,
-        "symbol_y": symbol_y,
-        "timeframe": timeframe,
-        "window": window,
-    },
+        "alpha": latest["alpha"],
+        "beta": latest["beta"],
+        "timestamp": str(latest["timestamp"]),
+    }
 )
 
-# Ensure timestamp exists
-if "timestamp" not in spread_df.columns:
-    spread_df = spread_df.reset_index()
+# ---------------- Prices ----------------
+st.subheader("💹 Closed Bars")
 
-if z_df.empty or "timestamp" not in z_df.columns:
-    merged = spread_df.copy()
-    merged["zscore"] = None
-    st.warning("Not enough data yet to compute Z-score.")
-else:
-    merged = pd.merge(
-        spread_df,
-        z_df,
-        on="timestamp",
-        how="left",
+if not bars_df.empty:
+    st.line_chart(
+        bars_df.assign(timestamp=pd.to_datetime(bars_df["timestamp"]))
+        .pivot(index="timestamp", columns="symbol", values="close")
     )
 
+# ---------------- Spread & Z-score ----------------
+st.subheader("📉 Spread & Z-Score")
 
-fig = go.Figure()
+merged = points_df[["timestamp", "spread", "zscore"]]
 
-# --- Identify spread column safely ---
-spread_col = None
-for col in merged.columns:
-    if col.lower().startswith("spread"):
-        spread_col = col
-        break
+if merged["zscore"].isna().all():
+    st.warning("Not enough data yet to compute Z-score.")
 
-if spread_col is None:
-    st.error("Spread data not available yet.")
-else:
-    fig.add_trace(
-        go.Scatter(
-            x=merged["timestamp"],
-            y=merged[spread_col],
-            name="Spread",
-            line=dict(color="blue"),
-        )
-    )
 
+fig = go.Figure()
 
 fig.add_trace(
     go.Scatter(
         x=merged["timestamp"],
-        y=merged.get("zscore"),
+        y=merged["spread"],
+        name="Spread",
+        line=dict(color="blue"),
+    )
+)
+
+fig.add_trace(
+    go.Scatter(
+        x=merged["timestamp"],
+        y=merged["zscore"],
         name="Z-Score",
         yaxis="y2",
         line=dict(color="red"),
@@ -137,17 +204,9 @@ st.plotly_chart(fig, use_container_width=True)
 # ---------------- Rolling Correlation ----------------
 st.subheader("🔗 Rolling Correlation")
 
-corr_df = fetch(
-    "/correlation",
-    {
-        "symbol_x": symbol_x,
-        "symbol_y": symbol_y,
-        "timeframe": timeframe,
-        "window": window,
-    },
-)
+corr_df = points_df[["timestamp", "rolling_corr"]].dropna()
 
-if corr_df.empty or "timestamp" not in corr_df.columns:
+if corr_df.empty:
     st.warning("Not enough data yet to compute rolling correlation.")
 else:
     st.line_chart(corr_df.set_index("timestamp"))
@@ -156,24 +215,14 @@ else:
 # ---------------- Alerts ----------------
 st.subheader("🚨 Alerts")
 
-alerts = requests.get(
-    f"{API_URL}/alerts",
-    params={
-        "symbol_x": symbol_x,
-        "symbol_y": symbol_y,
-        "timeframe": timeframe,
-        "window": window,
-        "z_threshold": z_threshold,
-        "corr_threshold": corr_threshold,
-    },
-).json()
-
-if alerts:
-    st.error("⚠️ Active Alerts")
-    st.json(alerts)
+if active:
+    st.error(f"⚠️ Active: {active}")
 else:
     st.success("✅ No active alerts")
 
+if alert_events:
+    st.dataframe(pd.DataFrame(alert_events[::-1]))
+
 
 
 st.subheader("📉 ADF Test (Spread Stationarity)")
@@ -190,7 +239,7 @@ if st.button("Run ADF Test"):
             "symbol_y": symbol_y,
             "timeframe": timeframe,
         },
-        timeout=10,
+        timeout=3,
     ).json()
 
 # Show persisted result
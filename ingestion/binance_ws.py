@@ -1,59 +1,179 @@
 import asyncio
 import json
-from datetime import datetime
+from time import perf_counter_ns
 
 import websockets
+from analytics.bar_builder import StreamingBarBuilder
 from storage.hot_buffer import TickBuffer
+from utils.config import MAX_STREAMS_PER_CONNECTION, TIMEFRAMES, WS_CONNECTIONS
+from utils.metrics import registry
 
-BINANCE_FUTURES_WS = "wss://fstream.binance.com/ws"
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:  # optional speed-up
+    loads = json.loads
+
+BINANCE_FUTURES_WS = "wss://fstream.binance.com"
 
 # 🔥 Global hot buffer
 tick_buffer = TickBuffer(maxlen=10_000)
 
+# 🔥 Global streaming bar builder (1s / 1m / 5m)
+bar_builder = StreamingBarBuilder(timeframes=tuple(TIMEFRAMES))
+
+# Decode time is measured on every Nth message of a connection only;
+# timing each one would cost ~7% of the per-message budget
+DECODE_SAMPLE_EVERY = 64
+
+# symbol → [sampled decode ns, decode samples, reconnects]. Message
+# counts come for free from the ring buffer's per-symbol sequence.
+DECODE_NS, DECODE_SAMPLES, RECONNECTS = range(3)
+ingest_stats: dict[str, list[int]] = {}
+
+# Latest ingest_snapshot() of each ingest worker process
+# (QA_INGEST_MODE=multiprocess), filled in by the queue writer
+worker_ingest_stats: dict[str, dict[str, list[int]]] = {}
+
+
+def _symbol_stats(symbol: str) -> list[int]:
+    stats = ingest_stats.get(symbol)
+    if stats is None:
+        stats = ingest_stats[symbol] = [0, 0, 0]
+    return stats
+
+
+def ingest_snapshot() -> dict[str, list[int]]:
+    """
+    symbol → [messages, decode ns, decode samples, reconnects] for this
+    process
+    """
+    snapshot = {s: [r.seq, 0, 0, 0] for s, r in list(tick_buffer.buffers.items())}
+    for symbol, stats in list(ingest_stats.items()):
+        snapshot.setdefault(symbol, [0, 0, 0, 0])[1:] = stats
+    return snapshot
+
+
+def collect_ingest_metrics():
+    totals: dict[str, list[int]] = {}
+    for snapshot in (ingest_snapshot(), *list(worker_ingest_stats.values())):
+        for symbol, values in snapshot.items():
+            total = totals.setdefault(symbol, [0, 0, 0, 0])
+            for i, v in enumerate(values):
+                total[i] += v
+
+    def samples(slot: int, name: str | None = None, scale: float = 1) -> list:
+        return [
+            (name, {"symbol": s}, v[slot] * scale) if name else ({"symbol": s}, v[slot])
+            for s, v in totals.items()
+        ]
+
+    yield ("qa_ingest_messages_total", "counter", "Trade messages received", samples(0))
+    yield (
+        "qa_ingest_decode_seconds",
+        "summary",
+        f"Trade message decode time (1 in {DECODE_SAMPLE_EVERY} messages)",
+        samples(1, "qa_ingest_decode_seconds_sum", 1e-9)
+        + samples(2, "qa_ingest_decode_seconds_count"),
+    )
+    yield (
+        "qa_ws_reconnects_total",
+        "counter",
+        "Websocket reconnects of the connection carrying the symbol",
+        samples(3),
+    )
+
+
+registry.register_collector(collect_ingest_metrics)
+
 
 def normalize_trade(msg: dict) -> dict:
-    ts = msg.get("T") or msg.get("E")
     return {
         "symbol": msg["s"],
-        "timestamp": datetime.fromtimestamp(ts / 1000).isoformat(),
+        # Integer epoch ms (UTC); converted once, in the buffer/writer
+        "timestamp": msg.get("T") or msg.get("E"),
         "price": float(msg["p"]),
         "qty": float(msg["q"]),
     }
 
 
-async def stream_symbol(symbol: str):
-    url = f"{BINANCE_FUTURES_WS}/{symbol.lower()}@trade"
+def handle_message(message: str | bytes, timed: bool = False):
+    t0 = perf_counter_ns() if timed else 0
+    data = loads(message)
+
+    # Combined streams wrap the payload: {"stream": ..., "data": {...}}
+    data = data.get("data", data)
+
+    if data.get("e") != "trade":
+        return
+
+    tick = normalize_trade(data)
+    if timed:
+        stats = _symbol_stats(tick["symbol"])
+        stats[DECODE_NS] += perf_counter_ns() - t0
+        stats[DECODE_SAMPLES] += 1
+
+    tick_buffer.add_tick(tick)
+    bar_builder.update(tick)
+
+
+def shard_symbols(symbols: list[str], n_connections: int) -> list[list[str]]:
+    """
+    Spread symbols round-robin over connections, never exceeding the
+    per-connection stream limit
+    """
+    needed = -(-len(symbols) // MAX_STREAMS_PER_CONNECTION)
+    n = max(1, n_connections, needed)
+    shards = [symbols[i::n] for i in range(n)]
+    return [s for s in shards if s]
+
+
+async def stream_shard(symbols: list[str], base_url: str = BINANCE_FUTURES_WS):
+    streams = "/".join(f"{s.lower()}@trade" for s in symbols)
+    url = f"{base_url}/stream?streams={streams}"
+    name = symbols[0] if len(symbols) == 1 else f"{symbols[0]}+{len(symbols) - 1}"
 
     while True:  # 🔁 AUTO-RECONNECT LOOP
         try:
-            print(f"[CONNECTING] {symbol}")
+            print(f"[CONNECTING] {name}")
 
             async with websockets.connect(
                 url,
                 ping_interval=20,   # ❤️ heartbeat every 20s
                 ping_timeout=20,
+                max_size=None,
             ) as ws:
-                print(f"[CONNECTED] {symbol}")
+                print(f"[CONNECTED] {name}")
 
+                n = 0
                 async for message in ws:
-                    data = json.loads(message)
-
-                    if data.get("e") != "trade":
-                        continue
-
-                    tick = normalize_trade(data)
-                    tick_buffer.add_tick(tick)
+                    n += 1
+                    handle_message(message, not n % DECODE_SAMPLE_EVERY)
 
         except asyncio.CancelledError:
             # Graceful shutdown
-            print(f"[SHUTDOWN] {symbol}")
+            print(f"[SHUTDOWN] {name}")
             break
 
         except Exception as e:
-            print(f"[WS ERROR] {symbol}: {e}")
-            print(f"[RECONNECTING] {symbol} in 5 seconds...")
+            print(f"[WS ERROR] {name}: {e}")
+            for symbol in symbols:
+                _symbol_stats(symbol)[RECONNECTS] += 1
+            print(f"[RECONNECTING] {name} in 5 seconds...")
             await asyncio.sleep(5)  # ⏳ backoff
 
 
-async def start_stream(symbols: list[str]):
-    await asyncio.gather(*(stream_symbol(s) for s in symbols))
+async def stream_symbol(symbol: str):
+    await stream_shard([symbol])
+
+
+async def start_stream(
+    symbols: list[str],
+    n_connections: int = WS_CONNECTIONS,
+    base_url: str = BINANCE_FUTURES_WS,
+):
+    shards = shard_symbols(symbols, n_connections)
+    print(f"[INGESTION] {len(symbols)} symbols over {len(shards)} connections")
+
+    await asyncio.gather(*(stream_shard(s, base_url) for s in shards))
@@ -0,0 +1,118 @@
+import asyncio
+import multiprocessing as mp
+import time
+
+# NOTE: worker processes import this module, so it must not import
+# anything that opens DuckDB (the API process is the only DB owner).
+from ingestion import binance_ws
+from utils.config import INGEST_QUEUE_SIZE, WS_CONNECTIONS
+
+# Per-process counters (each worker has its own copy)
+worker_stats = {
+    "batches": 0,
+    "dropped": 0,
+    "pending": {},
+}
+
+
+def collect_batch(cursors: dict[str, int]) -> dict | None:
+    """
+    New ticks and closed bars from this process's buffer/builder,
+    in a compact picklable form (NumPy columns + bar dicts)
+    """
+    binance_ws.bar_builder.flush(time.time_ns())
+
+    ticks = binance_ws.tick_buffer.collect(cursors, worker_stats)
+    bars = binance_ws.bar_builder.drain()
+
+    if ticks is None and not bars:
+        return None
+
+    worker_stats["batches"] += 1
+    return {
+        "ticks": ticks,
+        "bars": bars,
+        # Cumulative counters; the API process exports the latest per worker
+        "worker": mp.current_process().name,
+        "ingest": binance_ws.ingest_snapshot(),
+    }
+
+
+async def publish_loop(queue, publish_interval: float):
+    loop = asyncio.get_running_loop()
+    cursors: dict[str, int] = {}
+
+    while True:
+        await asyncio.sleep(publish_interval)
+
+        batch = collect_batch(cursors)
+        if batch is not None:
+            # A full queue blocks a helper thread, never the readers;
+            # the ring buffer absorbs the backlog meanwhile
+            await loop.run_in_executor(None, queue.put, batch)
+
+
+async def _run_worker(
+    symbols: list[str],
+    queue,
+    n_connections: int,
+    publish_interval: float,
+):
+    await asyncio.gather(
+        binance_ws.start_stream(symbols, n_connections=n_connections),
+        publish_loop(queue, publish_interval),
+    )
+
+
+def ingest_worker(
+    symbols: list[str],
+    queue,
+    n_connections: int = WS_CONNECTIONS,
+    publish_interval: float = 0.25,
+):
+    """
+    Worker process entry point: stream a shard of symbols and publish
+    ticks / closed bars to the writer queue
+    """
+    print(f"[INGEST-WORKER] pid={mp.current_process().pid} symbols={len(symbols)}")
+    try:
+        asyncio.run(
+            _run_worker(symbols, queue, n_connections, publish_interval)
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def start_ingest_workers(
+    symbols: list[str],
+    n_workers: int,
+    target=ingest_worker,
+    args: tuple = (),
+):
+    """
+    Shard symbols across worker processes. Returns (processes, queue).
+    """
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue(maxsize=INGEST_QUEUE_SIZE)
+
+    n = max(1, min(n_workers, len(symbols)))
+    processes = []
+    for i in range(n):
+        p = ctx.Process(
+            target=target,
+            args=(symbols[i::n], queue, *args),
+            name=f"ingest-{i}",
+            daemon=True,
+        )
+        p.start()
+        processes.append(p)
+
+    print(f"[INGESTION] {len(symbols)} symbols over {n} worker processes")
+    return processes, queue
+
+
+def stop_ingest_workers(processes):
+    for p in processes:
+        p.terminate()
+    for p in processes:
+        p.join(timeout=5)
@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+import pandas as pd
+
+from analytics.resampler import TickResampler
+from ingestion.binance_ws import bar_builder
+from utils.executor import run_blocking
+
+
+async def bar_writer_loop(flush_interval: float = 1.0):
+    """
+    Periodically close finished bars in the streaming builder and
+    persist them to DuckDB in one batch per timeframe
+    """
+    resampler = TickResampler()
+
+    print("[BAR-WRITER] Started bar writer loop")
+
+    while True:
+        try:
+            # Tick timestamps are UTC epoch, same clock as time_ns()
+            bar_builder.flush(time.time_ns())
+
+            batches: dict[str, list[dict]] = {}
+            for tf, bar in bar_builder.drain():
+                batches.setdefault(tf, []).append(bar)
+
+            for tf, bars in batches.items():
+                await run_blocking(resampler.upsert_bars, tf, pd.DataFrame(bars))
+                print(f"[BAR-WRITER] {tf} bars={len(bars)}")
+
+        except Exception as e:
+            print(f"[BAR-WRITER] Error: {e}")
+
+        await asyncio.sleep(flush_interval)
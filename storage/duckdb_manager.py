@@ -1,17 +1,200 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
 import duckdb
+import pandas as pd
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
+
+from storage.migrations import run_migrations
+from utils.metrics import registry
 
 DB_PATH = Path("data")
 DB_PATH.mkdir(exist_ok=True)
 
-DB_FILE = DB_PATH / "market_data.duckdb"
+DB_FILE = Path(os.getenv("QA_DB_FILE", DB_PATH / "market_data.duckdb"))
+
+
+class ConnectionPool:
+    """
+    Process-wide owner of one DuckDB database handle per file.
+
+    Each thread gets its own cursor (DuckDB connections are not safe to
+    share across threads); reads run concurrently on those cursors,
+    writes are serialised through a lock and run in a transaction.
+    """
+
+    _pools: dict[str, "ConnectionPool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, db_file: Path | str):
+        self.db_file = str(db_file)
+        self.root = duckdb.connect(self.db_file)
+
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._init_lock = threading.Lock()
+        self._initialized: set[str] = set()
+
+        # Shared across every DuckDBManager on this file
+        self.tick_count: int | None = None
+
+        # Ticks before this instant live in the Parquet cold tier
+        # (storage.tiered_storage); None → everything is still hot
+        self.cold_until = None
+
+        # timeframe → (latest bar timestamp written, write version).
+        # Every bar write goes through this process (DuckDB has a single
+        # writer), so this is enough to tell when cached results go stale.
+        self.bar_watermarks: dict[str, tuple] = {}
+
+        # (symbol, timeframe) → (latest bar start written, rewrites). A
+        # rewrite replaces a bar older than the latest one, i.e. a bar
+        # streaming readers may already have committed (resampler
+        # reconciliation, full rebuilds).
+        self.symbol_bars: dict[tuple[str, str], tuple] = {}
+
+        self.stats = {
+            "cursors_opened": 0,
+            "writes": 0,
+            "write_wait_ms_total": 0.0,
+            "write_wait_ms_max": 0.0,
+        }
+
+    @classmethod
+    def get(cls, db_file: Path | str = DB_FILE) -> "ConnectionPool":
+        key = str(Path(db_file).resolve())
+
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls._pools[key] = cls(db_file)
+            return pool
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = self._local.con = self.root.cursor()
+            self.stats["cursors_opened"] += 1
+        return con
+
+    @contextmanager
+    def write(self):
+        """
+        Exclusive, transactional access for writes
+        """
+        t0 = time.perf_counter()
+        with self._write_lock:
+            wait_ms = (time.perf_counter() - t0) * 1000
+            self.stats["writes"] += 1
+            self.stats["write_wait_ms_total"] += wait_ms
+            self.stats["write_wait_ms_max"] = max(
+                self.stats["write_wait_ms_max"], wait_ms
+            )
+
+            con = self.cursor()
+            con.begin()
+            try:
+                yield con
+            except Exception:
+                con.rollback()
+                raise
+            con.commit()
+
+    def mark_bars_written(self, timeframe: str, bars: pd.DataFrame):
+        spans = bars.groupby("symbol")["timestamp"].agg(["min", "max"])
+        for symbol, first, last in zip(spans.index, spans["min"], spans["max"]):
+            prev, rewrites = self.symbol_bars.get((symbol, timeframe), (None, 0))
+            # Nothing seen in this process yet → older bars may have changed
+            if prev is None or first < prev:
+                rewrites += 1
+            if prev is not None and last < prev:
+                last = prev
+            self.symbol_bars[(symbol, timeframe)] = (last, rewrites)
+
+        latest_ts = spans["max"].max()
+        prev_ts, version = self.bar_watermarks.get(timeframe, (None, 0))
+        if prev_ts is not None and latest_ts < prev_ts:
+            latest_ts = prev_ts
+        self.bar_watermarks[timeframe] = (latest_ts, version + 1)
+
+    def bar_rewrites(self, symbol: str, timeframe: str) -> int:
+        """
+        How often bars of a symbol older than its latest bar were replaced;
+        a change means state built from earlier reads is stale
+        """
+        return self.symbol_bars.get((symbol, timeframe), (None, 0))[1]
+
+    def run_once(self, name: str, fn: Callable[[], None]):
+        """
+        Run schema setup once per process instead of per manager
+        """
+        if name in self._initialized:
+            return
+
+        with self._init_lock:
+            if name not in self._initialized:
+                fn()
+                self._initialized.add(name)
+
+
+def collect_pool_metrics():
+    pools = list(ConnectionPool._pools.items())
+
+    def family(name: str, kind: str, help: str, value: Callable) -> tuple:
+        return (name, kind, help, [({"db": key}, value(p)) for key, p in pools])
+
+    yield family(
+        "qa_db_writes_total",
+        "counter",
+        "Write transactions",
+        lambda p: p.stats["writes"],
+    )
+    yield family(
+        "qa_db_write_wait_seconds_total",
+        "counter",
+        "Time spent waiting for the write lock",
+        lambda p: p.stats["write_wait_ms_total"] / 1000,
+    )
+    yield family(
+        "qa_db_write_wait_max_seconds",
+        "gauge",
+        "Longest wait for the write lock",
+        lambda p: p.stats["write_wait_ms_max"] / 1000,
+    )
+    yield family(
+        "qa_db_cursors_opened_total",
+        "counter",
+        "Per-thread cursors opened",
+        lambda p: p.stats["cursors_opened"],
+    )
+    yield family(
+        "qa_db_hot_ticks",
+        "gauge",
+        "Ticks in the hot table (NaN until first counted)",
+        lambda p: float("nan") if p.tick_count is None else p.tick_count,
+    )
+
+
+registry.register_collector(collect_pool_metrics)
 
 
 class DuckDBManager:
-    def __init__(self):
-        self.con = duckdb.connect(DB_FILE)
-        self._init_tables()
+    def __init__(self, db_file: Path | str = DB_FILE):
+        self.pool = ConnectionPool.get(db_file)
+        self.pool.run_once("ticks", self._init_tables)
+
+    @property
+    def con(self) -> duckdb.DuckDBPyConnection:
+        """
+        Read cursor owned by the calling thread
+        """
+        return self.pool.cursor()
+
+    def write(self):
+        return self.pool.write()
 
     def _init_tables(self):
         self.con.execute("""
@@ -23,34 +206,99 @@ class DuckDBManager:
         )
         """)
 
-    def insert_ticks(self, ticks: Iterable[dict]):
-        if not ticks:
-            return
+        # Hot/cold boundary + view over both tiers; TickArchive redefines
+        # the view once Parquet files exist
+        self.con.execute("""
+        CREATE TABLE IF NOT EXISTS tick_tiers (
+            cold_until TIMESTAMP
+        )
+        """)
+        self.con.execute("""
+        CREATE VIEW IF NOT EXISTS ticks_all AS
+        SELECT timestamp, symbol, price, qty FROM ticks
+        """)
+        self.pool.cold_until = self.con.execute(
+            "SELECT MAX(cold_until) FROM tick_tiers"
+        ).fetchone()[0]
+
+        # Bring tables created by older versions up to the current schema
+        run_migrations(self)
+
+    def tick_source(self, since=None) -> str:
+        """
+        Relation to read ticks from: the hot table when every tick at or
+        after `since` is still hot, otherwise the view spanning both tiers
+        """
+        cold_until = self.pool.cold_until
+        if cold_until is None or (since is not None and since >= cold_until):
+            return "ticks"
+        return "ticks_all"
 
-        self.con.executemany(
-            "INSERT INTO ticks VALUES (?, ?, ?, ?)",
-            [
-                (
-                    t["timestamp"],
-                    t["symbol"],
-                    t["price"],
-                    t["qty"],
+    def insert_ticks(self, ticks: Iterable[dict] | pd.DataFrame):
+        """
+        Bulk insert ticks from dicts or a columnar DataFrame
+        (timestamp, symbol, price, qty)
+        """
+        if isinstance(ticks, pd.DataFrame):
+            df = ticks
+        else:
+            if not ticks:
+                return
+
+            df = pd.DataFrame.from_records(
+                ticks, columns=["timestamp", "symbol", "price", "qty"]
+            )
+            if pd.api.types.is_numeric_dtype(df["timestamp"]):
+                # Epoch ms straight from normalize_trade
+                df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+            else:
+                df["timestamp"] = pd.to_datetime(
+                    df["timestamp"], format="ISO8601"
                 )
-                for t in ticks
-            ]
-        )
+
+        if df.empty:
+            return
+
+        # One columnar INSERT ... SELECT instead of a tuple per row,
+        # time-ordered so row-group min/max stats stay tight
+        with self.write() as con:
+            con.register("tick_batch", df)
+            try:
+                con.execute("""
+                INSERT INTO ticks
+                SELECT timestamp, symbol, price, qty FROM tick_batch
+                ORDER BY timestamp
+                """)
+            finally:
+                con.unregister("tick_batch")
+
+            if self.pool.tick_count is not None:
+                self.pool.tick_count += len(df)
 
     def count_ticks(self) -> int:
-        return self.con.execute("SELECT COUNT(*) FROM ticks").fetchone()[0]
+        # Hot-table row count cached after the first COUNT(*), then kept
+        # in step with inserts / roll-overs made through the pool
+        if self.pool.tick_count is None:
+            self.pool.tick_count = self.con.execute(
+                "SELECT COUNT(*) FROM ticks"
+            ).fetchone()[0]
+        return self.pool.tick_count
 
     def get_recent_ticks(self, symbol: str, limit: int = 10):
-        return self.con.execute(
-            """
+        query = """
             SELECT *
-            FROM ticks
+            FROM {source}
             WHERE symbol = ?
             ORDER BY timestamp DESC
             LIMIT ?
-            """,
-            [symbol, limit],
+            """
+        df = self.con.execute(
+            query.format(source="ticks"), [symbol, limit]
         ).fetchdf()
+
+        # Recent ticks are hot; only reach into Parquet when short
+        if len(df) < limit and self.tick_source() != "ticks":
+            df = self.con.execute(
+                query.format(source="ticks_all"), [symbol, limit]
+            ).fetchdf()
+        return df
@@ -1,6 +1,73 @@
-from collections import deque
+import numpy as np
 from typing import Dict, List
 
+from utils.timestamps import to_epoch_ns
+
+
+class SymbolRing:
+    """
+    Preallocated columnar ring buffer for one symbol.
+
+    last(n) returns NumPy views without copying, except when the window
+    straddles the wrap point, in which case only those n rows are copied.
+    Views are only valid until the next append overwrites them; copy if
+    you need to keep them.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.int64)
+        self.price = np.zeros(capacity, dtype=np.float64)
+        self.qty = np.zeros(capacity, dtype=np.float64)
+
+        # Total ticks ever written (monotonic write cursor)
+        self.seq = 0
+
+    def append(self, ts_ns: int, price: float, qty: float):
+        i = self.seq % self.capacity
+
+        self.ts[i] = ts_ns
+        self.price[i] = price
+        self.qty[i] = qty
+
+        self.seq += 1
+
+    def __len__(self) -> int:
+        return min(self.seq, self.capacity)
+
+    def last(self, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Arrays (ts_ns, price, qty) of the last n ticks, oldest first
+        """
+        n = max(0, min(n, len(self)))
+        end = self.seq % self.capacity or self.capacity
+        start = end - n
+
+        if start >= 0:
+            return (
+                self.ts[start:end],
+                self.price[start:end],
+                self.qty[start:end],
+            )
+
+        # Window wraps around the end of the arrays
+        return tuple(
+            np.concatenate((col[start:], col[:end]))
+            for col in (self.ts, self.price, self.qty)
+        )
+
+    def since(self, cursor: int):
+        """
+        Ticks with sequence number >= cursor still held in the ring.
+
+        Returns (ts_ns, price, qty, next_cursor, dropped) where dropped is
+        how many unseen ticks were overwritten before they were read.
+        """
+        oldest = max(0, self.seq - self.capacity)
+        dropped = max(0, oldest - cursor)
+        ts, price, qty = self.last(self.seq - max(cursor, oldest))
+        return ts, price, qty, self.seq, dropped
+
 
 class TickBuffer:
     """
@@ -8,27 +75,107 @@ class TickBuffer:
     """
 
     def __init__(self, maxlen: int = 10_000):
-        self.buffers: Dict[str, deque] = {}
+        self.buffers: Dict[str, SymbolRing] = {}
         self.maxlen = maxlen
 
     def add_tick(self, tick: dict):
         symbol = tick["symbol"]
 
         if symbol not in self.buffers:
-            self.buffers[symbol] = deque(maxlen=self.maxlen)
+            self.buffers[symbol] = SymbolRing(self.maxlen)
 
-        self.buffers[symbol].append(tick)
+        self.buffers[symbol].append(
+            to_epoch_ns(tick["timestamp"]),
+            tick["price"],
+            tick["qty"],
+        )
+
+    def get_recent_arrays(
+        self, symbol: str, n: int = 100
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+        if symbol not in self.buffers:
+            return None
+
+        return self.buffers[symbol].last(n)
+
+    def read_since(self, symbol: str, cursor: int):
+        """
+        Unseen ticks for a symbol, see SymbolRing.since()
+        """
+        return self.buffers[symbol].since(cursor)
+
+    def collect(
+        self,
+        cursors: dict[str, int],
+        stats: dict | None = None,
+    ) -> dict[str, np.ndarray] | None:
+        """
+        Copy every tick added since the last call into one columnar batch
+        (ts, symbol, price, qty), advancing the per-symbol cursors.
+
+        Cost is O(new ticks), independent of buffer size. Must run on the
+        thread that appends. `stats` (optional) receives per-symbol
+        "pending" depth and a running "dropped" total.
+        """
+        columns: dict[str, list] = {"ts": [], "symbol": [], "price": [], "qty": []}
+
+        for symbol, ring in list(self.buffers.items()):
+            cursor = cursors.get(symbol, 0)
+            if stats is not None:
+                stats["pending"][symbol] = ring.seq - cursor
+
+            if ring.seq == cursor:
+                continue
+
+            ts, price, qty, cursors[symbol], dropped = ring.since(cursor)
+            columns["ts"].append(ts)
+            columns["symbol"].append(np.full(len(ts), symbol, dtype=object))
+            columns["price"].append(price)
+            columns["qty"].append(qty)
+
+            if dropped:
+                if stats is not None:
+                    stats["dropped"] += dropped
+                print(f"[HOT-BUFFER] {symbol} ring overrun, dropped={dropped}")
+
+        if not columns["ts"]:
+            return None
+
+        # np.concatenate copies out of the ring, so later appends
+        # cannot change the batch after it is handed off
+        return {k: np.concatenate(v) for k, v in columns.items()}
 
     def get_recent_ticks(self, symbol: str, n: int = 100) -> List[dict]:
         if symbol not in self.buffers:
             return []
 
-        return list(self.buffers[symbol])[-n:]
+        return self.to_records(symbol, *self.buffers[symbol].last(n))
+
+    @staticmethod
+    def to_records(
+        symbol: str,
+        ts: np.ndarray,
+        price: np.ndarray,
+        qty: np.ndarray,
+    ) -> List[dict]:
+        stamps = np.datetime_as_string(
+            ts.view("datetime64[ns]").astype("datetime64[us]")
+        )
+
+        return [
+            {
+                "symbol": symbol,
+                "timestamp": t,
+                "price": p,
+                "qty": q,
+            }
+            for t, p, q in zip(stamps.tolist(), price.tolist(), qty.tolist())
+        ]
 
     def get_last_tick(self, symbol: str) -> dict | None:
-        if symbol not in self.buffers or not self.buffers[symbol]:
+        if symbol not in self.buffers or not len(self.buffers[symbol]):
             return None
-        return self.buffers[symbol][-1]
+        return self.get_recent_ticks(symbol, 1)[0]
 
     def size(self, symbol: str) -> int:
         return len(self.buffers.get(symbol, []))
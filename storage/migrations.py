@@ -0,0 +1,96 @@
+from typing import Callable
+
+import duckdb
+
+
+def _has_primary_key(con: duckdb.DuckDBPyConnection, table: str) -> bool:
+    return bool(
+        con.execute(
+            """
+            SELECT 1 FROM duckdb_constraints()
+            WHERE table_name = ? AND constraint_type = 'PRIMARY KEY'
+            """,
+            [table],
+        ).fetchone()
+    )
+
+
+def _bars_primary_keys(con: duckdb.DuckDBPyConnection):
+    """
+    bars_*: PRIMARY KEY (symbol, timestamp), rows rewritten clustered by
+    symbol, newest first (zone maps prune other symbols; "latest N bars"
+    top-N fills from the first rows it scans and skips the rest).
+
+    Duplicates left behind by the old delete-then-append writers are
+    collapsed to one row (the last one written).
+    """
+    tables = [
+        row[0]
+        for row in con.execute(
+            "SELECT table_name FROM duckdb_tables() WHERE table_name LIKE 'bars!_%' ESCAPE '!'"
+        ).fetchall()
+    ]
+
+    for table in tables:
+        if _has_primary_key(con, table):
+            continue
+
+        # Same columns, empty, then the key; keeps the DDL in one place
+        con.execute(f"CREATE TABLE {table}_new AS SELECT * FROM {table} LIMIT 0")
+        con.execute(f"ALTER TABLE {table}_new ADD PRIMARY KEY (symbol, timestamp)")
+        con.execute(f"""
+        INSERT INTO {table}_new
+        SELECT * EXCLUDE (rn) FROM (
+            SELECT *, row_number() OVER (
+                PARTITION BY symbol, timestamp ORDER BY rowid DESC
+            ) AS rn
+            FROM {table}
+        )
+        WHERE rn = 1
+        ORDER BY symbol, timestamp DESC
+        """)
+        con.execute(f"DROP TABLE {table}")
+        con.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+        print(f"[MIGRATE] {table}: primary key (symbol, timestamp), clustered")
+
+
+# (version, description, fn) – applied in order, each in its own transaction
+MIGRATIONS: list[tuple[int, str, Callable[[duckdb.DuckDBPyConnection], None]]] = [
+    (1, "bars primary keys", _bars_primary_keys),
+]
+
+
+def run_migrations(db) -> int:
+    """
+    Apply pending migrations to the DuckDBManager's database;
+    returns the schema version afterwards
+    """
+    db.con.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER,
+        description VARCHAR,
+        applied_at TIMESTAMP DEFAULT current_timestamp
+    )
+    """)
+    current = db.con.execute(
+        "SELECT COALESCE(MAX(version), 0) FROM schema_version"
+    ).fetchone()[0]
+
+    pending = [m for m in MIGRATIONS if m[0] > current]
+    for version, description, fn in pending:
+
+        with db.write() as con:
+            fn(con)
+            con.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                [version, description],
+            )
+        current = version
+        print(f"[MIGRATE] schema version {version}: {description}")
+
+    if pending:
+        # Rewritten tables go to disk compressed, with fresh zone maps
+        db.con.execute("CHECKPOINT")
+
+    return current
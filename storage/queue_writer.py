@@ -0,0 +1,102 @@
+import asyncio
+import queue as queue_lib
+
+import numpy as np
+import pandas as pd
+
+from analytics.resampler import TickResampler
+from ingestion.binance_ws import worker_ingest_stats
+from storage.duckdb_manager import DuckDBManager
+from storage.tick_writer import tick_frame, write_batch
+from utils.executor import run_blocking
+from utils.metrics import registry
+
+queue_stats = {
+    "batches": 0,
+    "last_drain_batches": 0,
+}
+
+queue_depth = registry.gauge(
+    "qa_ingest_queue_batches", "Worker batches waiting in the ingest queue"
+)
+registry.register_collector(
+    lambda: [
+        (
+            "qa_queue_writer_batches_total",
+            "counter",
+            "Worker batches persisted",
+            [({}, queue_stats["batches"])],
+        )
+    ]
+)
+
+
+def drain_queue(queue, max_batches: int = 1_000) -> list[dict]:
+    batches = []
+    while len(batches) < max_batches:
+        try:
+            batches.append(queue.get_nowait())
+        except queue_lib.Empty:
+            break
+    return batches
+
+
+def write_batches(
+    batches: list[dict],
+    db: DuckDBManager,
+    resampler: TickResampler,
+) -> int:
+    """
+    Merge batches from ingest workers into one tick insert and one bar
+    upsert per timeframe (blocking)
+    """
+    ticks = [b["ticks"] for b in batches if b["ticks"] is not None]
+
+    rows = 0
+    if ticks:
+        merged = {k: np.concatenate([t[k] for t in ticks]) for k in ticks[0]}
+        rows = write_batch(db, tick_frame(merged))
+
+    bars: dict[str, list[dict]] = {}
+    for b in batches:
+        for tf, bar in b["bars"]:
+            bars.setdefault(tf, []).append(bar)
+
+    for tf, tf_bars in bars.items():
+        resampler.upsert_bars(tf, pd.DataFrame(tf_bars))
+
+    for b in batches:
+        if "ingest" in b:
+            worker_ingest_stats[b["worker"]] = b["ingest"]
+
+    queue_stats["batches"] += len(batches)
+    queue_stats["last_drain_batches"] = len(batches)
+
+    return rows
+
+
+async def queue_writer_loop(queue, flush_interval: float = 0.25):
+    """
+    Persist ticks and bars published by ingest worker processes.
+    Runs in the API process, which stays the only DuckDB owner.
+    """
+    db = DuckDBManager()
+    resampler = TickResampler(db)
+
+    print("[QUEUE-WRITER] Started queue writer loop")
+
+    while True:
+        try:
+            batches = drain_queue(queue)
+            try:
+                queue_depth.set(queue.qsize())
+            except NotImplementedError:  # macOS multiprocessing queues
+                pass
+            if batches:
+                rows = await run_blocking(write_batches, batches, db, resampler)
+                print(f"[DB] Inserted {rows} ticks from {len(batches)} batches")
+
+        except Exception as e:
+            print(f"[QUEUE-WRITER] Error: {e}")
+
+        await asyncio.sleep(flush_interval)
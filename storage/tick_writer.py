@@ -1,34 +1,148 @@
 import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
 from ingestion.binance_ws import tick_buffer
 from storage.duckdb_manager import DuckDBManager
+from storage.hot_buffer import TickBuffer
+from utils.executor import run_blocking
+from utils.metrics import SIZE_BUCKETS, registry
+
+# Backpressure / throughput counters for the writer
+writer_stats = {
+    "batches": 0,
+    "rows": 0,
+    "dropped": 0,          # ticks overwritten in the ring before being written
+    "last_batch_rows": 0,
+    "last_flush_ms": 0.0,
+    "pending": {},         # symbol → unseen ticks at start of last flush
+}
+
+batch_rows = registry.histogram(
+    "qa_writer_batch_rows", "Ticks per writer batch", buckets=SIZE_BUCKETS
+)
+flush_seconds = registry.histogram(
+    "qa_writer_flush_seconds", "Time to persist one tick batch"
+)
+
+
+def collect_writer_metrics():
+    yield (
+        "qa_writer_batches_total",
+        "counter",
+        "Writer batches",
+        [({}, writer_stats["batches"])],
+    )
+    yield (
+        "qa_writer_rows_total",
+        "counter",
+        "Ticks persisted",
+        [({}, writer_stats["rows"])],
+    )
+    yield (
+        "qa_writer_dropped_total",
+        "counter",
+        "Ticks overwritten in the hot buffer before being persisted",
+        [({}, writer_stats["dropped"])],
+    )
+    yield (
+        "qa_writer_queue_depth",
+        "gauge",
+        "Unwritten ticks per symbol at the start of the last flush",
+        [({"symbol": s}, n) for s, n in list(writer_stats["pending"].items())],
+    )
+
+
+registry.register_collector(collect_writer_metrics)
+
+
+def tick_frame(columns: dict[str, np.ndarray]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": columns["ts"].view("datetime64[ns]"),
+            "symbol": columns["symbol"],
+            "price": columns["price"],
+            "qty": columns["qty"],
+        }
+    )
+
+
+def collect_ticks(
+    buffer: TickBuffer,
+    cursors: dict[str, int],
+) -> pd.DataFrame | None:
+    """
+    New ticks since the last call as a DataFrame, see TickBuffer.collect()
+    """
+    columns = buffer.collect(cursors, writer_stats)
+    return None if columns is None else tick_frame(columns)
+
+
+def write_batch(db: DuckDBManager, batch: pd.DataFrame | None) -> int:
+    """
+    Persist a collected batch (blocking) and record writer stats
+    """
+    t0 = time.perf_counter()
+    rows = 0
+
+    if batch is not None:
+        db.insert_ticks(batch)
+        rows = len(batch)
+
+    elapsed = time.perf_counter() - t0
+    writer_stats["batches"] += 1
+    writer_stats["rows"] += rows
+    writer_stats["last_batch_rows"] = rows
+    writer_stats["last_flush_ms"] = elapsed * 1000
+    batch_rows.observe(rows)
+    flush_seconds.observe(elapsed)
 
-db = DuckDBManager()
+    return rows
 
 
-async def tick_writer_loop(flush_interval: float = 1.0):
+def flush_ticks(
+    buffer: TickBuffer,
+    db: DuckDBManager,
+    cursors: dict[str, int],
+) -> int:
+    return write_batch(db, collect_ticks(buffer, cursors))
+
+
+async def tick_writer_loop(
+    flush_interval: float = 1.0, db: DuckDBManager | None = None
+):
     """
-    Periodically flush ticks from hot buffer to DuckDB
+    Periodically flush ticks from hot buffer to DuckDB.
+
+    Ticks are copied out of the ring on the event loop (cheap), the
+    insert itself runs in the blocking pool so the websocket readers
+    keep draining while DuckDB works.
     """
+    db = db or DuckDBManager()
+
     print("[DB-WRITER] Started tick writer loop")
 
-    last_sizes = {}
+    cursors: dict[str, int] = {}
+    # Batch whose insert failed. collect_ticks() has already moved the
+    # cursors past it, so it is retried as-is before anything new is read.
+    pending: pd.DataFrame | None = None
 
     while True:
-        batch = []
-
-        for symbol, buffer in tick_buffer.buffers.items():
-            last_size = last_sizes.get(symbol, 0)
-            current_size = len(buffer)
-
-            if current_size > last_size:
-                new_ticks = list(buffer)[last_size:current_size]
-                batch.extend(new_ticks)
-                last_sizes[symbol] = current_size
-
-        if batch:
-            db.insert_ticks(batch)
-            print(f"[DB] Inserted {len(batch)} ticks | total={db.count_ticks()}")
-        else:
-            print("[DB-WRITER] No new ticks")
+        try:
+            if pending is None:
+                pending = collect_ticks(tick_buffer, cursors)
+            written = await run_blocking(write_batch, db, pending)
+            pending = None
+
+            if written:
+                print(f"[DB] Inserted {written} ticks | total={db.count_ticks()}")
+            else:
+                print("[DB-WRITER] No new ticks")
+
+        except Exception as e:
+            held = 0 if pending is None else len(pending)
+            print(f"[DB-WRITER] Error: {e} (retrying {held} ticks)")
 
         await asyncio.sleep(flush_interval)
@@ -0,0 +1,231 @@
+import asyncio
+import os
+import shutil
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from storage.duckdb_manager import DB_PATH, DuckDBManager
+from utils.config import COLD_RETENTION_DAYS, HOT_DAYS, TIER_INTERVAL
+from utils.executor import run_blocking
+
+COLD_PATH = Path(os.getenv("QA_COLD_PATH", DB_PATH / "cold"))
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _day_start(ts: datetime) -> datetime:
+    return datetime(ts.year, ts.month, ts.day)
+
+
+class TickArchive:
+    """
+    Hot/cold tiering for ticks.
+
+    Recent days stay in the DuckDB `ticks` table; older days are rolled
+    into Hive-partitioned Parquet (ticks/symbol=.../date=.../*.parquet).
+    The `ticks_all` view spans both tiers, and DuckDBManager.tick_source
+    picks the hot table whenever a query only needs recent ticks.
+    """
+
+    def __init__(
+        self,
+        db: DuckDBManager | None = None,
+        root: Path | str = COLD_PATH,
+        hot_days: int = HOT_DAYS,
+        retention_days: int = COLD_RETENTION_DAYS,
+    ):
+        self.db = db or DuckDBManager()
+        self.tick_dir = Path(root).resolve() / "ticks"
+        self.hot_days = hot_days
+        self.retention_days = retention_days
+
+        self.tick_dir.mkdir(parents=True, exist_ok=True)
+        self.refresh_view()
+
+    def partitions(self) -> list[Path]:
+        return sorted(self.tick_dir.glob("symbol=*/date=*"))
+
+    def refresh_view(self, con=None, exclude: set[Path] = frozenset()):
+        """
+        Point ticks_all at the hot table plus the Parquet files on disk,
+        minus `exclude`. Files are listed rather than globbed, so readers
+        only see the cold tier change when the view is replaced; pass the
+        write's `con` to swap it together with the files it covers
+        (read_parquet fails on an empty list, so no files → hot only)
+        """
+        files = [
+            f
+            for f in sorted(self.tick_dir.glob("symbol=*/date=*/*.parquet"))
+            if f not in exclude
+        ]
+        sql = "SELECT timestamp, symbol, price, qty FROM ticks"
+        if files:
+            file_list = ", ".join(f"'{f}'" for f in files)
+            sql += f"""
+            UNION ALL
+            SELECT timestamp, symbol, price, qty
+            FROM read_parquet([{file_list}], hive_partitioning = true)
+            """
+
+        if con is not None:
+            con.execute(f"CREATE OR REPLACE VIEW ticks_all AS {sql}")
+            return
+        with self.db.write() as con:
+            con.execute(f"CREATE OR REPLACE VIEW ticks_all AS {sql}")
+
+    def roll_over(self, now: datetime | None = None) -> int:
+        """
+        Move ticks older than `hot_days` whole days into Parquet
+        """
+        now = now or _utcnow()
+        cutoff = _day_start(now) - timedelta(days=self.hot_days)
+        run_id = uuid.uuid4().hex[:8]
+
+        with self.db.write() as con:
+            moved = con.execute(
+                "SELECT COUNT(*) FROM ticks WHERE timestamp < ?", [cutoff]
+            ).fetchone()[0]
+            if moved == 0:
+                return 0
+
+            try:
+                # Sorted per partition → tight min/max stats per row group
+                con.execute(f"""
+                COPY (
+                    SELECT timestamp, symbol, price, qty,
+                           CAST(timestamp AS DATE) AS date
+                    FROM ticks
+                    WHERE timestamp < TIMESTAMP '{cutoff.isoformat()}'
+                    ORDER BY symbol, timestamp
+                ) TO '{self.tick_dir}' (
+                    FORMAT PARQUET,
+                    PARTITION_BY (symbol, date),
+                    FILENAME_PATTERN 'part-{run_id}-{{i}}',
+                    OVERWRITE_OR_IGNORE true
+                )
+                """)
+                con.execute("DELETE FROM ticks WHERE timestamp < ?", [cutoff])
+                con.execute("DELETE FROM tick_tiers")
+                con.execute("INSERT INTO tick_tiers VALUES (?)", [cutoff])
+                # New files join the view in the same commit that drops
+                # their ticks from the hot table
+                self.refresh_view(con)
+            except Exception:
+                # Transaction rolls back; drop the files it already wrote
+                for f in self.tick_dir.glob(f"*/*/part-{run_id}-*.parquet"):
+                    f.unlink()
+                raise
+
+            self.db.pool.cold_until = cutoff
+            if self.db.pool.tick_count is not None:
+                self.db.pool.tick_count -= moved
+
+        print(f"[TIERS] Rolled {moved} ticks before {cutoff} into Parquet")
+        return moved
+
+    def compact(self) -> int:
+        """
+        Merge multi-file partitions into one sorted file each
+        """
+        merged: list[tuple[Path, Path, list[Path]]] = []
+        try:
+            for part in self.partitions():
+                files = sorted(part.glob("*.parquet"))
+                if len(files) < 2:
+                    continue
+
+                # Written under a name the view never lists, swapped in below
+                name = f"compact-{uuid.uuid4().hex[:8]}.parquet"
+                staged = part / f"{name}.tmp"
+                merged.append((staged, part / name, files))
+                file_list = ", ".join(f"'{f}'" for f in files)
+                # symbol / date live in the path only, like the files roll_over
+                # writes; a copy in the file would clash with the Hive columns
+                self.db.con.execute(f"""
+                COPY (
+                    SELECT timestamp, price, qty
+                    FROM read_parquet([{file_list}], hive_partitioning = false)
+                    ORDER BY timestamp
+                ) TO '{staged}' (FORMAT PARQUET)
+                """)
+        except Exception:
+            for staged, _, _ in merged:
+                staged.unlink(missing_ok=True)
+            raise
+
+        if not merged:
+            return 0
+
+        # Compacted files replace the originals in one view swap, so a
+        # ticks_all reader sees either the old files or the new one
+        with self.db.write() as con:
+            for staged, target, _ in merged:
+                staged.rename(target)
+            replaced = {f for _, _, files in merged for f in files}
+            self.refresh_view(con, exclude=replaced)
+
+        for f in replaced:
+            f.unlink()
+
+        print(f"[TIERS] Compacted {len(merged)} partitions")
+        return len(merged)
+
+    def apply_retention(self, now: datetime | None = None) -> int:
+        """
+        Delete Parquet partitions older than `retention_days` (0 = keep all)
+        """
+        if self.retention_days <= 0:
+            return 0
+
+        now = now or _utcnow()
+        oldest = (_day_start(now) - timedelta(days=self.retention_days)).date()
+
+        expired = [
+            part
+            for part in self.partitions()
+            if date.fromisoformat(part.name.split("=", 1)[1]) < oldest
+        ]
+        if expired:
+            # Out of the view before the files go
+            self.refresh_view(
+                exclude={f for part in expired for f in part.glob("*.parquet")}
+            )
+        for part in expired:
+            shutil.rmtree(part)
+        removed = len(expired)
+
+        # Drop emptied symbol directories as well
+        for sym_dir in self.tick_dir.glob("symbol=*"):
+            if not any(sym_dir.iterdir()):
+                sym_dir.rmdir()
+
+        if removed:
+            print(f"[TIERS] Retention removed {removed} partitions before {oldest}")
+        return removed
+
+    def run_jobs(self, now: datetime | None = None) -> dict:
+        result = {
+            "rolled": self.roll_over(now),
+            "compacted": self.compact(),
+            "removed": self.apply_retention(now),
+        }
+        self.refresh_view()
+        return result
+
+
+async def tier_maintenance_loop(interval: float = TIER_INTERVAL):
+    """
+    Periodic roll-over / compaction / retention, off the event loop
+    """
+    archive = await run_blocking(TickArchive)
+
+    while True:
+        try:
+            await run_blocking(archive.run_jobs)
+        except Exception as e:
+            print(f"[TIERS] Error: {e}")
+
+        await asyncio.sleep(interval)
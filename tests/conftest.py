@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Every test process gets a throwaway database; must be set before
+# storage.duckdb_manager is imported
+os.environ.setdefault(
+    "QA_DB_FILE", str(Path(tempfile.mkdtemp()) / "test.duckdb")
+)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+T0 = pd.Timestamp("2024-01-01 00:00:00")
+
+
+@pytest.fixture
+def write_bars():
+    """
+    Upsert 1m bars with constant OHLC/VWAP = price, one per minute from
+    T0 + offset minutes
+    """
+    from analytics.resampler import TickResampler
+
+    def write(symbol: str, prices, offset: int = 0):
+        prices = np.asarray(prices, dtype=float)
+        TickResampler().upsert_bars(
+            "1m",
+            pd.DataFrame(
+                {
+                    "timestamp": T0 + pd.to_timedelta(np.arange(len(prices)) + offset, "min"),
+                    "symbol": symbol,
+                    "open": prices,
+                    "high": prices,
+                    "low": prices,
+                    "close": prices,
+                    "volume": 1.0,
+                    "vwap": prices,
+                }
+            ),
+        )
+
+    return write
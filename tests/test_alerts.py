@@ -0,0 +1,17 @@
+from collections import OrderedDict
+
+from analytics import alerts
+
+
+def test_alert_states_keep_only_the_most_recently_used(monkeypatch):
+    monkeypatch.setattr(alerts, "alert_states", OrderedDict())
+    monkeypatch.setattr(alerts, "ALERT_MAX_STATES", 2)
+
+    pair = ("BTCUSDT", "ETHUSDT", "1m", 20, 0.7)
+    first = alerts.get_alert_state((*pair, 2.0))
+    alerts.get_alert_state((*pair, 2.1))
+    assert alerts.get_alert_state((*pair, 2.0)) is first
+    alerts.get_alert_state((*pair, 2.2))
+
+    # 2.1 was the least recently used
+    assert list(alerts.alert_states) == [(*pair, 2.0), (*pair, 2.2)]
@@ -0,0 +1,65 @@
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import backtest
+from analytics.backtest import PairBacktest
+
+SX, SY = "BTXUSDT", "BTYUSDT"
+GRID = {"windows": [20, 60], "z_thresholds": [1.5, 2.0], "corr_thresholds": [0.0]}
+
+
+class InlinePool:
+    """
+    ProcessPoolExecutor stand-in that runs tasks in the caller and counts
+    how often it was started
+    """
+
+    started = 0
+
+    def __init__(self, **kwargs):
+        InlinePool.started += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.fixture
+def pair(write_bars):
+    rng = np.random.default_rng(5)
+    y = 100 + np.cumsum(rng.normal(0, 0.5, 400))
+    x = 20 + 1.5 * y + rng.normal(0, 0.4, 400)
+    write_bars(SX, x)
+    write_bars(SY, y)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    InlinePool.started = 0
+    monkeypatch.setattr(backtest, "ProcessPoolExecutor", InlinePool)
+    return InlinePool
+
+
+def test_small_sweep_runs_inline(pair, pool):
+    PairBacktest(SX, SY).grid(**GRID, workers=2)
+    assert pool.started == 0
+
+
+def test_large_sweep_uses_the_pool(pair, pool, monkeypatch):
+    inline = PairBacktest(SX, SY).grid(**GRID, workers=1)
+
+    monkeypatch.setattr(backtest, "_POOL_MIN", 0)
+    pooled = PairBacktest(SX, SY).grid(**GRID, workers=2)
+
+    assert pool.started == 1
+    pd.testing.assert_frame_equal(pooled, inline)
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from analytics.bar_builder import StreamingBarBuilder
+
+T0 = pd.Timestamp("2024-01-01 00:00:00")
+
+
+def tick(seconds: float, price: float, qty: float = 1.0) -> dict:
+    return {
+        "symbol": "BTCUSDT",
+        "timestamp": T0 + pd.Timedelta(seconds=seconds),
+        "price": price,
+        "qty": qty,
+    }
+
+
+def test_bar_ohlcv():
+    builder = StreamingBarBuilder(timeframes=("1m",))
+    for t in (tick(1, 100), tick(20, 105), tick(40, 95), tick(59, 101, 2.0)):
+        builder.update(t)
+
+    bar = builder.open_bar("BTCUSDT", "1m")
+    assert (bar["open"], bar["high"], bar["low"], bar["close"]) == (100, 105, 95, 101)
+    assert bar["volume"] == 5.0
+    assert bar["vwap"] == (100 + 105 + 95 + 2 * 101) / 5
+
+
+def test_out_of_order_trade_does_not_touch_open_bar():
+    builder = StreamingBarBuilder(timeframes=("1m",))
+    builder.update(tick(61, 100))   # opens 00:01
+    builder.update(tick(30, 1.0, qty=50.0))  # late trade from 00:00
+
+    bar = builder.open_bar("BTCUSDT", "1m")
+    assert bar["timestamp"] == T0 + pd.Timedelta(minutes=1)
+    assert (bar["open"], bar["high"], bar["low"], bar["close"]) == (100, 100, 100, 100)
+    assert bar["volume"] == 1.0
+    assert builder.late_trades == 1
+    assert builder.drain() == []
+
+
+def test_late_trade_for_emitted_window_is_dropped():
+    builder = StreamingBarBuilder(timeframes=("1m",))
+    builder.update(tick(10, 100))
+    builder.update(tick(70, 101))   # closes 00:00
+    builder.update(tick(130, 102))  # closes 00:01
+    builder.update(tick(20, 50))    # 00:00 already emitted
+
+    closed = [bar for _, bar in builder.drain()]
+    assert [b["close"] for b in closed] == [100, 101]
+    assert builder.open_bar("BTCUSDT", "1m")["low"] == 102
+    assert builder.late_trades == 1
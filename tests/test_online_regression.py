@@ -0,0 +1,115 @@
+import json
+
+import numpy as np
+import pytest
+import statsmodels.api as sm
+
+from analytics.online_regression import (
+    KalmanHedgeRatio,
+    OnlineHedgeRatio,
+    RecursiveLeastSquares,
+)
+
+
+def cointegrated(n: int, seed: int = 7) -> tuple[np.ndarray, np.ndarray]:
+    """
+    X = 50 + 1.8 * Y + noise, Y a random walk around 100
+    """
+    rng = np.random.default_rng(seed)
+    y = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    x = 50 + 1.8 * y + rng.normal(0, 0.3, n)
+    return x, y
+
+
+def test_rls_without_forgetting_matches_ols():
+    x, y = cointegrated(500)
+    rls = RecursiveLeastSquares(forgetting=1.0)
+    for xi, yi in zip(x, y):
+        rls.update(xi, yi)
+
+    ols = sm.OLS(x, sm.add_constant(y)).fit()
+    assert rls.alpha == pytest.approx(ols.params[0], rel=1e-9)
+    assert rls.beta == pytest.approx(ols.params[1], rel=1e-9)
+    assert rls.r2 == pytest.approx(ols.rsquared, rel=1e-9)
+
+
+def test_rls_state_round_trip():
+    x, y = cointegrated(300)
+    whole = RecursiveLeastSquares(forgetting=0.99)
+    part = RecursiveLeastSquares(forgetting=0.99)
+    for xi, yi in zip(x[:150], y[:150]):
+        whole.update(xi, yi)
+        part.update(xi, yi)
+
+    # Same JSON round trip OnlineHedgeRatio uses for hedge_state
+    part = RecursiveLeastSquares.from_state(json.loads(json.dumps(part.to_state())))
+    for xi, yi in zip(x[150:], y[150:]):
+        assert part.update(xi, yi) == whole.update(xi, yi)
+
+
+@pytest.mark.parametrize("scale", [1, 600])
+def test_kalman_returns_prior_state(scale):
+    x, y = cointegrated(2000)
+    x, y = x * scale, y * scale
+    kf = KalmanHedgeRatio(delta=1e-4)
+
+    errors = []
+    for i, (xi, yi) in enumerate(zip(x, y)):
+        before = (kf.alpha, kf.beta)
+        alpha, beta = kf.update(xi, yi)
+        if i == 0:
+            assert np.isnan(alpha) and np.isnan(beta)
+            continue
+        assert (alpha, beta) == before
+        errors.append(xi - alpha - beta * yi)
+
+    # One-step-ahead error keeps the noise (std 0.3 per unit of price);
+    # a posterior fit would leave next to nothing. obs_noise is relative,
+    # so this holds at any price level.
+    assert 0.3 < np.std(errors[200:]) / scale < 1.0
+
+
+@pytest.mark.parametrize(
+    "make",
+    [lambda: RecursiveLeastSquares(forgetting=0.99), lambda: KalmanHedgeRatio(delta=1e-4)],
+    ids=["rls", "kalman"],
+)
+def test_spread_at_t_does_not_depend_on_x_t(make):
+    x, y = cointegrated(300)
+    shocked = x.copy()
+    shocked[200] += 50
+
+    plain, moved = make(), make()
+    for i in range(201):
+        a, b = plain.update(x[i], y[i])
+        a2, b2 = moved.update(shocked[i], y[i])
+        np.testing.assert_equal((a2, b2), (a, b))
+
+    # Same hedge at bar 200, so the spread carries the whole shock
+    assert (shocked[200] - a2 - b2 * y[200]) - (x[200] - a - b * y[200]) == pytest.approx(50)
+
+
+def test_persisted_state_resumes_where_it_stopped(write_bars):
+    sx, sy = "RLSXUSDT", "RLSYUSDT"
+    x, y = cointegrated(400)
+
+    # First 200 bars, then the rest arrives; the second update only
+    # feeds the new bars on top of the state restored from DuckDB
+    write_bars(sx, x[:200])
+    write_bars(sy, y[:200])
+    OnlineHedgeRatio(timeframe="1m", method="rls", forgetting=1.0).update(sx, sy)
+    write_bars(sx, x[200:], offset=200)
+    write_bars(sy, y[200:], offset=200)
+    est = OnlineHedgeRatio(timeframe="1m", method="rls", forgetting=1.0).update(sx, sy)
+
+    # The last bar is still open and is left out
+    ols = sm.OLS(x[:-1], sm.add_constant(y[:-1])).fit()
+    assert est.n == 399
+    assert est.beta == pytest.approx(ols.params[1], rel=1e-9)
+
+    # The series holds the prior: bar 398 is hedged with bars 0..397
+    series = OnlineHedgeRatio(timeframe="1m", method="rls", forgetting=1.0).beta_series(sx, sy)
+    prior = sm.OLS(x[:-2], sm.add_constant(y[:-2])).fit()
+    assert len(series) == 399
+    assert series.index.is_unique
+    assert series["beta"].iloc[-1] == pytest.approx(prior.params[1], rel=1e-9)
@@ -0,0 +1,56 @@
+import asyncio
+
+import numpy as np
+
+from analytics.pair_feed import PairFeed, get_pair_feed, pair_feeds, release_pair_feed
+
+KEY = ("FEEDXUSDT", "FEEDYUSDT", "1m", 20)
+
+
+def new_feed() -> PairFeed:
+    return PairFeed("FEEDXUSDT", "FEEDYUSDT", "1m", window=20)
+
+
+def test_feed_is_evicted_with_its_last_subscriber():
+    async def scenario():
+        feed = get_pair_feed(KEY, new_feed)
+        first = await feed.subscribe()
+        second = await get_pair_feed(KEY, new_feed).subscribe()
+        assert len(pair_feeds) == 1
+
+        release_pair_feed(KEY, feed, first)
+        assert pair_feeds[KEY] is feed
+        assert feed.task is not None
+
+        release_pair_feed(KEY, feed, second)
+        assert KEY not in pair_feeds
+        assert feed.task is None
+
+        # Next viewer starts a fresh feed
+        assert get_pair_feed(KEY, new_feed) is not feed
+        pair_feeds.clear()
+
+    asyncio.run(scenario())
+
+
+def test_feed_resyncs_after_pushed_bars_are_rewritten(write_bars):
+    sx, sy = "RESYNCXUSDT", "RESYNCYUSDT"
+    rng = np.random.default_rng(4)
+    y = 100 + np.cumsum(rng.normal(0, 0.5, 80))
+    x = 50 + 1.8 * y + rng.normal(0, 0.3, 80)
+    write_bars(sx, x)
+    write_bars(sy, y)
+
+    feed = PairFeed(sx, sy, "1m", window=10)
+    assert feed.advance()
+
+    # Reconciliation replaces a bar the feed has already pushed
+    x[40] += 25
+    write_bars(sx, x[35:45], offset=35)
+
+    delta = feed.advance()
+    assert delta["resync"]
+    fresh = PairFeed(sx, sy, "1m", window=10)
+    fresh.advance()
+    assert delta["points"] == fresh.snapshot()["points"]
+    assert feed.advance() is None
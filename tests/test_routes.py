@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from analytics import stats
+from analytics.cache import pair_cache
+from analytics.stats import StreamingCorrelation, StreamingZScore
+from api import routes
+from api.routes import router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+PAIR = {"symbol_x": "BTCUSDT", "symbol_y": "ETHUSDT"}
+T0 = pd.Timestamp("2024-01-01 00:00:00")
+
+
+@pytest.mark.parametrize("path", ["/hedge-ratio", "/spread", "/zscore"])
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"method": "kalman", "delta": 1.0},
+        {"method": "kalman", "delta": 0},
+        {"method": "rls", "forgetting": 0},
+        {"method": "rls", "forgetting": 1.5},
+    ],
+)
+def test_online_params_out_of_range_are_rejected(path, params):
+    r = client.get(path, params={**PAIR, **params})
+    assert r.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"method": "rls", "forgetting": 0.9876}, {"method": "kalman", "delta": 0.0123}],
+)
+def test_online_params_outside_allowed_set_are_rejected(params):
+    r = client.get("/spread", params={**PAIR, **params})
+    assert r.status_code == 400
+    assert "not allowed" in r.json()["detail"]
+
+
+@pytest.mark.parametrize(
+    "path", ["/zscore", "/correlation", "/alerts", "/alerts/events", "/pair-analytics"]
+)
+@pytest.mark.parametrize("window", [0, 1, -5])
+def test_window_below_two_is_rejected(path, window):
+    r = client.get(path, params={**PAIR, "window": window})
+    assert r.status_code == 422
+
+
+def test_streaming_correlation_resyncs_after_older_bars_are_rewritten(write_bars):
+    sx, sy = "CORRXUSDT", "CORRYUSDT"
+    rng = np.random.default_rng(3)
+    x = 100 + np.cumsum(rng.normal(0, 1, 60))
+    y = 50 + np.cumsum(rng.normal(0, 1, 60))
+    write_bars(sx, x)
+    write_bars(sy, y)
+
+    pair = {"symbol_x": sx, "symbol_y": sy, "window": 10}
+    assert client.get("/correlation", params=pair).status_code == 200
+
+    # Reconciliation replaces a bar the stream has already committed
+    x[30] += 25
+    write_bars(sx, x[25:35], offset=25)
+
+    streamed = client.get("/correlation", params=pair).json()
+    batch = client.get("/correlation", params={**pair, "start": str(T0)}).json()
+    assert [r["rolling_corr"] for r in streamed] == pytest.approx(
+        [r["rolling_corr"] for r in batch]
+    )
+
+
+def test_backtest_with_a_parameter_set_that_never_trades(write_bars):
+    sx, sy = "BTRXUSDT", "BTRYUSDT"
+    rng = np.random.default_rng(1)
+    y = 100 + np.cumsum(rng.normal(0, 0.5, 72))
+    write_bars(sx, 50 + 1.8 * y + rng.normal(0, 0.3, 72))
+    write_bars(sy, y)
+
+    r = client.get(
+        "/backtest",
+        params={"symbol_x": sx, "symbol_y": sy, "windows": "20,60", "z_thresholds": "1.5,2"},
+    )
+    assert r.status_code == 200
+    rows = r.json()
+    assert len(rows) == 4
+    idle = [row for row in rows if row["trades"] == 0]
+    assert idle and all(row["sharpe"] == 0.0 for row in idle)
+
+
+@pytest.mark.parametrize("path, params", [("/correlation", {}), ("/zscore", {"method": "rls"})])
+def test_full_history_longer_than_the_stream(path, params, write_bars, monkeypatch):
+    sx, sy = f"HIST{path[1:5].upper()}XUSDT", f"HIST{path[1:5].upper()}YUSDT"
+    rng = np.random.default_rng(9)
+    y = 100 + np.cumsum(rng.normal(0, 0.5, 200))
+    write_bars(sx, 50 + 1.8 * y + rng.normal(0, 0.3, 200))
+    write_bars(sy, y)
+    query = {"symbol_x": sx, "symbol_y": sy, "window": 10, **params}
+
+    full = client.get(path, params=query).json()
+
+    # Same request with streams that only keep the last 50 rows
+    pair_cache.clear()
+    monkeypatch.setattr(stats, "streaming_stats", OrderedDict())
+    monkeypatch.setattr(routes, "StreamingZScore", partial(StreamingZScore, history=50))
+    monkeypatch.setattr(
+        routes, "StreamingCorrelation", partial(StreamingCorrelation, history=50)
+    )
+    cut = client.get(path, params=query).json()
+
+    assert len(full) > 150
+    assert [r["timestamp"] for r in cut] == [r["timestamp"] for r in full]
+    column = "rolling_corr" if path == "/correlation" else "zscore"
+    assert [r[column] for r in cut] == pytest.approx([r[column] for r in full])
@@ -0,0 +1,78 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from analytics import scanner
+
+
+class NoPool:
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("process pool started")
+
+
+def test_loop_waits_for_first_read(monkeypatch):
+    monkeypatch.setattr(scanner, "ProcessPoolExecutor", NoPool)
+    monkeypatch.setattr(scanner, "scan_requested", scanner.threading.Event())
+
+    async def run():
+        task = asyncio.create_task(scanner.scanner_loop(interval=3600))
+        await asyncio.sleep(0.1)
+        done = task.done()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return done
+
+    # Still idle: no scan ran, so no scanner (or pool) was built
+    assert not asyncio.run(run())
+    scanner.latest_scan()
+    assert scanner.scan_requested.is_set()
+
+
+def test_first_read_after_restart_scans_inline(monkeypatch, write_bars):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from api.routes import router
+    from storage.duckdb_manager import DuckDBManager
+
+    monkeypatch.setattr(scanner, "ProcessPoolExecutor", NoPool)
+    monkeypatch.setattr(scanner, "scan_requested", scanner.threading.Event())
+    monkeypatch.setattr(scanner, "SCAN_SYMBOLS", ["FIRSTXUSDT", "FIRSTYUSDT"])
+    monkeypatch.setattr(scanner, "SCAN_TIMEFRAME", "1m")
+    rng = np.random.default_rng(5)
+    y = 100 + np.cumsum(rng.normal(0, 0.5, 200))
+    write_bars("FIRSTXUSDT", 20 + 1.5 * y + rng.normal(0, 0.3, 200))
+    write_bars("FIRSTYUSDT", y)
+    with DuckDBManager().write() as con:
+        con.execute("DELETE FROM pair_scan")
+
+    app = FastAPI()
+    app.include_router(router)
+    r = TestClient(app).get("/scanner", params={"timeframe": "1m"})
+
+    assert r.status_code == 200
+    (row,) = r.json()
+    assert {row["symbol_x"], row["symbol_y"]} == {"FIRSTXUSDT", "FIRSTYUSDT"}
+    assert scanner.scan_requested.is_set()
+
+
+def test_single_worker_scans_inline(monkeypatch, write_bars):
+    monkeypatch.setattr(scanner, "ProcessPoolExecutor", NoPool)
+    rng = np.random.default_rng(11)
+    y = 100 + np.cumsum(rng.normal(0, 0.5, 200))
+    write_bars("SCANXUSDT", 50 + 1.8 * y + rng.normal(0, 0.3, 200))
+    write_bars("SCANYUSDT", y)
+    write_bars("SCANZUSDT", 100 + np.cumsum(rng.normal(0, 0.5, 200)))
+
+    s = scanner.UniverseScanner(
+        ["SCANXUSDT", "SCANYUSDT", "SCANZUSDT"], "1m", 200, top_k=3, workers=1
+    )
+    ranked = s.scan()
+    s.close()
+
+    assert len(ranked) == 3
+    top = ranked.iloc[0]
+    assert {top["symbol_x"], top["symbol_y"]} == {"SCANXUSDT", "SCANYUSDT"}
+    assert top["is_stationary"]
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.adfvalues import mackinnonp
+from statsmodels.tsa.stattools import adfuller
+
+from analytics import stationarity
+from analytics.stationarity import (
+    adf_pvalues,
+    adf_tests,
+    compute_pair_adf,
+    rolling_adf,
+    stored_adf,
+)
+
+
+@pytest.fixture
+def cointegrated_pair(write_bars):
+    rng = np.random.default_rng(11)
+    y = 100 + np.cumsum(rng.normal(0, 0.5, 300))
+    x = 20 + 1.5 * y + rng.normal(0, 0.3, 300)
+
+    def write(symbol_x: str, symbol_y: str):
+        write_bars(symbol_x, x)
+        write_bars(symbol_y, y)
+
+    return write
+
+
+def test_failed_pair_is_not_tracked():
+    with pytest.raises(Exception):
+        compute_pair_adf("NOPEXUSDT", "NOPEYUSDT", "1m")
+
+    assert ("NOPEXUSDT", "NOPEYUSDT", "1m") not in adf_tests
+    assert stored_adf("NOPEXUSDT", "NOPEYUSDT", "1m") is None
+
+
+def test_pair_is_tracked_after_it_computes(cointegrated_pair):
+    cointegrated_pair("ADFXUSDT", "ADFYUSDT")
+    result = compute_pair_adf("ADFXUSDT", "ADFYUSDT", "1m")
+
+    assert ("ADFXUSDT", "ADFYUSDT", "1m") in adf_tests
+    assert stored_adf("ADFXUSDT", "ADFYUSDT", "1m") == result
+
+
+def test_tracked_pairs_are_capped(cointegrated_pair, monkeypatch):
+    monkeypatch.setattr(stationarity, "ADF_MAX_PAIRS", len(adf_tests))
+    cointegrated_pair("CAPXUSDT", "CAPYUSDT")
+
+    # Still answered, just not scheduled or stored
+    result = compute_pair_adf("CAPXUSDT", "CAPYUSDT", "1m")
+    assert "p_value" in result
+    assert ("CAPXUSDT", "CAPYUSDT", "1m") not in adf_tests
+    assert stored_adf("CAPXUSDT", "CAPYUSDT", "1m") is None
+
+
+def test_pvalues_match_mackinnonp():
+    stats = np.concatenate([np.linspace(-20, 3, 461), [-18.83, -1.61, 2.74]])
+    expected = [mackinnonp(s, regression="c", N=1) for s in stats]
+    np.testing.assert_allclose(adf_pvalues(stats), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("phi", [0.5, 0.95, 1.0])
+def test_rolling_adf_matches_adfuller(phi):
+    rng = np.random.default_rng(2)
+    e = rng.normal(0, 1, 400)
+    x = np.zeros(400)
+    for t in range(1, 400):
+        x[t] = phi * x[t - 1] + e[t]
+    spread = pd.Series(x, index=pd.date_range("2024-01-01", periods=400, freq="1min"))
+
+    got = rolling_adf(spread, window=200, step=50, lag=2)
+    assert len(got) == 5
+    for ts, stat, p in zip(got["timestamp"], got["adf_statistic"], got["p_value"]):
+        end = spread.index.get_loc(ts) + 1
+        ref = adfuller(x[end - 200:end], maxlag=2, autolag=None, regression="c")
+        assert stat == pytest.approx(ref[0], rel=1e-8)
+        assert p == pytest.approx(ref[1], rel=1e-8)
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from analytics import stats
+from analytics.stats import (
+    RollingCorrelationCalculator,
+    StreamingCorrelation,
+    StreamingZScore,
+    ZScoreCalculator,
+)
+
+BARS = 50_000
+TAIL = 5_000
+
+
+@pytest.fixture(scope="module")
+def prices() -> pd.DataFrame:
+    """
+    Random walks at BTC / ETH price levels, where catastrophic
+    cancellation in running sums would show first
+    """
+    rng = np.random.default_rng(3)
+    y = 3000 + np.cumsum(rng.normal(0, 1.5, BARS))
+    x = 60000 + 18 * (y - 3000) + np.cumsum(rng.normal(0, 20, BARS))
+    index = pd.date_range("2024-01-01", periods=BARS, freq="1s", name="timestamp")
+    return pd.DataFrame({"X": x, "Y": y}, index=index)
+
+
+def stream(prices: pd.DataFrame, window: int):
+    spread = prices["X"] - 18 * prices["Y"]
+    zs = StreamingZScore(window=window, history=len(prices))
+    rc = StreamingCorrelation(window=window, history=len(prices))
+    for ts, x, y, s in zip(
+        prices.index, prices["X"].tolist(), prices["Y"].tolist(), spread.tolist()
+    ):
+        zs.update(ts, s)
+        rc.update(ts, x, y)
+    return spread, zs.to_frame()["zscore"], rc.to_frame()["rolling_corr"]
+
+
+@pytest.mark.parametrize("window", [20, 100, 1000])
+def test_streaming_matches_pandas_rolling(prices, window):
+    spread, got_z, got_c = stream(prices, window)
+
+    ref_z = ZScoreCalculator(window).compute(spread.to_frame("spread"))["zscore"].dropna()
+    ref_c = RollingCorrelationCalculator(window).compute(prices, "X", "Y")["rolling_corr"].dropna()
+
+    assert got_z.index.equals(ref_z.index)
+    assert got_c.index.equals(ref_c.index)
+    assert np.max(np.abs(got_z.to_numpy() - ref_z.to_numpy())) < 1e-6
+    assert np.max(np.abs(got_c.to_numpy() - ref_c.to_numpy())) < 1e-6
+
+
+@pytest.mark.parametrize("window", [20, 100, 1000])
+def test_no_drift_against_exact_tail(prices, window):
+    # Two-pass reference on the last bars, where drift would accumulate
+    # (pandas' own rolling sums drift too, so it is not the ground truth)
+    spread, got_z, got_c = stream(prices, window)
+
+    sw = sliding_window_view(spread.to_numpy()[-(TAIL + window - 1):], window)
+    exact_z = (sw[:, -1] - sw.mean(1)) / sw.std(1, ddof=1)
+    xw = sliding_window_view(prices["X"].to_numpy()[-(TAIL + window - 1):], window)
+    yw = sliding_window_view(prices["Y"].to_numpy()[-(TAIL + window - 1):], window)
+    dx = xw - xw.mean(1, keepdims=True)
+    dy = yw - yw.mean(1, keepdims=True)
+    exact_c = (dx * dy).sum(1) / np.sqrt((dx * dx).sum(1) * (dy * dy).sum(1))
+
+    assert np.max(np.abs(got_z.to_numpy()[-TAIL:] - exact_z)) < 1e-8
+    assert np.max(np.abs(got_c.to_numpy()[-TAIL:] - exact_c)) < 1e-8
+
+
+def test_correlation_reset_forgets_committed_bars(prices):
+    rc = StreamingCorrelation(window=20)
+    for ts, x, y in zip(prices.index[:100], prices["X"][:100], prices["Y"][:100]):
+        rc.update(ts, x, y)
+    rc.reset()
+
+    fresh = StreamingCorrelation(window=20)
+    for ts, x, y in zip(prices.index[100:200], prices["X"][100:200], prices["Y"][100:200]):
+        np.testing.assert_equal(rc.update(ts, x, y), fresh.update(ts, x, y))
+    assert rc.to_frame().equals(fresh.to_frame())
+
+
+def test_registry_keeps_only_the_most_recently_used(monkeypatch):
+    monkeypatch.setattr(stats, "streaming_stats", OrderedDict())
+    monkeypatch.setattr(stats, "STREAM_MAX_STATS", 2)
+
+    first = stats.get_streaming_stat(("zscore", 20), StreamingZScore)
+    stats.get_streaming_stat(("zscore", 30), StreamingZScore)
+    assert stats.get_streaming_stat(("zscore", 20), StreamingZScore) is first
+    stats.get_streaming_stat(("zscore", 40), StreamingZScore)
+
+    # 30 was the least recently used
+    assert list(stats.streaming_stats) == [("zscore", 20), ("zscore", 40)]
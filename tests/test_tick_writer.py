@@ -0,0 +1,65 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from storage import tick_writer
+from storage.hot_buffer import TickBuffer
+
+T0 = pd.Timestamp("2024-01-01 00:00:00")
+
+
+class FlakyDB:
+    """
+    insert_ticks fails on the first call, then records every batch
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.batches = []
+
+    def insert_ticks(self, batch):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("disk full")
+        self.batches.append(batch)
+
+    def count_ticks(self):
+        return sum(len(b) for b in self.batches)
+
+
+def test_failed_insert_is_retried_not_dropped(monkeypatch):
+    buffer = TickBuffer(maxlen=100)
+    for i in range(5):
+        buffer.add_tick(
+            {
+                "symbol": "BTCUSDT",
+                "timestamp": T0 + pd.Timedelta(seconds=i),
+                "price": 100.0 + i,
+                "qty": 1.0,
+            }
+        )
+    db = FlakyDB()
+
+    async def inline(fn, *args):
+        return fn(*args)
+
+    cycles = 0
+
+    async def stop_after_two(_):
+        nonlocal cycles
+        cycles += 1
+        if cycles == 2:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(tick_writer, "tick_buffer", buffer)
+    monkeypatch.setattr(tick_writer, "run_blocking", inline)
+    monkeypatch.setattr(tick_writer.asyncio, "sleep", stop_after_two)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(tick_writer.tick_writer_loop(db=db))
+
+    # First flush failed, the second wrote the same five ticks once
+    assert db.calls == 2
+    assert len(db.batches) == 1
+    assert db.batches[0]["price"].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import duckdb
+import pandas as pd
+
+from storage.duckdb_manager import DuckDBManager
+from storage.tiered_storage import TickArchive
+
+
+def ticks(day: str, n: int, price: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range(day, periods=n, freq="1min"),
+            "symbol": "TIERUSDT",
+            "price": price,
+            "qty": 1.0,
+        }
+    )
+
+
+def test_compact_keeps_partition_columns_out_of_the_file(tmp_path):
+    db = DuckDBManager(tmp_path / "tiers.duckdb")
+    archive = TickArchive(db=db, root=tmp_path / "cold", hot_days=1)
+
+    # Two roll-overs into the same day → two files in one partition
+    db.insert_ticks(ticks("2024-01-01 00:00", 10, 100.0))
+    archive.roll_over(now=datetime(2024, 1, 3))
+    db.insert_ticks(ticks("2024-01-01 12:00", 10, 101.0))
+    archive.roll_over(now=datetime(2024, 1, 3))
+
+    assert archive.compact() == 1
+    (part,) = archive.partitions()
+    (file,) = part.glob("*.parquet")
+    columns = duckdb.sql(
+        f"DESCRIBE SELECT * FROM read_parquet('{file}', hive_partitioning = false)"
+    ).fetchall()
+    assert [c[0] for c in columns] == ["timestamp", "price", "qty"]
+
+    archive.refresh_view()
+    stored = db.con.execute(
+        "SELECT symbol, COUNT(*), MIN(price), MAX(price) FROM ticks_all GROUP BY symbol"
+    ).fetchall()
+    assert stored == [("TIERUSDT", 20, 100.0, 101.0)]
+
+
+def test_compact_swaps_files_without_duplicates_or_gaps(tmp_path):
+    db = DuckDBManager(tmp_path / "tiers.duckdb")
+    archive = TickArchive(db=db, root=tmp_path / "cold", hot_days=1)
+    db.insert_ticks(ticks("2024-01-01 00:00", 10, 100.0))
+    archive.roll_over(now=datetime(2024, 1, 3))
+    db.insert_ticks(ticks("2024-01-01 12:00", 10, 101.0))
+    archive.roll_over(now=datetime(2024, 1, 3))
+
+    # A reader on another thread, right as the compacted file is swapped in
+    def count() -> int:
+        return db.con.execute("SELECT COUNT(*) FROM ticks_all").fetchone()[0]
+
+    seen = []
+    refresh = archive.refresh_view
+
+    def refresh_view(con=None, exclude=frozenset()):
+        with ThreadPoolExecutor(1) as pool:
+            seen.append(pool.submit(count).result())
+        refresh(con, exclude)
+
+    archive.refresh_view = refresh_view
+    assert archive.compact() == 1
+    assert seen == [20]
+    assert count() == 20
+    assert len(list(archive.partitions()[0].iterdir())) == 1
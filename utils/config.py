@@ -0,0 +1,80 @@
+import os
+
+
+def _env_list(name: str, default: str) -> list[str]:
+    return [s.strip() for s in os.getenv(name, default).split(",") if s.strip()]
+
+
+# Symbols to ingest (Binance futures, case-insensitive)
+SYMBOLS = [s.upper() for s in _env_list("QA_SYMBOLS", "BTCUSDT,ETHUSDT")]
+
+# Combined-stream websocket connections to shard the symbols across
+WS_CONNECTIONS = int(os.getenv("QA_WS_CONNECTIONS", "1"))
+
+# Binance caps a combined stream at 200 streams per connection
+MAX_STREAMS_PER_CONNECTION = 200
+
+# Timeframes maintained by the bar builder / resampler
+TIMEFRAMES = _env_list("QA_TIMEFRAMES", "1s,1m,5m")
+
+# "inprocess": websocket readers run inside the API process
+# "multiprocess": readers run in QA_INGEST_WORKERS worker processes that
+# hand ticks to the API process (sole DuckDB owner) over a queue
+INGEST_MODE = os.getenv("QA_INGEST_MODE", "inprocess")
+INGEST_WORKERS = int(os.getenv("QA_INGEST_WORKERS", "2"))
+
+# Max batches waiting between ingest workers and the writer
+INGEST_QUEUE_SIZE = int(os.getenv("QA_INGEST_QUEUE_SIZE", "1000"))
+
+# Tick storage tiers: days kept in the DuckDB `ticks` table before
+# rolling into Hive-partitioned Parquet (symbol/date), how long Parquet
+# partitions are kept (0 = forever) and how often the jobs run (seconds)
+HOT_DAYS = int(os.getenv("QA_HOT_DAYS", "2"))
+COLD_RETENTION_DAYS = int(os.getenv("QA_COLD_RETENTION_DAYS", "0"))
+TIER_INTERVAL = float(os.getenv("QA_TIER_INTERVAL", "3600"))
+
+# Universe scanner (analytics.scanner): every pair of QA_SCAN_SYMBOLS
+# (default: SYMBOLS) is screened by correlation / OLS over the last
+# QA_SCAN_LOOKBACK bars; the top QA_SCAN_TOP_K go through ADF in
+# QA_SCAN_WORKERS processes (1 = inline), every QA_SCAN_INTERVAL seconds.
+# QA_SCAN_ENABLED=0 never starts it.
+SCAN_ENABLED = os.getenv("QA_SCAN_ENABLED", "1") != "0"
+SCAN_SYMBOLS = [s.upper() for s in _env_list("QA_SCAN_SYMBOLS", ",".join(SYMBOLS))]
+SCAN_TIMEFRAME = os.getenv("QA_SCAN_TIMEFRAME", "1m")
+SCAN_LOOKBACK = int(os.getenv("QA_SCAN_LOOKBACK", "1440"))
+SCAN_TOP_K = int(os.getenv("QA_SCAN_TOP_K", "20"))
+SCAN_WORKERS = int(os.getenv("QA_SCAN_WORKERS", "2"))
+SCAN_INTERVAL = float(os.getenv("QA_SCAN_INTERVAL", "900"))
+
+# Stationarity scheduler (analytics.stationarity): ADF of each
+# QA_ADF_PAIRS pair ("X/Y", comma-separated; default the first two
+# SYMBOLS) on QA_ADF_TIMEFRAMES is recomputed on bar close. Pairs asked
+# for on /adf-test are added on the fly, up to QA_ADF_MAX_PAIRS tracked
+# (pair, timeframe) entries in total. The AIC lag order is searched
+# again every QA_ADF_REFRESH_EVERY runs and reused in between
+ADF_PAIRS = [
+    tuple(p.upper().split("/", 1))
+    for p in _env_list("QA_ADF_PAIRS", "/".join(SYMBOLS[:2]))
+    if "/" in p
+]
+ADF_TIMEFRAMES = _env_list("QA_ADF_TIMEFRAMES", "1m,5m")
+ADF_REFRESH_EVERY = int(os.getenv("QA_ADF_REFRESH_EVERY", "50"))
+ADF_MAX_PAIRS = int(os.getenv("QA_ADF_MAX_PAIRS", "100"))
+
+# Streaming z-score / correlation calculators (analytics.stats) kept in
+# memory, least recently used evicted first; each holds up to 10k bars
+STREAM_MAX_STATS = int(os.getenv("QA_STREAM_MAX_STATS", "64"))
+
+# /alerts/events states (analytics.alerts) kept in memory per pair and
+# parameter set, least recently used evicted first
+ALERT_MAX_STATES = int(os.getenv("QA_ALERT_MAX_STATES", "256"))
+
+# Processes for backtest grid sweeps (analytics.backtest), one z-score
+# window per task
+BACKTEST_WORKERS = int(os.getenv("QA_BACKTEST_WORKERS", "2"))
+
+# Online hedge ratio parameters (analytics.online_regression) accepted by
+# the API. Each value keeps its own persisted estimator state and beta
+# series per pair, so the set is fixed server-side
+RLS_FORGETTING = [float(v) for v in _env_list("QA_RLS_FORGETTING", "1,0.999,0.995,0.99,0.98,0.95")]
+KALMAN_DELTA = [float(v) for v in _env_list("QA_KALMAN_DELTA", "1e-5,1e-4,1e-3,1e-2")]
@@ -0,0 +1,22 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Bounded pool for blocking DuckDB / pandas work started from async tasks.
+# DuckDB and pandas release the GIL for most of their heavy lifting, so
+# threads are enough to keep the websocket readers responsive.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="blocking")
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """
+    Run a blocking call in the shared pool without stalling the event loop
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, functools.partial(fn, *args, **kwargs)
+    )
+
+
+def shutdown_executor():
+    _executor.shutdown(wait=True, cancel_futures=True)
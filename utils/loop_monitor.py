@@ -0,0 +1,72 @@
+import asyncio
+import time
+from collections import deque
+
+from utils.metrics import registry
+
+# Recent event-loop lag samples (ms): how late a sleep(interval) woke up
+loop_lag_samples: deque = deque(maxlen=600)
+
+loop_lag_stats = {
+    "samples": 0,
+    "last_ms": 0.0,
+    "max_ms": 0.0,
+    "over_threshold": 0,
+}
+
+
+def loop_lag_summary() -> dict:
+    samples = sorted(loop_lag_samples)
+    if not samples:
+        return dict(loop_lag_stats)
+
+    return {
+        **loop_lag_stats,
+        "p50_ms": samples[len(samples) // 2],
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+def collect_loop_metrics():
+    summary = loop_lag_summary()
+    yield (
+        "qa_event_loop_lag_seconds",
+        "gauge",
+        "How late the event loop woke up (last / max / p50 / p99 of recent samples)",
+        [
+            ({"stat": stat}, summary[f"{stat}_ms"] / 1000)
+            for stat in ("last", "max", "p50", "p99")
+            if f"{stat}_ms" in summary
+        ],
+    )
+    yield (
+        "qa_event_loop_lag_over_threshold_total",
+        "counter",
+        "Event loop stalls above the warning threshold",
+        [({}, loop_lag_stats["over_threshold"])],
+    )
+
+
+registry.register_collector(collect_loop_metrics)
+
+
+async def loop_lag_monitor(interval: float = 0.1, warn_ms: float = 20.0):
+    """
+    Measure event-loop responsiveness. Anything blocking the loop (sync
+    DB calls, pandas work) shows up as a late wake-up.
+    """
+    print("[LOOP-MONITOR] Started event loop lag monitor")
+
+    while True:
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag_ms = max(0.0, (time.perf_counter() - t0 - interval) * 1000)
+
+        loop_lag_samples.append(lag_ms)
+        loop_lag_stats["samples"] += 1
+        loop_lag_stats["last_ms"] = lag_ms
+        loop_lag_stats["max_ms"] = max(loop_lag_stats["max_ms"], lag_ms)
+
+        if lag_ms > warn_ms:
+            loop_lag_stats["over_threshold"] += 1
+            print(f"[LOOP-MONITOR] Event loop blocked for {lag_ms:.1f}ms")
@@ -0,0 +1,200 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# (name, type, help, samples) as returned by collectors. A sample is
+# (labels, value), or (sample name, labels, value) for the _sum / _count
+# lines of summaries and histograms.
+Family = tuple[str, str, str, list[tuple]]
+
+
+class Counter:
+    """
+    Monotonic counter per label set. Not locked: update it from one
+    thread (the event loop or a single writer loop).
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def samples(self) -> list[tuple[dict, float]]:
+        return [
+            (dict(zip(self.labels, key)), value)
+            for key, value in list(self.values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str):
+        self.values[labels] = value
+
+
+class Histogram:
+    """
+    Bucketed observations per label set (cumulative on export), safe to
+    observe from any thread
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # label values → [count per bucket (+Inf last), sum]
+        self.values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self.values.get(labels)
+            if entry is None:
+                entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][i] += 1
+            entry[1] += value
+
+    def time(self, *labels: str) -> "_Timer":
+        return _Timer(self, labels)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            items = [(k, list(counts), total) for k, (counts, total) in self.values.items()]
+
+        out = []
+        for key, counts, total in items:
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), counts):
+                cumulative += n
+                out.append(("_bucket", {**labels, "le": str(bound)}, cumulative))
+            out.append(("_sum", labels, total))
+            out.append(("_count", labels, cumulative))
+        return out
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.t0, *self.labels)
+
+
+class MetricsRegistry:
+    """
+    Metrics owned by this process plus collectors that turn the existing
+    stats dicts (writer_stats, pool.stats, ...) into families at scrape
+    time, so nothing extra runs on the hot paths
+    """
+
+    def __init__(self):
+        self.metrics: dict[str, Counter | Histogram] = {}
+        self.collectors: list[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def _add(self, metric):
+        with self._lock:
+            return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def register_collector(self, fn: Callable[[], Iterable[Family]]):
+        with self._lock:
+            self.collectors.append(fn)
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format
+        """
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines += _header(metric.name, metric.kind, metric.help)
+            if isinstance(metric, Histogram):
+                for suffix, labels, value in metric.samples():
+                    lines.append(_sample(metric.name + suffix, labels, value))
+            else:
+                for labels, value in metric.samples():
+                    lines.append(_sample(metric.name, labels, value))
+
+        for collect in list(self.collectors):
+            try:
+                families = list(collect())
+            except Exception as e:
+                print(f"[METRICS] Collector error: {e}")
+                continue
+            for name, kind, help, samples in families:
+                lines += _header(name, kind, help)
+                for sample in samples:
+                    lines.append(
+                        _sample(*sample) if len(sample) == 3 else _sample(name, *sample)
+                    )
+
+        return "\n".join(lines) + "\n"
+
+
+def _header(name: str, kind: str, help: str) -> list[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(name: str, labels: dict, value: float) -> str:
+    if labels:
+        body = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+        name = f"{name}{{{body}}}"
+    value = float(value)
+    if math.isnan(value):
+        text = "NaN"
+    elif math.isinf(value):
+        text = "+Inf" if value > 0 else "-Inf"
+    else:
+        text = repr(value)
+    return f"{name} {text}"
+
+
+registry = MetricsRegistry()
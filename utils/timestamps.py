@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_ns(ts) -> int:
+    """
+    Normalise a tick timestamp to integer epoch nanoseconds.
+
+    Accepts integer epoch milliseconds (as sent by Binance), ISO strings
+    or datetimes. Naive datetimes are taken as UTC, like the `ticks` table.
+    """
+    # Hot path: Binance trade time
+    if isinstance(ts, int):
+        return ts * 1_000_000
+
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+
+    if isinstance(ts, datetime):
+        if ts.tzinfo is not None:
+            ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+
+        delta = ts - EPOCH
+        return (
+            (delta.days * 86_400 + delta.seconds) * 1_000_000_000
+            + delta.microseconds * 1_000
+        )
+
+    return int(ts) * 1_000_000
+
+
+def from_epoch_ns(ns: int) -> datetime:
+    return EPOCH + timedelta(microseconds=ns // 1_000)